@@ -1,17 +1,135 @@
 """Base database connector interface."""
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any
-from core.models import DatabaseConnection
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+from core.models import AppSettings, DatabaseConnection, DatabaseType
+from utils.cache import prepared_cache
+from utils.sql_params import Params
+
+# Registry entry of the query running in the current task (see operations.query_registry)
+current_query: ContextVar[Optional[Dict[str, Any]]] = ContextVar("current_query", default=None)
 
 
 class BaseConnector(ABC):
     """Base class for database connectors."""
     
+    db_type: DatabaseType
+    # Whether ORDER BY accepts NULLS FIRST/LAST
+    supports_nulls_last = True
+    
     def __init__(self):
         """Initialize connector."""
         self.connection = None
+        self.pool = None
+        self.connection_id: Optional[str] = None
+        self.active_operations = 0
         self.is_connected = False
+        self.pool_min_size = 1
+        self.pool_max_size = 5
+    
+    def apply_settings(self, settings: AppSettings) -> None:
+        """Apply application settings before connecting."""
+        self.pool_min_size = settings.pool_min_size
+        self.pool_max_size = max(settings.pool_max_size, settings.pool_min_size)
+    
+    async def acquire_connection(self):
+        """Acquire a driver connection for exclusive use."""
+        return self.connection
+    
+    async def release_connection(self, conn) -> None:
+        """Release a connection obtained from acquire_connection."""
+        pass
+    
+    @asynccontextmanager
+    async def acquire(self):
+        """Acquire a driver connection and release it on exit."""
+        conn = await self.acquire_connection()
+        self.active_operations += 1
+        try:
+            with self._running_on(conn):
+                yield conn
+        finally:
+            self.active_operations -= 1
+            await self.release_connection(conn)
+    
+    @contextmanager
+    def _running_on(self, conn):
+        """Record conn as the session running the current registered query."""
+        entry = current_query.get()
+        if entry is None or entry.get("session") is not None:
+            yield
+            return
+        entry["session"] = conn
+        entry["backend_id"] = self._backend_id(conn)
+        try:
+            yield
+        finally:
+            # A released session may run someone else's query next
+            entry["session"] = None
+    
+    async def cancel_query(self, entry: Dict[str, Any]) -> bool:
+        """Cancel a registered query on the server; returns False if it is not running."""
+        return False
+    
+    @staticmethod
+    def _still_running_on(entry: Dict[str, Any], session: Any, backend_id: Any) -> bool:
+        """Check that a registered query still holds the session a cancel is about to target.
+        
+        Once the query finishes its session goes back to the pool, and a kill
+        sent to that backend would stop whatever statement runs there next.
+        """
+        task = entry.get("task")
+        return (
+            entry.get("session") is session
+            and entry.get("backend_id") == backend_id
+            and not (task is not None and task.done())
+        )
+    
+    def _session_key(self, conn) -> Any:
+        """Identify the database session a prepared statement belongs to."""
+        return id(conn)
+    
+    def _backend_id(self, conn) -> Any:
+        """Identify the server-side session that cancel_query targets."""
+        return self._session_key(conn)
+    
+    async def _prepare(self, conn, query: str) -> Any:
+        """Prepare a statement on a driver connection."""
+        raise NotImplementedError
+    
+    async def _deallocate(self, conn, statement: Any) -> None:
+        """Release a prepared statement evicted from the cache."""
+        pass
+    
+    async def prepare_cached(self, conn, query: str) -> Any:
+        """Get a prepared statement for query on conn, preparing it on a cache miss."""
+        session_key = self._session_key(conn)
+        statement = prepared_cache.get(self.connection_id, session_key, query)
+        if statement is None:
+            statement = await self._prepare(conn, query)
+            for evicted in prepared_cache.put(self.connection_id, session_key, query, statement):
+                await self._deallocate(conn, evicted)
+        return statement
+    
+    def invalidate_statements(self, query: Optional[str] = None) -> None:
+        """Drop cached prepared statements, or only when query changes the schema."""
+        if query is None or prepared_cache.is_schema_change(query):
+            prepared_cache.clear_connection(self.connection_id)
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get connection pool statistics."""
+        size = 1 if self.is_connected else 0
+        return {
+            "pooled": False,
+            "min_size": size,
+            "max_size": size,
+            "size": size,
+            "idle": 0,
+            "in_use": size
+        }
     
     @abstractmethod
     async def connect(self, config: DatabaseConnection) -> bool:
@@ -23,6 +141,16 @@ class BaseConnector(ABC):
         """Disconnect from database."""
         pass
     
+    async def ping(self, timeout: Optional[float] = None) -> None:
+        """Make a cheap round trip to the server, raising if it is unreachable.
+        
+        timeout bounds the round trip itself; pooled connectors wait for a
+        free connection before it starts.
+        """
+        result = await asyncio.wait_for(self.execute_query("SELECT 1"), timeout=timeout)
+        if not result.get("success"):
+            raise ConnectionError(result.get("error", "Ping failed"))
+    
     @abstractmethod
     async def test_connection(self, config: DatabaseConnection) -> Dict[str, Any]:
         """Test database connection."""
@@ -43,7 +171,95 @@ class BaseConnector(ABC):
         """Get table columns."""
         pass
     
+    async def get_primary_key(self, table: str, schema: str = None) -> List[str]:
+        """Get a table's primary key columns in key order, or [] if it has none."""
+        return []
+    
+    async def estimate_row_count(self, table: str, schema: str = None) -> Optional[int]:
+        """Get a table's row count from planner statistics without scanning it, or None if unknown."""
+        return None
+    
+    async def count_rows(self, table: str, schema: str = None) -> int:
+        """Count a table's rows exactly."""
+        table_ref = self.quote_identifier(table)
+        if schema:
+            table_ref = f"{self.quote_identifier(schema)}.{table_ref}"
+        result = await self.execute_query(f"SELECT COUNT(*) FROM {table_ref}")
+        if not result.get("success"):
+            raise RuntimeError(result.get("error", "Count failed"))
+        return result["data"][0][0]
+    
+    @staticmethod
+    def _new_catalog_table() -> Dict[str, Any]:
+        """Create an empty catalog entry for a table."""
+        return {"columns": [], "primary_key": [], "foreign_keys": [], "indexes": []}
+    
+    async def get_catalog(self, tables: Optional[Dict[str, List[str]]] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Get every schema's tables with columns, primary key, foreign keys and indexes.
+        
+        Returns {schema: {table: {"columns", "primary_key", "foreign_keys", "indexes"}}}.
+        tables ({schema: [table, ...]}) limits the result to those tables.
+        SQL connectors override this with a few bulk catalog queries; the default
+        walks get_tables/get_columns, fetching a schema's columns concurrently.
+        """
+        catalog = {}
+        schemas = list(tables) if tables is not None else await self.get_schemas()
+        for schema in schemas:
+            names = tables[schema] if tables is not None else await self.get_tables(schema)
+            columns = await asyncio.gather(*(self.get_columns(table, schema) for table in names))
+            catalog[schema] = {}
+            for table, table_columns in zip(names, columns):
+                catalog[schema][table] = self._new_catalog_table()
+                catalog[schema][table]["columns"] = table_columns
+        return catalog
+    
+    async def get_table_fingerprints(self) -> Optional[Dict[str, Dict[str, str]]]:
+        """Get a value per table that changes whenever its catalog entry does.
+        
+        Returns {schema: {table: fingerprint}} covering the same tables as
+        get_catalog, or None when the database offers no cheap way to tell.
+        """
+        return None
+    
+    @abstractmethod
+    async def execute_query(self, query: str, params: Optional[Params] = None) -> Dict[str, Any]:
+        """Execute query with optional :name (dict) or ? (sequence) bind parameters."""
+        pass
+    
+    async def execute_many(self, query: str, seq_of_params: Sequence[Params]) -> Dict[str, Any]:
+        """Execute a statement once per parameter set."""
+        row_count = 0
+        for params in seq_of_params:
+            result = await self.execute_query(query, params)
+            if not result.get("success"):
+                return result
+            row_count += 1
+        return {"success": True, "row_count": row_count}
+    
+    async def execute_batch(self, statements: Sequence[Tuple[str, Sequence[Params]]]) -> Dict[str, Any]:
+        """Run (query, seq_of_params) groups in order, in one transaction where supported."""
+        row_count = 0
+        for query, seq_of_params in statements:
+            result = await self.execute_many(query, seq_of_params)
+            if not result.get("success"):
+                return result
+            row_count += len(seq_of_params)
+        return {"success": True, "row_count": row_count}
+    
+    def quote_identifier(self, name: str) -> str:
+        """Quote a table or column name for use in SQL."""
+        return '"' + name.replace('"', '""') + '"'
+    
     @abstractmethod
-    async def execute_query(self, query: str) -> Dict[str, Any]:
-        """Execute query and return results."""
+    async def stream_query(
+        self,
+        query: str,
+        params: Optional[Params] = None,
+        batch_size: int = 1000,
+        first_batch_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream query results as batches of {"columns", "data"} without buffering the full result.
+        
+        first_batch_size, when given, sizes only the first fetch so the first rows arrive quickly.
+        """
         pass
\ No newline at end of file
@@ -1,14 +1,30 @@
 """MongoDB database connector."""
 
+import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient
-from typing import Dict, List, Any
-from connectors.base import BaseConnector
-from core.models import DatabaseConnection
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from connectors.base import BaseConnector, current_query
+from core.models import AppSettings, DatabaseConnection, DatabaseType
+from utils.cache import schema_cache
+from utils.mongo_query import infer_fields, output_stage_index, parse_mongo_query, to_json_value
+from utils.sql_params import Params
 
 
 class MongoDBConnector(BaseConnector):
     """MongoDB database connector."""
     
+    db_type = DatabaseType.MONGODB
+    
+    def __init__(self):
+        """Initialize connector."""
+        super().__init__()
+        self.schema_sample_size = 500
+    
+    def apply_settings(self, settings: AppSettings) -> None:
+        """Apply application settings before connecting."""
+        super().apply_settings(settings)
+        self.schema_sample_size = settings.mongo_schema_sample_size
+    
     async def connect(self, config: DatabaseConnection) -> bool:
         """Connect to MongoDB database."""
         try:
@@ -18,6 +34,7 @@ class MongoDBConnector(BaseConnector):
                 username=config.username,
                 password=config.password
             )
+            self.database_name = config.database
             # Test connection
             await self.connection.admin.command('ping')
             self.is_connected = True
@@ -36,6 +53,10 @@ class MongoDBConnector(BaseConnector):
         except Exception:
             return False
     
+    async def ping(self, timeout: Optional[float] = None) -> None:
+        """Ping the MongoDB server."""
+        await asyncio.wait_for(self.connection.admin.command('ping'), timeout=timeout)
+    
     async def test_connection(self, config: DatabaseConnection) -> Dict[str, Any]:
         """Test MongoDB connection."""
         try:
@@ -63,73 +84,173 @@ class MongoDBConnector(BaseConnector):
         db = self.connection[schema]
         return await db.list_collection_names()
     
+    async def get_primary_key(self, table: str, schema: str = None) -> List[str]:
+        """Every MongoDB collection is keyed by _id."""
+        return ["_id"]
+    
+    async def estimate_row_count(self, table: str, schema: str = None) -> Optional[int]:
+        """Get the collection's document count from metadata."""
+        return await self.connection[schema or self.database_name][table].estimated_document_count()
+    
+    async def count_rows(self, table: str, schema: str = None) -> int:
+        """Count a collection's documents exactly."""
+        entry = current_query.get()
+        options = {"comment": entry["id"]} if entry else {}
+        return await self.connection[schema or self.database_name][table].count_documents({}, **options)
+    
+    async def _collection_signature(self, db, table: str) -> Optional[Tuple[int, int]]:
+        """Get a collection's document count and data size, which change when it does."""
+        try:
+            stats = await db.command("collStats", table)
+        except Exception:
+            # Views have no stats; their inferred fields expire with the cache TTL
+            return None
+        return stats.get("count", 0), stats.get("size", 0)
+    
     async def get_columns(self, table: str, schema: str = None) -> List[Dict[str, Any]]:
-        """Get MongoDB collection fields."""
+        """Infer MongoDB collection fields from a random sample of documents.
+        
+        Fields are merged across the sample, including nested paths, and cached
+        until the collection's count or size changes.
+        """
         if not schema:
             return []
         
         db = self.connection[schema]
-        collection = db[table]
+        cache_key = f"{self.connection_id}_mongo_fields_{schema}.{table}"
+        signature = await self._collection_signature(db, table)
+        cached = schema_cache.get(cache_key)
+        if cached and cached["signature"] == signature:
+            return cached["columns"]
         
-        # Sample document to infer schema
-        sample = await collection.find_one()
-        if not sample:
-            return []
+        cursor = db[table].aggregate([{"$sample": {"size": self.schema_sample_size}}])
+        columns = infer_fields(await cursor.to_list(length=None))
+        schema_cache.set(cache_key, {"signature": signature, "columns": columns}, ttl=3600)
+        return columns
+    
+    def _open_cursor(self, query: str, batch_size: Optional[int] = None):
+        """Parse a shell-style query and open a cursor with options pushed to the server."""
+        parsed = parse_mongo_query(query)
+        collection = self.connection[self.database_name][parsed["collection"]]
+        batch_size = parsed["batch_size"] or batch_size
+        # Registered queries are tagged so cancel_query can find them in currentOp
+        entry = current_query.get()
+        comment = entry["id"] if entry else None
         
-        columns = []
-        for key, value in sample.items():
-            columns.append({
-                "column_name": key,
-                "data_type": type(value).__name__,
-                "is_nullable": "YES",
-                "column_default": None
-            })
+        if parsed["operation"] == "aggregate":
+            pipeline = list(parsed["pipeline"])
+            # Cursor options become stages before a trailing $out/$merge, which must stay last
+            output = output_stage_index(pipeline)
+            stages = []
+            if parsed["sort"]:
+                stages.append({"$sort": parsed["sort"]})
+            if parsed["skip"]:
+                stages.append({"$skip": parsed["skip"]})
+            if parsed["limit"]:
+                stages.append({"$limit": parsed["limit"]})
+            if output is None:
+                pipeline.extend(stages)
+            else:
+                pipeline[output:output] = stages
+            options = {}
+            if parsed["max_time_ms"]:
+                options["maxTimeMS"] = parsed["max_time_ms"]
+            if batch_size:
+                options["batchSize"] = batch_size
+            if comment:
+                options["comment"] = comment
+            return collection.aggregate(pipeline, **options)
         
-        return columns
+        cursor = collection.find(parsed["filter"], parsed["projection"])
+        if parsed["sort"]:
+            cursor = cursor.sort(list(parsed["sort"].items()))
+        if parsed["skip"]:
+            cursor = cursor.skip(parsed["skip"])
+        if parsed["limit"]:
+            cursor = cursor.limit(parsed["limit"])
+        if parsed["max_time_ms"]:
+            cursor = cursor.max_time_ms(parsed["max_time_ms"])
+        if batch_size:
+            cursor = cursor.batch_size(batch_size)
+        if comment:
+            cursor = cursor.comment(comment)
+        return cursor
+    
+    async def cancel_query(self, entry: Dict[str, Any]) -> bool:
+        """Kill the server operations tagged with a registered query's id."""
+        admin = self.connection.admin
+        current = await admin.command({"currentOp": 1, "command.comment": entry["id"]})
+        operations = current.get("inprog", [])
+        for operation in operations:
+            await admin.command({"killOp": 1, "op": operation["opid"]})
+        return bool(operations)
+    
+    @staticmethod
+    def _to_rows(documents: List[Dict[str, Any]], columns: List[str], grow: bool = True) -> List[List[Any]]:
+        """Convert documents to rows, growing columns as new keys appear unless grow is off."""
+        # Documents are schemaless: keep keys in first-seen order
+        if grow:
+            for doc in documents:
+                for key in doc.keys():
+                    if key not in columns:
+                        columns.append(key)
+        return [[to_json_value(doc.get(col)) for col in columns] for doc in documents]
     
-    async def execute_query(self, query: str) -> Dict[str, Any]:
-        """Execute MongoDB query."""
+    async def _sampled_columns(self, query: str) -> List[str]:
+        """Get the top-level fields a find() query returns, from the collection's sampled fields."""
+        parsed = parse_mongo_query(query)
+        if parsed["operation"] != "find":
+            # Aggregation output has its own shape
+            return []
+        fields = await self.get_columns(parsed["collection"], self.database_name)
+        columns = [field["column_name"] for field in fields if "." not in field["column_name"]]
+        projection = parsed["projection"] or {}
+        top_level = {key.split(".", 1)[0]: value for key, value in projection.items()}
+        if any(value for key, value in top_level.items() if key != "_id"):
+            return [column for column in columns if top_level.get(column, column == "_id")]
+        return [column for column in columns if top_level.get(column, True)]
+    
+    async def execute_query(self, query: str, params: Optional[Params] = None) -> Dict[str, Any]:
+        """Execute a find() or aggregate() query; bind parameters are not used."""
         try:
-            import json
-            
-            # Parse query as JSON for filter
-            if query.strip().startswith('{'):
-                filter_doc = json.loads(query)
-            else:
-                filter_doc = {}
-            
-            # Use default database and collection for now
-            # In production, this would be configurable
-            db = self.connection.get_default_database()
-            if not db:
-                return {"success": False, "error": "No database specified"}
-            
-            # Get first collection for demo
-            collections = await db.list_collection_names()
-            if not collections:
-                return {"success": False, "error": "No collections found"}
-            
-            collection = db[collections[0]]
-            cursor = collection.find(filter_doc).limit(100)
-            documents = await cursor.to_list(length=100)
-            
-            if documents:
-                # Get all unique keys from documents
-                all_keys = set()
-                for doc in documents:
-                    all_keys.update(doc.keys())
-                
-                columns = list(all_keys)
-                data = [[str(doc.get(col, "")) for col in columns] for doc in documents]
-                
-                return {
-                    "success": True,
-                    "columns": columns,
-                    "data": data,
-                    "row_count": len(documents)
-                }
-            
-            return {"success": True, "columns": [], "data": [], "row_count": 0}
-            
+            cursor = self._open_cursor(query)
+            documents = await cursor.to_list(length=None)
+            columns: List[str] = []
+            data = self._to_rows(documents, columns)
+            return {
+                "success": True,
+                "columns": columns,
+                "data": data,
+                "row_count": len(documents)
+            }
         except Exception as e:
-            return {"success": False, "error": str(e)}
\ No newline at end of file
+            return {"success": False, "error": str(e)}
+    
+    async def stream_query(
+        self,
+        query: str,
+        params: Optional[Params] = None,
+        batch_size: int = 1000,
+        first_batch_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream MongoDB documents using cursor batches.
+        
+        Every batch has the same columns, as CSV headers and columnar frames
+        require: the fields seen in a sample of the collection and in the first
+        batch. Fields that first appear in later batches are left out.
+        """
+        columns = await self._sampled_columns(query)
+        cursor = self._open_cursor(query, batch_size)
+        size = first_batch_size or batch_size
+        first = True
+        try:
+            while True:
+                documents = await cursor.to_list(length=size)
+                if not documents:
+                    break
+                data = self._to_rows(documents, columns, grow=first)
+                yield {"columns": list(columns), "data": data}
+                size = batch_size
+                first = False
+        finally:
+            await cursor.close()
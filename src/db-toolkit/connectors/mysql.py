@@ -1,24 +1,45 @@
 """MySQL database connector."""
 
 import aiomysql
-from typing import Dict, List, Any
+import asyncio
+import hashlib
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 from connectors.base import BaseConnector
-from core.models import DatabaseConnection
+from core.models import DatabaseConnection, DatabaseType
+from utils.cache import prepared_cache
+from utils.sql_params import FORMAT, QMARK, Params, bind_many, bind_params
+
+# Server error for EXECUTE of a statement the session does not have
+ER_UNKNOWN_STMT_HANDLER = 1243
+# Seconds to wait for the session that sends a cancel request
+CANCEL_CONNECT_TIMEOUT = 5
 
 
 class MySQLConnector(BaseConnector):
     """MySQL database connector."""
     
+    db_type = DatabaseType.MYSQL
+    placeholder_style = FORMAT
+    supports_nulls_last = False
+    
     async def connect(self, config: DatabaseConnection) -> bool:
         """Connect to MySQL database."""
         try:
-            self.connection = await aiomysql.connect(
-                host=config.host,
-                port=config.port or 3306,
-                user=config.username,
-                password=config.password,
-                db=config.database
+            # Kept for the short-lived sessions that send cancel requests
+            self._connect_kwargs = {
+                "host": config.host,
+                "port": config.port or 3306,
+                "user": config.username,
+                "password": config.password,
+                "db": config.database
+            }
+            self.pool = await aiomysql.create_pool(
+                **self._connect_kwargs,
+                minsize=self.pool_min_size,
+                maxsize=self.pool_max_size,
+                autocommit=True
             )
+            self.connection = self.pool
             self.is_connected = True
             return True
         except Exception:
@@ -28,13 +49,102 @@ class MySQLConnector(BaseConnector):
     async def disconnect(self) -> bool:
         """Disconnect from MySQL."""
         try:
-            if self.connection:
-                self.connection.close()
+            if self.pool:
+                self.pool.close()
+                await self.pool.wait_closed()
+            self.pool = None
+            self.connection = None
             self.is_connected = False
             return True
         except Exception:
             return False
     
+    async def acquire_connection(self):
+        """Acquire a connection from the pool."""
+        return await self.pool.acquire()
+    
+    async def release_connection(self, conn) -> None:
+        """Return a connection to the pool."""
+        await self.pool.release(conn)
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get aiomysql pool statistics."""
+        if not self.pool:
+            return super().get_pool_stats()
+        size = self.pool.size
+        idle = self.pool.freesize
+        return {
+            "pooled": True,
+            "min_size": self.pool.minsize,
+            "max_size": self.pool.maxsize,
+            "size": size,
+            "idle": idle,
+            "in_use": size - idle
+        }
+    
+    def _session_key(self, conn) -> Any:
+        """Key prepared statements by driver connection; thread IDs repeat after a server restart."""
+        return conn
+    
+    def _backend_id(self, conn) -> Any:
+        """Cancel by server thread ID."""
+        return conn.thread_id()
+    
+    async def cancel_query(self, entry: Dict[str, Any]) -> bool:
+        """Cancel a running statement with KILL QUERY from a short-lived session.
+        
+        The cancel runs outside the pool, so it still gets through when every
+        pooled connection is busy with the queries it is meant to stop.
+        """
+        session, backend_id = entry.get("session"), entry.get("backend_id")
+        if session is None:
+            return False
+        conn = await aiomysql.connect(**self._connect_kwargs, connect_timeout=CANCEL_CONNECT_TIMEOUT)
+        try:
+            if not self._still_running_on(entry, session, backend_id):
+                return False
+            async with conn.cursor() as cursor:
+                await cursor.execute("KILL QUERY %s", (backend_id,))
+            return True
+        finally:
+            conn.close()
+    
+    async def _prepare(self, conn, query: str) -> Any:
+        """Prepare a server-side statement and return its name."""
+        name = "dbtk_" + hashlib.md5(prepared_cache.normalize(query).encode()).hexdigest()[:16]
+        async with conn.cursor() as cursor:
+            await cursor.execute(f"PREPARE {name} FROM %s", (query,))
+        return name
+    
+    async def _deallocate(self, conn, statement: Any) -> None:
+        """Deallocate an evicted server-side statement."""
+        async with conn.cursor() as cursor:
+            await cursor.execute(f"DEALLOCATE PREPARE {statement}")
+    
+    async def _execute_prepared(self, conn, cursor, query: str, args: Optional[List[Any]]) -> None:
+        """Run a cached server-side prepared statement on cursor, re-preparing once if the server lost it."""
+        execute = "EXECUTE {}"
+        if args:
+            # EXECUTE only binds user variables, so set them in one round trip first
+            variables = [f"@dbtk_p{i}" for i in range(len(args))]
+            await cursor.execute("SET " + ", ".join(f"{var} = %s" for var in variables), args)
+            execute += f" USING {', '.join(variables)}"
+        for attempt in range(2):
+            name = await self.prepare_cached(conn, query)
+            try:
+                await cursor.execute(execute.format(name))
+                return
+            except aiomysql.OperationalError as e:
+                # The session lost its statements, e.g. after a server restart or DEALLOCATE
+                if attempt or e.args[0] != ER_UNKNOWN_STMT_HANDLER:
+                    raise
+                prepared_cache.clear_session(self.connection_id, self._session_key(conn))
+    
+    async def ping(self, timeout: Optional[float] = None) -> None:
+        """Ping MySQL with the protocol-level ping on a pooled connection."""
+        async with self.acquire() as conn:
+            await asyncio.wait_for(conn.ping(reconnect=False), timeout=timeout)
+    
     async def test_connection(self, config: DatabaseConnection) -> Dict[str, Any]:
         """Test MySQL connection."""
         try:
@@ -52,27 +162,33 @@ class MySQLConnector(BaseConnector):
     
     async def get_schemas(self) -> List[str]:
         """Get MySQL schemas."""
-        async with self.connection.cursor() as cursor:
-            await cursor.execute("SHOW DATABASES")
-            rows = await cursor.fetchall()
+        async with self.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute("SHOW DATABASES")
+                rows = await cursor.fetchall()
         return [row[0] for row in rows if row[0] not in ('information_schema', 'performance_schema', 'mysql', 'sys')]
     
     async def get_tables(self, schema: str = None) -> List[str]:
         """Get MySQL tables."""
-        async with self.connection.cursor() as cursor:
-            if schema:
-                await cursor.execute(f"USE {schema}")
-            await cursor.execute("SHOW TABLES")
-            rows = await cursor.fetchall()
+        # Qualify by schema instead of USE so pooled connections keep their default database
+        async with self.acquire() as conn:
+            async with conn.cursor() as cursor:
+                if schema:
+                    await cursor.execute(f"SHOW TABLES FROM `{schema}`")
+                else:
+                    await cursor.execute("SHOW TABLES")
+                rows = await cursor.fetchall()
         return [row[0] for row in rows]
     
     async def get_columns(self, table: str, schema: str = None) -> List[Dict[str, Any]]:
         """Get MySQL table columns."""
-        async with self.connection.cursor() as cursor:
-            if schema:
-                await cursor.execute(f"USE {schema}")
-            await cursor.execute(f"DESCRIBE {table}")
-            rows = await cursor.fetchall()
+        async with self.acquire() as conn:
+            async with conn.cursor() as cursor:
+                if schema:
+                    await cursor.execute(f"DESCRIBE `{schema}`.`{table}`")
+                else:
+                    await cursor.execute(f"DESCRIBE `{table}`")
+                rows = await cursor.fetchall()
         return [
             {
                 "column_name": row[0],
@@ -83,13 +199,173 @@ class MySQLConnector(BaseConnector):
             for row in rows
         ]
     
-    async def execute_query(self, query: str) -> Dict[str, Any]:
-        """Execute MySQL query."""
-        try:
-            async with self.connection.cursor() as cursor:
+    async def get_primary_key(self, table: str, schema: str = None) -> List[str]:
+        """Get MySQL primary key columns in key order."""
+        query = """
+        SELECT COLUMN_NAME FROM information_schema.KEY_COLUMN_USAGE
+        WHERE TABLE_SCHEMA = COALESCE(%s, DATABASE()) AND TABLE_NAME = %s AND CONSTRAINT_NAME = 'PRIMARY'
+        ORDER BY ORDINAL_POSITION
+        """
+        async with self.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (schema, table))
+                rows = await cursor.fetchall()
+        return [row[0] for row in rows]
+    
+    async def estimate_row_count(self, table: str, schema: str = None) -> Optional[int]:
+        """Get MySQL's row estimate from information_schema.TABLES."""
+        query = """
+        SELECT TABLE_ROWS FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = COALESCE(%s, DATABASE()) AND TABLE_NAME = %s
+        """
+        async with self.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(query, (schema, table))
+                row = await cursor.fetchone()
+        return int(row[0]) if row and row[0] is not None else None
+    
+    async def get_table_fingerprints(self) -> Optional[Dict[str, Dict[str, str]]]:
+        """Fingerprint tables by checksums over their column and index definitions."""
+        excluded = "('information_schema', 'performance_schema', 'mysql', 'sys')"
+        query = f"""
+        SELECT t.TABLE_SCHEMA, t.TABLE_NAME, CONCAT_WS('|',
+            (SELECT CONCAT(COUNT(*), ':', IFNULL(SUM(CRC32(CONCAT_WS(':', c.ORDINAL_POSITION, c.COLUMN_NAME, c.COLUMN_TYPE,
+                                                                     c.IS_NULLABLE, IFNULL(c.COLUMN_DEFAULT, '')))), 0))
+             FROM information_schema.COLUMNS c
+             WHERE c.TABLE_SCHEMA = t.TABLE_SCHEMA AND c.TABLE_NAME = t.TABLE_NAME),
+            (SELECT CONCAT(COUNT(*), ':', IFNULL(SUM(CRC32(CONCAT_WS(':', s.INDEX_NAME, s.NON_UNIQUE, s.SEQ_IN_INDEX, s.COLUMN_NAME))), 0))
+             FROM information_schema.STATISTICS s
+             WHERE s.TABLE_SCHEMA = t.TABLE_SCHEMA AND s.TABLE_NAME = t.TABLE_NAME),
+            (SELECT CONCAT(COUNT(*), ':', IFNULL(SUM(CRC32(CONCAT_WS(':', k.CONSTRAINT_NAME, k.COLUMN_NAME,
+                                                                     k.REFERENCED_TABLE_NAME, k.REFERENCED_COLUMN_NAME))), 0))
+             FROM information_schema.KEY_COLUMN_USAGE k
+             WHERE k.TABLE_SCHEMA = t.TABLE_SCHEMA AND k.TABLE_NAME = t.TABLE_NAME))
+        FROM information_schema.TABLES t
+        WHERE t.TABLE_SCHEMA NOT IN {excluded} AND t.TABLE_TYPE = 'BASE TABLE'
+        """
+        async with self.acquire() as conn:
+            async with conn.cursor() as cursor:
                 await cursor.execute(query)
                 rows = await cursor.fetchall()
-                columns = [desc[0] for desc in cursor.description] if cursor.description else []
+        fingerprints: Dict[str, Dict[str, str]] = {}
+        for schema, table, fingerprint in rows:
+            fingerprints.setdefault(schema, {})[table] = fingerprint
+        return fingerprints
+    
+    async def get_catalog(self, tables: Optional[Dict[str, List[str]]] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Get all schemas, tables, columns, keys and indexes in a few bulk queries."""
+        excluded = "('information_schema', 'performance_schema', 'mysql', 'sys')"
+        # Restricts each query to the requested (schema, table) pairs
+        table_filter = ""
+        args: Optional[List[str]] = None
+        if tables is not None:
+            pairs = [(schema, table) for schema, names in tables.items() for table in names]
+            if not pairs:
+                return {}
+            table_filter = f" AND (TABLE_SCHEMA, TABLE_NAME) IN ({', '.join(['(%s, %s)'] * len(pairs))})"
+            args = [value for pair in pairs for value in pair]
+        schemas = await self.get_schemas() if tables is None else []
+        async with self.acquire() as conn:
+            async with conn.cursor() as cursor:
+                await cursor.execute(f"""
+                SELECT TABLE_SCHEMA, TABLE_NAME
+                FROM information_schema.TABLES
+                WHERE TABLE_SCHEMA NOT IN {excluded}{table_filter} AND TABLE_TYPE = 'BASE TABLE'
+                ORDER BY TABLE_SCHEMA, TABLE_NAME
+                """, args)
+                table_rows = await cursor.fetchall()
+                await cursor.execute(f"""
+                SELECT TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_DEFAULT
+                FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA NOT IN {excluded}{table_filter}
+                ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION
+                """, args)
+                column_rows = await cursor.fetchall()
+                await cursor.execute(f"""
+                SELECT TABLE_SCHEMA, TABLE_NAME, CONSTRAINT_NAME, COLUMN_NAME,
+                       REFERENCED_TABLE_SCHEMA, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME
+                FROM information_schema.KEY_COLUMN_USAGE
+                WHERE TABLE_SCHEMA NOT IN {excluded}{table_filter}
+                  AND (CONSTRAINT_NAME = 'PRIMARY' OR REFERENCED_TABLE_NAME IS NOT NULL)
+                ORDER BY TABLE_SCHEMA, TABLE_NAME, CONSTRAINT_NAME, ORDINAL_POSITION
+                """, args)
+                key_rows = await cursor.fetchall()
+                await cursor.execute(f"""
+                SELECT TABLE_SCHEMA, TABLE_NAME, INDEX_NAME, NON_UNIQUE, COLUMN_NAME
+                FROM information_schema.STATISTICS
+                WHERE TABLE_SCHEMA NOT IN {excluded}{table_filter}
+                ORDER BY TABLE_SCHEMA, TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX
+                """, args)
+                index_rows = await cursor.fetchall()
+        
+        catalog = {schema: {} for schema in schemas}
+        for schema, table in table_rows:
+            catalog.setdefault(schema, {})[table] = self._new_catalog_table()
+        
+        for schema, table_name, column, data_type, nullable, default in column_rows:
+            table = catalog.get(schema, {}).get(table_name)
+            if table is not None:
+                table["columns"].append({
+                    "column_name": column,
+                    "data_type": data_type,
+                    "is_nullable": "YES" if nullable == "YES" else "NO",
+                    "column_default": default
+                })
+        
+        # Rows arrive one per key column, grouped by constraint
+        foreign_keys = {}
+        for schema, table_name, name, column, ref_schema, ref_table, ref_column in key_rows:
+            table = catalog.get(schema, {}).get(table_name)
+            if table is None:
+                continue
+            if name == 'PRIMARY':
+                table["primary_key"].append(column)
+                continue
+            key = (schema, table_name, name)
+            if key not in foreign_keys:
+                foreign_keys[key] = {
+                    "name": name,
+                    "columns": [],
+                    "referenced_schema": ref_schema,
+                    "referenced_table": ref_table,
+                    "referenced_columns": []
+                }
+                table["foreign_keys"].append(foreign_keys[key])
+            foreign_keys[key]["columns"].append(column)
+            foreign_keys[key]["referenced_columns"].append(ref_column)
+        
+        indexes = {}
+        for schema, table_name, name, non_unique, column in index_rows:
+            table = catalog.get(schema, {}).get(table_name)
+            if table is None:
+                continue
+            key = (schema, table_name, name)
+            if key not in indexes:
+                indexes[key] = {"name": name, "columns": [], "unique": not non_unique}
+                table["indexes"].append(indexes[key])
+            # Functional index parts have no column name
+            if column is not None:
+                indexes[key]["columns"].append(column)
+        
+        return catalog
+    
+    async def execute_query(self, query: str, params: Optional[Params] = None) -> Dict[str, Any]:
+        """Execute MySQL query."""
+        try:
+            # PREPARE takes ? placeholders; native %s queries run unprepared
+            prepared = prepared_cache.is_preparable(query) and "%s" not in query
+            query, args = bind_params(
+                query, params, QMARK if prepared else self.placeholder_style, backslash_escapes=True
+            )
+            async with self.acquire() as conn:
+                async with conn.cursor() as cursor:
+                    if prepared:
+                        await self._execute_prepared(conn, cursor, query, args)
+                    else:
+                        await cursor.execute(query, args)
+                        self.invalidate_statements(query)
+                    rows = await cursor.fetchall()
+                    columns = [desc[0] for desc in cursor.description] if cursor.description else []
             return {
                 "success": True,
                 "columns": columns,
@@ -97,4 +373,85 @@ class MySQLConnector(BaseConnector):
                 "row_count": len(rows)
             }
         except Exception as e:
-            return {"success": False, "error": str(e)}
\ No newline at end of file
+            return {"success": False, "error": str(e)}
+    
+    async def execute_many(self, query: str, seq_of_params: Sequence[Params]) -> Dict[str, Any]:
+        """Execute a MySQL statement for each parameter set in a single transaction."""
+        try:
+            query, args_list = bind_many(query, seq_of_params, self.placeholder_style, backslash_escapes=True)
+            async with self.acquire() as conn:
+                # aiomysql splits large multi-row inserts into several statements,
+                # each committing on its own under autocommit
+                await conn.begin()
+                try:
+                    async with conn.cursor() as cursor:
+                        # aiomysql folds INSERT ... VALUES into multi-row inserts
+                        await cursor.executemany(query, args_list)
+                        row_count = cursor.rowcount
+                    await conn.commit()
+                except Exception:
+                    await conn.rollback()
+                    raise
+            return {"success": True, "row_count": row_count}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def execute_batch(self, statements: Sequence[Tuple[str, Sequence[Params]]]) -> Dict[str, Any]:
+        """Run MySQL statement groups with executemany in a single transaction."""
+        try:
+            row_count = 0
+            async with self.acquire() as conn:
+                await conn.begin()
+                try:
+                    async with conn.cursor() as cursor:
+                        for query, seq_of_params in statements:
+                            query, args_list = bind_many(
+                                query, seq_of_params, self.placeholder_style, backslash_escapes=True
+                            )
+                            await cursor.executemany(query, args_list)
+                            row_count += len(args_list)
+                    await conn.commit()
+                except Exception:
+                    await conn.rollback()
+                    raise
+            return {"success": True, "row_count": row_count}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    def quote_identifier(self, name: str) -> str:
+        """Quote a table or column name with backticks."""
+        return '`' + name.replace('`', '``') + '`'
+    
+    async def stream_query(
+        self,
+        query: str,
+        params: Optional[Params] = None,
+        batch_size: int = 1000,
+        first_batch_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream MySQL query results using an unbuffered server-side cursor.
+        
+        Stopping early closes the connection rather than the cursor, since
+        closing an unbuffered cursor reads every remaining row off the wire.
+        The pool discards the closed connection and the server aborts the query.
+        """
+        query, args = bind_params(query, params, self.placeholder_style, backslash_escapes=True)
+        async with self.acquire() as conn:
+            cursor = await conn.cursor(aiomysql.SSCursor)
+            finished = False
+            try:
+                await cursor.execute(query, args)
+                columns = [desc[0] for desc in cursor.description] if cursor.description else []
+                size = first_batch_size or batch_size
+                while True:
+                    rows = await cursor.fetchmany(size)
+                    if not rows:
+                        break
+                    yield {"columns": columns, "data": [list(row) for row in rows]}
+                    size = batch_size
+                finished = True
+            finally:
+                if finished:
+                    await cursor.close()
+                else:
+                    conn.close()
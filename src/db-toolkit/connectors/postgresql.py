@@ -1,24 +1,72 @@
 """PostgreSQL database connector."""
 
 import asyncpg
-from typing import Dict, List, Any
+import uuid
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 from connectors.base import BaseConnector
-from core.models import DatabaseConnection
+from core.models import DatabaseConnection, DatabaseType
+from utils.cache import prepared_cache
+from utils.sql_params import NUMERIC, Params, bind_many, bind_params
+
+# asyncpg binds parameters in binary form, so text values coming from the UI or
+# CSV files must be converted to the Python type of the target parameter
+_TEXT_COERCIONS = {
+    "int2": int,
+    "int4": int,
+    "int8": int,
+    "oid": int,
+    "float4": float,
+    "float8": float,
+    "numeric": Decimal,
+    "bool": lambda value: value.strip().lower() in ("true", "t", "1", "yes", "y", "on"),
+    "date": date.fromisoformat,
+    "timestamp": datetime.fromisoformat,
+    "timestamptz": datetime.fromisoformat,
+    "time": time.fromisoformat,
+    "uuid": uuid.UUID,
+}
+
+# Seconds to wait for the session that sends a cancel request
+CANCEL_CONNECT_TIMEOUT = 5
+
+
+def _coerce_args(parameter_types, args: Sequence[Any]) -> List[Any]:
+    """Convert string arguments to the types PostgreSQL expects for each parameter."""
+    coerced = []
+    for param_type, value in zip(parameter_types, args):
+        convert = _TEXT_COERCIONS.get(param_type.name)
+        if convert and isinstance(value, str):
+            value = convert(value)
+        coerced.append(value)
+    return coerced
 
 
 class PostgreSQLConnector(BaseConnector):
     """PostgreSQL database connector."""
     
+    db_type = DatabaseType.POSTGRESQL
+    placeholder_style = NUMERIC
+    
     async def connect(self, config: DatabaseConnection) -> bool:
         """Connect to PostgreSQL database."""
         try:
-            self.connection = await asyncpg.connect(
-                host=config.host,
-                port=config.port or 5432,
-                user=config.username,
-                password=config.password,
-                database=config.database
+            # Kept for the short-lived sessions that send cancel requests
+            self._connect_kwargs = {
+                "host": config.host,
+                "port": config.port or 5432,
+                "user": config.username,
+                "password": config.password,
+                "database": config.database
+            }
+            self.pool = await asyncpg.create_pool(
+                **self._connect_kwargs,
+                min_size=self.pool_min_size,
+                max_size=self.pool_max_size
             )
+            # The pool exposes fetch/fetchrow/execute, so analytics can use it directly
+            self.connection = self.pool
             self.is_connected = True
             return True
         except Exception:
@@ -28,13 +76,94 @@ class PostgreSQLConnector(BaseConnector):
     async def disconnect(self) -> bool:
         """Disconnect from PostgreSQL."""
         try:
-            if self.connection:
-                await self.connection.close()
+            if self.pool:
+                await self.pool.close()
+            self.pool = None
+            self.connection = None
             self.is_connected = False
             return True
         except Exception:
             return False
     
+    async def acquire_connection(self):
+        """Acquire a connection from the pool."""
+        return await self.pool.acquire()
+    
+    async def release_connection(self, conn) -> None:
+        """Return a connection to the pool."""
+        await self.pool.release(conn)
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get asyncpg pool statistics."""
+        if not self.pool:
+            return super().get_pool_stats()
+        size = self.pool.get_size()
+        idle = self.pool.get_idle_size()
+        return {
+            "pooled": True,
+            "min_size": self.pool.get_min_size(),
+            "max_size": self.pool.get_max_size(),
+            "size": size,
+            "idle": idle,
+            "in_use": size - idle
+        }
+    
+    def _session_key(self, conn) -> Any:
+        """Key prepared statements by the driver connection behind a pool proxy.
+        
+        A new connection may get the PID of a closed one, so the PID alone
+        could hand out statements that died with the old backend.
+        """
+        return getattr(conn, "_con", None) or conn
+    
+    def _backend_id(self, conn) -> Any:
+        """Cancel by backend PID."""
+        return conn.get_server_pid()
+    
+    async def cancel_query(self, entry: Dict[str, Any]) -> bool:
+        """Cancel a running query with pg_cancel_backend from a short-lived session.
+        
+        The cancel runs outside the pool, so it still gets through when every
+        pooled connection is busy with the queries it is meant to stop.
+        """
+        session, backend_id = entry.get("session"), entry.get("backend_id")
+        if session is None:
+            return False
+        conn = await asyncpg.connect(**self._connect_kwargs, timeout=CANCEL_CONNECT_TIMEOUT)
+        try:
+            if not self._still_running_on(entry, session, backend_id):
+                return False
+            return await conn.fetchval("SELECT pg_cancel_backend($1)", backend_id)
+        finally:
+            await conn.close()
+    
+    async def _prepare(self, conn, query: str) -> Any:
+        """Prepare a statement with asyncpg."""
+        return await conn.prepare(query)
+    
+    async def _fetch_prepared(self, conn, query: str, args: Sequence[Any]) -> List[Any]:
+        """Fetch rows with a cached prepared statement, re-preparing once if it went stale."""
+        for attempt in range(2):
+            statement = await self.prepare_cached(conn, query)
+            try:
+                return await statement.fetch(*_coerce_args(statement.get_parameters(), args))
+            except (asyncpg.exceptions.InvalidCachedStatementError,
+                    asyncpg.exceptions.OutdatedSchemaCacheError):
+                # The schema changed under the statement (e.g. ALTER TABLE elsewhere)
+                if attempt:
+                    raise
+                self.invalidate_statements()
+            except asyncpg.exceptions.InterfaceError:
+                # The statement belongs to a connection that was closed or reset
+                if attempt:
+                    raise
+                prepared_cache.discard(self.connection_id, self._session_key(conn), query)
+    
+    async def ping(self, timeout: Optional[float] = None) -> None:
+        """Ping PostgreSQL with SELECT 1 on a pooled connection."""
+        async with self.acquire() as conn:
+            await conn.fetchval("SELECT 1", timeout=timeout)
+    
     async def test_connection(self, config: DatabaseConnection) -> Dict[str, Any]:
         """Test PostgreSQL connection."""
         try:
@@ -58,7 +187,8 @@ class PostgreSQLConnector(BaseConnector):
         WHERE schema_name NOT IN ('information_schema', 'pg_catalog', 'pg_toast')
         ORDER BY schema_name
         """
-        rows = await self.connection.fetch(query)
+        async with self.acquire() as conn:
+            rows = await conn.fetch(query)
         return [row['schema_name'] for row in rows]
     
     async def get_tables(self, schema: str = "public") -> List[str]:
@@ -69,7 +199,8 @@ class PostgreSQLConnector(BaseConnector):
         WHERE table_schema = $1 AND table_type = 'BASE TABLE'
         ORDER BY table_name
         """
-        rows = await self.connection.fetch(query, schema)
+        async with self.acquire() as conn:
+            rows = await conn.fetch(query, schema)
         return [row['table_name'] for row in rows]
     
     async def get_columns(self, table: str, schema: str = "public") -> List[Dict[str, Any]]:
@@ -80,13 +211,167 @@ class PostgreSQLConnector(BaseConnector):
         WHERE table_schema = $1 AND table_name = $2
         ORDER BY ordinal_position
         """
-        rows = await self.connection.fetch(query, schema, table)
+        async with self.acquire() as conn:
+            rows = await conn.fetch(query, schema, table)
         return [dict(row) for row in rows]
     
-    async def execute_query(self, query: str) -> Dict[str, Any]:
+    async def get_primary_key(self, table: str, schema: str = "public") -> List[str]:
+        """Get PostgreSQL primary key columns in key order."""
+        query = """
+        SELECT a.attname
+        FROM pg_index i
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+        WHERE i.indrelid = format('%I.%I', $1::text, $2::text)::regclass AND i.indisprimary
+        ORDER BY array_position(i.indkey, a.attnum)
+        """
+        async with self.acquire() as conn:
+            rows = await conn.fetch(query, schema or "public", table)
+        return [row[0] for row in rows]
+    
+    async def estimate_row_count(self, table: str, schema: str = "public") -> Optional[int]:
+        """Get PostgreSQL's row estimate from pg_class.reltuples."""
+        query = "SELECT reltuples::bigint FROM pg_class WHERE oid = format('%I.%I', $1::text, $2::text)::regclass"
+        async with self.acquire() as conn:
+            estimate = await conn.fetchval(query, schema or "public", table)
+        # -1 until the table is first vacuumed or analyzed
+        return estimate if estimate is not None and estimate >= 0 else None
+    
+    async def get_table_fingerprints(self) -> Optional[Dict[str, Dict[str, str]]]:
+        """Fingerprint tables by the row versions of their pg_class, pg_attribute, index and constraint rows."""
+        # DDL writes new catalog rows, so their xmin changes; VACUUM and ANALYZE update in place
+        query = """
+        SELECT n.nspname, c.relname, md5(concat_ws('|', c.oid, c.xmin,
+            (SELECT string_agg(a.attnum || ':' || a.xmin, ',' ORDER BY a.attnum)
+             FROM pg_attribute a WHERE a.attrelid = c.oid AND a.attnum > 0),
+            (SELECT string_agg(i.indexrelid || ':' || ic.xmin, ',' ORDER BY i.indexrelid)
+             FROM pg_index i JOIN pg_class ic ON ic.oid = i.indexrelid WHERE i.indrelid = c.oid),
+            (SELECT string_agg(con.oid || ':' || con.xmin, ',' ORDER BY con.oid)
+             FROM pg_constraint con WHERE con.conrelid = c.oid)))
+        FROM pg_class c
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        WHERE c.relkind IN ('r', 'p')
+          AND n.nspname NOT IN ('information_schema', 'pg_catalog', 'pg_toast')
+          AND n.nspname NOT LIKE 'pg_temp%' AND n.nspname NOT LIKE 'pg_toast_temp%'
+        """
+        async with self.acquire() as conn:
+            rows = await conn.fetch(query)
+        fingerprints: Dict[str, Dict[str, str]] = {}
+        for schema, table, fingerprint in rows:
+            fingerprints.setdefault(schema, {})[table] = fingerprint
+        return fingerprints
+    
+    async def get_catalog(self, tables: Optional[Dict[str, List[str]]] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Get all schemas, tables, columns, keys and indexes in a few bulk queries."""
+        excluded = "('information_schema', 'pg_catalog', 'pg_toast')"
+        # Restricts each query to the requested (schema, table) pairs
+        table_filter = ""
+        args: Tuple[Any, ...] = ()
+        if tables is not None:
+            pairs = [(schema, table) for schema, names in tables.items() for table in names]
+            if not pairs:
+                return {}
+            args = ([schema for schema, _ in pairs], [table for _, table in pairs])
+            table_filter = " AND ({}, {}) IN (SELECT * FROM unnest($1::text[], $2::text[]))"
+        tables_query = f"""
+        SELECT table_schema, table_name
+        FROM information_schema.tables
+        WHERE table_schema NOT IN {excluded}{table_filter.format('table_schema', 'table_name')} AND table_type = 'BASE TABLE'
+        ORDER BY table_schema, table_name
+        """
+        columns_query = f"""
+        SELECT table_schema, table_name, column_name, data_type, is_nullable, column_default
+        FROM information_schema.columns
+        WHERE table_schema NOT IN {excluded}{table_filter.format('table_schema', 'table_name')}
+        ORDER BY table_schema, table_name, ordinal_position
+        """
+        constraints_query = f"""
+        SELECT n.nspname AS table_schema, c.relname AS table_name,
+               con.conname AS name, con.contype AS type,
+               ARRAY(SELECT a.attname FROM unnest(con.conkey) WITH ORDINALITY AS k(attnum, ord)
+                     JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+                     ORDER BY k.ord) AS columns,
+               rn.nspname AS referenced_schema, rc.relname AS referenced_table,
+               ARRAY(SELECT a.attname FROM unnest(con.confkey) WITH ORDINALITY AS k(attnum, ord)
+                     JOIN pg_attribute a ON a.attrelid = con.confrelid AND a.attnum = k.attnum
+                     ORDER BY k.ord) AS referenced_columns
+        FROM pg_constraint con
+        JOIN pg_class c ON c.oid = con.conrelid
+        JOIN pg_namespace n ON n.oid = c.relnamespace
+        LEFT JOIN pg_class rc ON rc.oid = con.confrelid
+        LEFT JOIN pg_namespace rn ON rn.oid = rc.relnamespace
+        WHERE con.contype IN ('p', 'f') AND n.nspname NOT IN {excluded}{table_filter.format('n.nspname', 'c.relname')}
+        ORDER BY con.conname
+        """
+        indexes_query = f"""
+        SELECT n.nspname AS table_schema, t.relname AS table_name,
+               i.relname AS name, ix.indisunique AS is_unique,
+               ARRAY(SELECT a.attname FROM unnest(ix.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord)
+                     JOIN pg_attribute a ON a.attrelid = ix.indrelid AND a.attnum = k.attnum
+                     ORDER BY k.ord) AS columns
+        FROM pg_index ix
+        JOIN pg_class i ON i.oid = ix.indexrelid
+        JOIN pg_class t ON t.oid = ix.indrelid
+        JOIN pg_namespace n ON n.oid = t.relnamespace
+        WHERE n.nspname NOT IN {excluded}{table_filter.format('n.nspname', 't.relname')}
+        ORDER BY i.relname
+        """
+        schemas = await self.get_schemas() if tables is None else []
+        async with self.acquire() as conn:
+            table_rows = await conn.fetch(tables_query, *args)
+            column_rows = await conn.fetch(columns_query, *args)
+            constraint_rows = await conn.fetch(constraints_query, *args)
+            index_rows = await conn.fetch(indexes_query, *args)
+        
+        catalog = {schema: {} for schema in schemas}
+        for row in table_rows:
+            catalog.setdefault(row['table_schema'], {})[row['table_name']] = self._new_catalog_table()
+        
+        for row in column_rows:
+            table = catalog.get(row['table_schema'], {}).get(row['table_name'])
+            if table is not None:
+                table["columns"].append({
+                    "column_name": row['column_name'],
+                    "data_type": row['data_type'],
+                    "is_nullable": row['is_nullable'],
+                    "column_default": row['column_default']
+                })
+        
+        for row in constraint_rows:
+            table = catalog.get(row['table_schema'], {}).get(row['table_name'])
+            if table is None:
+                continue
+            if row['type'] == 'p':
+                table["primary_key"] = list(row['columns'])
+            else:
+                table["foreign_keys"].append({
+                    "name": row['name'],
+                    "columns": list(row['columns']),
+                    "referenced_schema": row['referenced_schema'],
+                    "referenced_table": row['referenced_table'],
+                    "referenced_columns": list(row['referenced_columns'])
+                })
+        
+        for row in index_rows:
+            table = catalog.get(row['table_schema'], {}).get(row['table_name'])
+            if table is not None:
+                table["indexes"].append({
+                    "name": row['name'],
+                    "columns": list(row['columns']),
+                    "unique": row['is_unique']
+                })
+        
+        return catalog
+    
+    async def execute_query(self, query: str, params: Optional[Params] = None) -> Dict[str, Any]:
         """Execute PostgreSQL query."""
         try:
-            rows = await self.connection.fetch(query)
+            query, args = bind_params(query, params, self.placeholder_style)
+            async with self.acquire() as conn:
+                if args or prepared_cache.is_preparable(query):
+                    rows = await self._fetch_prepared(conn, query, args or ())
+                else:
+                    rows = await conn.fetch(query)
+                    self.invalidate_statements(query)
             if rows:
                 columns = list(rows[0].keys())
                 data = [list(row.values()) for row in rows]
@@ -98,4 +383,59 @@ class PostgreSQLConnector(BaseConnector):
                 }
             return {"success": True, "columns": [], "data": [], "row_count": 0}
         except Exception as e:
-            return {"success": False, "error": str(e)}
\ No newline at end of file
+            return {"success": False, "error": str(e)}
+    
+    async def execute_many(self, query: str, seq_of_params: Sequence[Params]) -> Dict[str, Any]:
+        """Execute a PostgreSQL statement for each parameter set."""
+        try:
+            query, args_list = bind_many(query, seq_of_params, self.placeholder_style)
+            async with self.acquire() as conn:
+                statement = await self.prepare_cached(conn, query)
+                parameter_types = statement.get_parameters()
+                await statement.executemany(
+                    [_coerce_args(parameter_types, args) for args in args_list]
+                )
+            return {"success": True, "row_count": len(args_list)}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def execute_batch(self, statements: Sequence[Tuple[str, Sequence[Params]]]) -> Dict[str, Any]:
+        """Run PostgreSQL statement groups with executemany in a single transaction."""
+        try:
+            row_count = 0
+            async with self.acquire() as conn:
+                async with conn.transaction():
+                    for query, seq_of_params in statements:
+                        query, args_list = bind_many(query, seq_of_params, self.placeholder_style)
+                        statement = await self.prepare_cached(conn, query)
+                        parameter_types = statement.get_parameters()
+                        await statement.executemany(
+                            [_coerce_args(parameter_types, args) for args in args_list]
+                        )
+                        row_count += len(args_list)
+            return {"success": True, "row_count": row_count}
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def stream_query(
+        self,
+        query: str,
+        params: Optional[Params] = None,
+        batch_size: int = 1000,
+        first_batch_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream PostgreSQL query results using a server-side cursor."""
+        query, args = bind_params(query, params, self.placeholder_style)
+        async with self.acquire() as conn:
+            # asyncpg cursors only live inside a transaction
+            async with conn.transaction():
+                statement = await self.prepare_cached(conn, query)
+                columns = [attr.name for attr in statement.get_attributes()]
+                cursor = await statement.cursor(*_coerce_args(statement.get_parameters(), args or ()))
+                size = first_batch_size or batch_size
+                while True:
+                    rows = await cursor.fetch(size)
+                    if not rows:
+                        break
+                    yield {"columns": columns, "data": [list(row.values()) for row in rows]}
+                    size = batch_size
@@ -1,18 +1,84 @@
 """SQLite database connector."""
 
+import asyncio
+import hashlib
+import sqlite3
 import aiosqlite
-from typing import Dict, List, Any
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
 from connectors.base import BaseConnector
-from core.models import DatabaseConnection
+from core.models import DatabaseConnection, DatabaseType
+from utils.cache import prepared_cache
+from utils.sql_lexer import classify
+from utils.sql_params import QMARK, Params, bind_many, bind_params
+
+
+async def estimate_table_rows(conn: aiosqlite.Connection, table: str) -> Optional[int]:
+    """Estimate a table's rows without scanning it, or None if it has no rowid."""
+    try:
+        cursor = await conn.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = ? LIMIT 1", (table,))
+        row = await cursor.fetchone()
+        if row and row[0]:
+            # The first number of every stat row is the table's row count
+            return int(row[0].split()[0])
+    except sqlite3.OperationalError:
+        # sqlite_stat1 only exists once ANALYZE has run
+        pass
+    try:
+        # An index seek; exact unless rows were deleted
+        cursor = await conn.execute(f'SELECT MAX(rowid) FROM "{table.replace(chr(34), chr(34) * 2)}"')
+        row = await cursor.fetchone()
+        return row[0] or 0
+    except sqlite3.OperationalError:
+        return None
 
 
 class SQLiteConnector(BaseConnector):
-    """SQLite database connector."""
+    """SQLite database connector.
+    
+    File databases run in WAL mode with one writer connection and a small
+    pool of read-only connections, so SELECTs run in parallel on their own
+    threads instead of queueing behind writes. In-memory databases use the
+    single writer connection for everything.
+    """
+    
+    db_type = DatabaseType.SQLITE
+    placeholder_style = QMARK
+    
+    def __init__(self):
+        """Initialize connector."""
+        super().__init__()
+        self._reader_uri: Optional[str] = None
+        self._idle_readers: Optional[asyncio.Queue] = None
+        self._readers: List[aiosqlite.Connection] = []
+        self._write_lock = asyncio.Lock()
+    
+    async def _open(self, database: str, **kwargs) -> aiosqlite.Connection:
+        """Open a connection sized to the shared prepared statement cache."""
+        # sqlite3 keeps its own LRU of compiled statements; size it like the shared cache
+        return await aiosqlite.connect(
+            database,
+            cached_statements=prepared_cache.max_per_connection,
+            **kwargs
+        )
     
     async def connect(self, config: DatabaseConnection) -> bool:
         """Connect to SQLite database."""
         try:
-            self.connection = await aiosqlite.connect(config.database)
+            self.connection = await self._open(config.database)
+            
+            database = config.database or ""
+            if database and database != ":memory:" and not database.startswith("file:"):
+                # WAL lets readers run alongside the writer; it persists in the file
+                async with self.connection.execute("PRAGMA journal_mode=WAL") as cursor:
+                    # Finishing the statement releases its lock on the new file
+                    await cursor.fetchone()
+                self._reader_uri = Path(database).resolve().as_uri() + "?mode=ro"
+                self._idle_readers = asyncio.Queue()
+                for _ in range(self.pool_min_size):
+                    await self._add_reader()
+            
             self.is_connected = True
             return True
         except Exception:
@@ -22,6 +88,11 @@ class SQLiteConnector(BaseConnector):
     async def disconnect(self) -> bool:
         """Disconnect from SQLite."""
         try:
+            for reader in self._readers:
+                await reader.close()
+            self._readers = []
+            self._idle_readers = None
+            self._reader_uri = None
             if self.connection:
                 await self.connection.close()
             self.is_connected = False
@@ -29,6 +100,64 @@ class SQLiteConnector(BaseConnector):
         except Exception:
             return False
     
+    async def _add_reader(self) -> None:
+        """Open another read-only connection and make it available."""
+        reader = await self._open(self._reader_uri, uri=True)
+        self._readers.append(reader)
+        self._idle_readers.put_nowait(reader)
+    
+    async def acquire_connection(self):
+        """Acquire a read-only connection, opening one if the pool has room."""
+        if self._idle_readers is None:
+            return self.connection
+        if self._idle_readers.empty() and len(self._readers) < self.pool_max_size:
+            await self._add_reader()
+        return await self._idle_readers.get()
+    
+    async def release_connection(self, conn) -> None:
+        """Return a read-only connection to the pool."""
+        if self._idle_readers is not None and conn is not self.connection:
+            self._idle_readers.put_nowait(conn)
+    
+    @asynccontextmanager
+    async def _writer(self):
+        """Hold the single writer connection for one write."""
+        async with self._write_lock:
+            with self._running_on(self.connection):
+                yield self.connection
+    
+    async def cancel_query(self, entry: Dict[str, Any]) -> bool:
+        """Interrupt the statement running on a registered query's connection."""
+        conn = entry.get("session")
+        if conn is None:
+            return False
+        await conn.interrupt()
+        return True
+    
+    def get_pool_stats(self) -> Dict[str, Any]:
+        """Get reader pool statistics; the writer counts as one busy connection."""
+        if self._idle_readers is None:
+            return super().get_pool_stats()
+        size = len(self._readers) + 1
+        idle = self._idle_readers.qsize()
+        return {
+            "pooled": True,
+            "min_size": self.pool_min_size + 1,
+            "max_size": self.pool_max_size + 1,
+            "size": size,
+            "idle": idle,
+            "in_use": size - idle
+        }
+    
+    async def _prepare(self, conn, query: str) -> Any:
+        """Track a statement compiled and cached by sqlite3 itself."""
+        return prepared_cache.normalize(query)
+    
+    async def ping(self, timeout: Optional[float] = None) -> None:
+        """Check the SQLite connection is still usable."""
+        cursor = await asyncio.wait_for(self.connection.execute("SELECT 1"), timeout=timeout)
+        await cursor.close()
+    
     async def test_connection(self, config: DatabaseConnection) -> Dict[str, Any]:
         """Test SQLite connection."""
         try:
@@ -44,16 +173,18 @@ class SQLiteConnector(BaseConnector):
     
     async def get_tables(self, schema: str = None) -> List[str]:
         """Get SQLite tables."""
-        cursor = await self.connection.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
-        )
-        rows = await cursor.fetchall()
+        async with self.acquire() as conn:
+            cursor = await conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+            )
+            rows = await cursor.fetchall()
         return [row[0] for row in rows]
     
     async def get_columns(self, table: str, schema: str = None) -> List[Dict[str, Any]]:
         """Get SQLite table columns."""
-        cursor = await self.connection.execute(f"PRAGMA table_info({table})")
-        rows = await cursor.fetchall()
+        async with self.acquire() as conn:
+            cursor = await conn.execute(f"PRAGMA table_info({table})")
+            rows = await cursor.fetchall()
         return [
             {
                 "column_name": row[1],
@@ -64,12 +195,136 @@ class SQLiteConnector(BaseConnector):
             for row in rows
         ]
     
-    async def execute_query(self, query: str) -> Dict[str, Any]:
-        """Execute SQLite query."""
-        try:
-            cursor = await self.connection.execute(query)
-            await self.connection.commit()
+    async def get_primary_key(self, table: str, schema: str = None) -> List[str]:
+        """Get SQLite primary key columns in key order."""
+        async with self.acquire() as conn:
+            cursor = await conn.execute(
+                "SELECT name FROM pragma_table_info(?) WHERE pk > 0 ORDER BY pk", (table,)
+            )
             rows = await cursor.fetchall()
+        return [row[0] for row in rows]
+    
+    async def estimate_row_count(self, table: str, schema: str = None) -> Optional[int]:
+        """Estimate SQLite rows from sqlite_stat1, or MAX(rowid) before ANALYZE has run."""
+        async with self.acquire() as conn:
+            return await estimate_table_rows(conn, table)
+    
+    async def get_table_fingerprints(self) -> Optional[Dict[str, Dict[str, str]]]:
+        """Fingerprint tables by the sqlite_master SQL of the table and its indexes."""
+        async with self.acquire() as conn:
+            cursor = await conn.execute("""
+            SELECT tbl_name, type, name, sql FROM sqlite_master
+            WHERE type IN ('table', 'index') AND tbl_name NOT LIKE 'sqlite_%'
+            ORDER BY tbl_name, type DESC, name
+            """)
+            rows = await cursor.fetchall()
+        
+        definitions: Dict[str, List[str]] = {}
+        tables = set()
+        for table, kind, name, sql in rows:
+            if kind == "table":
+                tables.add(table)
+            definitions.setdefault(table, []).append(f"{kind}:{name}:{sql or ''}")
+        return {"main": {
+            table: hashlib.md5("\n".join(definitions[table]).encode()).hexdigest()
+            for table in tables
+        }}
+    
+    async def get_catalog(self, tables: Optional[Dict[str, List[str]]] = None) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Get all tables, columns, keys and indexes via pragma table-valued functions."""
+        names: Tuple[str, ...] = ()
+        where = "WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%'"
+        if tables is not None:
+            names = tuple(tables.get("main", ()))
+            if not names:
+                return {}
+            where += f" AND m.name IN ({', '.join('?' * len(names))})"
+        source = "sqlite_master AS m"
+        
+        async with self.acquire() as conn:
+            cursor = await conn.execute(f"""
+            SELECT m.name, p.name, p.type, p."notnull", p.dflt_value, p.pk
+            FROM {source} JOIN pragma_table_info(m.name) AS p
+            {where}
+            ORDER BY m.name, p.cid
+            """, names)
+            column_rows = await cursor.fetchall()
+            cursor = await conn.execute(f"""
+            SELECT m.name, f.id, f."table", f."from", f."to"
+            FROM {source} JOIN pragma_foreign_key_list(m.name) AS f
+            {where}
+            ORDER BY m.name, f.id, f.seq
+            """, names)
+            key_rows = await cursor.fetchall()
+            cursor = await conn.execute(f"""
+            SELECT m.name, il.name, il."unique", ii.name
+            FROM {source} JOIN pragma_index_list(m.name) AS il JOIN pragma_index_info(il.name) AS ii
+            {where}
+            ORDER BY m.name, il.name, ii.seqno
+            """, names)
+            index_rows = await cursor.fetchall()
+        
+        catalog = {}
+        primary_keys = {}
+        for table_name, column, data_type, not_null, default, pk in column_rows:
+            table = catalog.setdefault(table_name, self._new_catalog_table())
+            table["columns"].append({
+                "column_name": column,
+                "data_type": data_type,
+                "is_nullable": "YES" if not_null == 0 else "NO",
+                "column_default": default
+            })
+            if pk:
+                primary_keys.setdefault(table_name, []).append((pk, column))
+        
+        for table_name, key_columns in primary_keys.items():
+            catalog[table_name]["primary_key"] = [column for _, column in sorted(key_columns)]
+        
+        # SQLite foreign keys are unnamed; rows sharing an id form one key
+        foreign_keys = {}
+        for table_name, key_id, ref_table, column, ref_column in key_rows:
+            key = (table_name, key_id)
+            if key not in foreign_keys:
+                foreign_keys[key] = {
+                    "name": None,
+                    "columns": [],
+                    "referenced_schema": "main",
+                    "referenced_table": ref_table,
+                    "referenced_columns": []
+                }
+                catalog[table_name]["foreign_keys"].append(foreign_keys[key])
+            foreign_keys[key]["columns"].append(column)
+            foreign_keys[key]["referenced_columns"].append(ref_column)
+        
+        indexes = {}
+        for table_name, name, unique, column in index_rows:
+            key = (table_name, name)
+            if key not in indexes:
+                indexes[key] = {"name": name, "columns": [], "unique": bool(unique)}
+                catalog[table_name]["indexes"].append(indexes[key])
+            if column is not None:
+                indexes[key]["columns"].append(column)
+        
+        return {"main": catalog}
+    
+    async def execute_query(self, query: str, params: Optional[Params] = None) -> Dict[str, Any]:
+        """Execute SQLite query on a reader, or on the writer with a commit for writes."""
+        try:
+            query, args = bind_params(query, params, self.placeholder_style)
+            if classify(query).read_only:
+                async with self.acquire() as conn:
+                    if prepared_cache.is_preparable(query):
+                        await self.prepare_cached(conn, query)
+                    cursor = await conn.execute(query, args or ())
+                    rows = await cursor.fetchall()
+            else:
+                async with self._writer():
+                    if prepared_cache.is_preparable(query):
+                        await self.prepare_cached(self.connection, query)
+                    cursor = await self.connection.execute(query, args or ())
+                    rows = await cursor.fetchall()
+                    await self.connection.commit()
+                self.invalidate_statements(query)
             columns = [desc[0] for desc in cursor.description] if cursor.description else []
             return {
                 "success": True,
@@ -78,4 +333,54 @@ class SQLiteConnector(BaseConnector):
                 "row_count": len(rows)
             }
         except Exception as e:
-            return {"success": False, "error": str(e)}
\ No newline at end of file
+            return {"success": False, "error": str(e)}
+    
+    async def execute_many(self, query: str, seq_of_params: Sequence[Params]) -> Dict[str, Any]:
+        """Execute a SQLite statement for each parameter set in one transaction."""
+        async with self._writer():
+            try:
+                query, args_list = bind_many(query, seq_of_params, self.placeholder_style)
+                cursor = await self.connection.executemany(query, args_list)
+                await self.connection.commit()
+                return {"success": True, "row_count": cursor.rowcount}
+            except Exception as e:
+                await self.connection.rollback()
+                return {"success": False, "error": str(e)}
+    
+    async def execute_batch(self, statements: Sequence[Tuple[str, Sequence[Params]]]) -> Dict[str, Any]:
+        """Run SQLite statement groups with executemany in a single transaction."""
+        async with self._writer():
+            try:
+                row_count = 0
+                for query, seq_of_params in statements:
+                    query, args_list = bind_many(query, seq_of_params, self.placeholder_style)
+                    await self.connection.executemany(query, args_list)
+                    row_count += len(args_list)
+                await self.connection.commit()
+                return {"success": True, "row_count": row_count}
+            except Exception as e:
+                await self.connection.rollback()
+                return {"success": False, "error": str(e)}
+    
+    async def stream_query(
+        self,
+        query: str,
+        params: Optional[Params] = None,
+        batch_size: int = 1000,
+        first_batch_size: Optional[int] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Stream SQLite query results by iterating a reader's cursor in batches."""
+        query, args = bind_params(query, params, self.placeholder_style)
+        async with self.acquire() as conn:
+            cursor = await conn.execute(query, args or ())
+            try:
+                columns = [desc[0] for desc in cursor.description] if cursor.description else []
+                size = first_batch_size or batch_size
+                while True:
+                    rows = await cursor.fetchmany(size)
+                    if not rows:
+                        break
+                    yield {"columns": columns, "data": [list(row) for row in rows]}
+                    size = batch_size
+            finally:
+                await cursor.close()
@@ -96,3 +96,13 @@ class AppSettings(BaseModel):
     default_db_type: str = Field(default="postgresql", description="Default database type")
     connection_timeout: int = Field(default=10, ge=5, le=60, description="Connection timeout in seconds")
     auto_reconnect: bool = Field(default=True, description="Auto-reconnect on failure")
+    pool_min_size: int = Field(default=1, ge=1, le=20, description="Minimum pooled connections per database")
+    pool_max_size: int = Field(default=5, ge=1, le=50, description="Maximum pooled connections per database")
+    prepared_statement_cache_size: int = Field(default=100, ge=1, le=1000, description="Prepared statements cached per database session")
+    health_check_interval: int = Field(default=30, ge=5, le=600, description="Seconds between connection health checks")
+    reconnect_max_backoff: int = Field(default=300, ge=5, le=3600, description="Maximum seconds between reconnect attempts")
+    max_active_connections: int = Field(default=10, ge=1, le=100, description="Open connections kept before closing the least recently used")
+    idle_connection_timeout: int = Field(default=900, ge=0, le=86400, description="Seconds before an unused connection is closed (0 disables)")
+    mongo_schema_sample_size: int = Field(default=500, ge=10, le=10000, description="Documents sampled per collection to infer MongoDB fields")
+    schema_cache_max_mb: int = Field(default=64, ge=1, le=4096, description="Memory budget for cached schema metadata in MB")
+    query_cache_max_mb: int = Field(default=128, ge=1, le=4096, description="Memory budget for cached query results in MB")
@@ -147,7 +147,10 @@ async def get_pool_stats(connection_id: str):
             raise HTTPException(status_code=404, detail="Connection not active")
             
         analytics_manager = AnalyticsManager(connector.connection)
-        pool_stats = analytics_manager.get_connection_pool_stats()
+        pool_stats = analytics_manager.get_connection_pool_stats(
+            connection_id,
+            await connection_manager.get_pool_stats(connection_id) or {}
+        )
         
         return {"success": True, "pool_stats": pool_stats}
     except Exception as e:
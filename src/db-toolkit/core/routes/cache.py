@@ -3,23 +3,24 @@
 from fastapi import APIRouter
 from utils.cache import schema_cache, query_cache, prepared_cache
 from operations.background_tasks import get_scheduler_stats
+from operations.query_executor import query_flights, validation_cache
+from operations.schema_explorer import schema_loads
 
 router = APIRouter()
 
 
 @router.get("/cache/stats")
 async def get_cache_stats():
-    """Get cache statistics."""
+    """Get hit, miss, eviction and memory statistics for each cache."""
     return {
         "success": True,
-        "schema_cache": {
-            "entries": len(schema_cache.get_keys()),
-            "keys": schema_cache.get_keys()
-        },
+        "schema_cache": {**schema_cache.get_stats(), "keys": schema_cache.get_keys()},
         "query_cache": query_cache.get_stats(),
-        "prepared_cache": {
-            "connections": len(prepared_cache.statements),
-            "total_statements": sum(len(stmts) for stmts in prepared_cache.statements.values())
+        "validation_cache": validation_cache.get_stats(),
+        "prepared_cache": prepared_cache.get_stats(),
+        "single_flight": {
+            "schema_tree": schema_loads.get_stats(),
+            "query": query_flights.get_stats()
         }
     }
 
@@ -29,9 +30,10 @@ async def clear_all_caches():
     """Clear all caches."""
     schema_cache.clear()
     query_cache.clear()
+    validation_cache.clear()
     
     # Clear prepared statements
-    prepared_cache.statements.clear()
+    prepared_cache.clear()
     
     return {"success": True, "message": "All caches cleared"}
 
@@ -40,11 +42,13 @@ async def clear_all_caches():
 async def cleanup_expired_cache():
     """Clean up expired cache entries."""
     schema_expired = schema_cache.cleanup_expired()
+    query_expired = query_cache.store.cleanup_expired()
     
     return {
         "success": True,
-        "message": f"Cleaned up {schema_expired} expired schema entries",
-        "schema_expired": schema_expired
+        "message": f"Cleaned up {schema_expired} expired schema entries and {query_expired} expired query results",
+        "schema_expired": schema_expired,
+        "query_expired": query_expired
     }
 
 
@@ -62,13 +66,14 @@ async def clear_connection_cache(connection_id: str):
     query_keys_removed = query_cache.invalidate_connection(connection_id)
     
     # Clear prepared statements
-    prepared_cache.clear_connection(connection_id)
+    statements_removed = prepared_cache.clear_connection(connection_id)
     
     return {
         "success": True,
         "message": f"Cleared cache for connection {connection_id}",
         "schema_keys_removed": keys_removed,
-        "query_keys_removed": query_keys_removed
+        "query_keys_removed": query_keys_removed,
+        "statements_removed": statements_removed
     }
 
 
@@ -6,6 +6,7 @@ from fastapi import APIRouter, HTTPException
 from core.storage import ConnectionStorage
 from core.models import DatabaseConnection
 from core.schemas import ConnectionRequest
+from operations.schema_explorer import snapshot_storage
 from utils.logger import logger
 
 router = APIRouter()
@@ -48,6 +49,7 @@ async def delete_connection(connection_id: str):
     """Delete connection."""
     logger.info(f"Deleting connection '{connection_id}'")
     if await storage.remove_connection(connection_id):
+        await snapshot_storage.delete(connection_id)
         return {"success": True}
     raise HTTPException(status_code=404, detail="Connection not found")
 
@@ -104,3 +106,17 @@ async def disconnect_from_database(connection_id: str):
     return {"success": success, "message": "Disconnected" if success else "Not connected"}
 
 
+@router.get("/connections/{connection_id}/health")
+async def get_connection_health(connection_id: str, refresh: bool = False):
+    """Get liveness and latency history for an active connection."""
+    from operations.connection_manager import connection_manager
+    
+    if refresh:
+        health = await connection_manager.check_health(connection_id)
+    else:
+        health = connection_manager.get_health(connection_id)
+    
+    if health is None:
+        raise HTTPException(status_code=404, detail="Connection not active")
+    
+    return {"success": True, "connection_id": connection_id, **health}
@@ -2,6 +2,7 @@
 
 from utils.logger import logger
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
 from core.schemas import (
     ExportCSVRequest,
@@ -43,6 +44,28 @@ async def export_csv(request: ExportCSVRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/export/stream")
+async def export_csv_stream(request: ExportCSVRequest):
+    """Stream table or query results as a CSV download without buffering the result."""
+    connector = await connection_manager.get_connector(request.connection_id)
+    if not connector:
+        raise HTTPException(status_code=404, detail="Connection not found")
+
+    filename = f"{request.table or 'export'}.csv"
+    return StreamingResponse(
+        CSVHandler.stream_csv(
+            connector=connector,
+            table=request.table,
+            schema=request.schema_name,
+            query=request.query,
+            delimiter=request.delimiter,
+            include_headers=request.include_headers,
+        ),
+        media_type="text/csv",
+        headers={"Content-Disposition": f"attachment; filename={filename}"},
+    )
+
+
 @router.post("/validate", response_model=ValidateCSVResponse)
 async def validate_csv(request: ValidateCSVRequest):
     """Validate CSV data before import."""
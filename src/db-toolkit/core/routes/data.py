@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter, HTTPException
 from core.storage import ConnectionStorage
-from core.schemas import UpdateRowRequest, InsertRowRequest, DeleteRowRequest
+from core.schemas import UpdateRowRequest, InsertRowRequest, DeleteRowRequest, BatchEditRequest
 from operations.data_editor import DataEditor
 from utils.logger import logger
 
@@ -98,4 +98,33 @@ async def delete_row(connection_id: str, request: DeleteRowRequest):
         if not result["success"]:
             raise HTTPException(status_code=400, detail=result["error"])
 
-        return result
\ No newline at end of file
+        return result
+
+
+@router.post("/connections/{connection_id}/data/batch")
+async def apply_batch(connection_id: str, request: BatchEditRequest):
+    """Apply a batch of row inserts, updates and deletes in one transaction."""
+    from operations.operation_lock import operation_lock
+
+    connection = await storage.get_connection(connection_id)
+    if not connection:
+        raise HTTPException(status_code=404, detail="Connection not found")
+
+    if operation_lock.is_locked(connection_id):
+        raise HTTPException(
+            status_code=409, detail="Connection is busy with another operation"
+        )
+
+    lock = operation_lock.get_lock(connection_id)
+    async with lock:
+        result = await editor.apply_batch(
+            connection=connection,
+            table=request.table,
+            schema_name=request.schema_name,
+            operations=[operation.model_dump() for operation in request.operations],
+        )
+
+        if not result["success"]:
+            raise HTTPException(status_code=400, detail=result["error"])
+
+        return result
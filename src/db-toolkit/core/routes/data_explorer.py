@@ -1,10 +1,12 @@
 """Data explorer routes for browsing table data."""
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Response
 from pydantic import BaseModel
-from typing import Optional
+from typing import Literal, Optional
 from core.storage import ConnectionStorage
 from operations.data_explorer import DataExplorer
+from operations.row_counter import row_counter
+from utils.result_format import COLUMNAR, encode_columnar
 
 router = APIRouter()
 storage = ConnectionStorage()
@@ -20,6 +22,9 @@ class DataBrowseRequest(BaseModel):
     sort_column: Optional[str] = None
     sort_order: Optional[str] = "ASC"
     filters: Optional[dict] = None
+    pagination: Literal["offset", "keyset"] = "offset"
+    cursor: Optional[str] = None
+    format: Literal["rows", "columnar"] = "rows"
 
 
 @router.post("/connections/{connection_id}/data/browse")
@@ -31,13 +36,8 @@ async def browse_table_data(connection_id: str, request: DataBrowseRequest):
     if not connection:
         raise HTTPException(status_code=404, detail="Connection not found")
 
-    if operation_lock.is_locked(connection_id):
-        raise HTTPException(
-            status_code=409, detail="Connection is busy with another operation"
-        )
-
-    lock = operation_lock.get_lock(connection_id)
-    async with lock:
+    # Browsing is read-only and runs in parallel on the connection pool
+    async with operation_lock.acquire_lock(connection_id, read_only=True):
         result = await explorer.browse_data(
             connection=connection,
             schema_name=request.schema_name,
@@ -47,23 +47,47 @@ async def browse_table_data(connection_id: str, request: DataBrowseRequest):
             sort_column=request.sort_column,
             sort_order=request.sort_order,
             filters=request.filters,
+            pagination=request.pagination,
+            cursor=request.cursor,
         )
+        if request.format == COLUMNAR and result.get("success"):
+            return Response(content=encode_columnar(result), media_type="application/json")
         return result
 
 
 @router.get("/connections/{connection_id}/data/count")
 async def get_table_row_count(
+    connection_id: str,
+    schema_name: str = Query(...),
+    table_name: str = Query(...),
+    exact: bool = Query(False)
+):
+    """Get a table's row count; "estimated" is true until an exact count has finished.
+
+    "count" is null when the database has no estimate. With exact=true an
+    exact count starts in the background; poll this endpoint until
+    "counting" is false to pick up its result.
+    """
+    connection = await storage.get_connection(connection_id)
+    if not connection:
+        raise HTTPException(status_code=404, detail="Connection not found")
+
+    return await explorer.get_row_count(connection, schema_name, table_name, exact)
+
+
+@router.delete("/connections/{connection_id}/data/count")
+async def cancel_table_row_count(
     connection_id: str,
     schema_name: str = Query(...),
     table_name: str = Query(...)
 ):
-    """Get total row count for a table."""
+    """Cancel a table's running exact row count."""
     connection = await storage.get_connection(connection_id)
     if not connection:
         raise HTTPException(status_code=404, detail="Connection not found")
 
-    count = await explorer.get_row_count(connection, schema_name, table_name)
-    return {"success": True, "count": count}
+    cancelled = await row_counter.cancel_exact(connection_id, schema_name, table_name)
+    return {"success": True, "cancelled": cancelled}
 
 
 @router.get("/connections/{connection_id}/data/relationships")
@@ -1,11 +1,13 @@
 """Query execution routes."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from core.storage import ConnectionStorage
 from core.schemas import QueryRequest, QueryResponse
 from operations.query_executor import QueryExecutor
 from operations.query_history import QueryHistory
+from operations.query_registry import query_registry
 from utils.logger import logger
+from utils.result_format import COLUMNAR, encode_columnar
 
 router = APIRouter()
 storage = ConnectionStorage()
@@ -22,13 +24,14 @@ async def execute_query(connection_id: str, request: QueryRequest):
     if not connection:
         raise HTTPException(status_code=404, detail="Connection not found")
 
-    if operation_lock.is_locked(connection_id):
+    # Reads run in parallel on the connection pool; writes stay exclusive
+    read_only = executor.is_read_only(request.query, connection.db_type.value)
+    if not read_only and operation_lock.is_locked(connection_id):
         raise HTTPException(
             status_code=409, detail="Connection is busy with another operation"
         )
 
-    lock = operation_lock.get_lock(connection_id)
-    async with lock:
+    async with operation_lock.acquire_lock(connection_id, read_only=read_only):
         logger.info(f"Executing query on '{connection.name}': {request.query[:100]}...")
         result = await executor.execute_query(
             connection=connection,
@@ -36,6 +39,7 @@ async def execute_query(connection_id: str, request: QueryRequest):
             limit=request.limit,
             offset=request.offset,
             timeout=request.timeout,
+            query_id=request.query_id,
         )
         
         if result["success"]:
@@ -53,9 +57,30 @@ async def execute_query(connection_id: str, request: QueryRequest):
             error=result.get("error"),
         )
 
+        if request.format == COLUMNAR:
+            # Large results skip per-row validation and encode one array per column
+            return Response(content=encode_columnar(result), media_type="application/json")
         return QueryResponse(**result)
 
 
+@router.get("/connections/{connection_id}/queries")
+async def list_running_queries(connection_id: str):
+    """List queries currently running on connection."""
+    queries = query_registry.list_queries(connection_id)
+    return {"success": True, "queries": queries, "count": len(queries)}
+
+
+@router.post("/connections/{connection_id}/queries/{query_id}/cancel")
+async def cancel_query(connection_id: str, query_id: str):
+    """Cancel a running query on the database server."""
+    running = {q["query_id"] for q in query_registry.list_queries(connection_id)}
+    if query_id not in running:
+        raise HTTPException(status_code=404, detail="Query not running")
+    
+    cancelled = await query_registry.cancel(query_id)
+    return {"success": cancelled, "message": "Query cancelled" if cancelled else "Query already finished"}
+
+
 @router.get("/connections/{connection_id}/query/history")
 async def get_query_history(connection_id: str, limit: int = 50):
     """Get query history for connection."""
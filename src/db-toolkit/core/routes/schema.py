@@ -1,6 +1,6 @@
 """Schema exploration routes."""
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from core.storage import ConnectionStorage
 from operations.schema_explorer import SchemaExplorer
 
@@ -20,6 +20,45 @@ async def get_schema_tree(connection_id: str, use_cache: bool = True):
     return result
 
 
+@router.get("/connections/{connection_id}/schema/schemas")
+async def get_schema_names(connection_id: str):
+    """List a connection's schemas without their tables."""
+    connection = await storage.get_connection(connection_id)
+    if not connection:
+        raise HTTPException(status_code=404, detail="Connection not found")
+    
+    schemas = await explorer.get_schemas_cached(connection)
+    return {"success": True, "schemas": schemas}
+
+
+@router.get("/connections/{connection_id}/schema/{schema_name}/tables")
+async def get_schema_tables(
+    connection_id: str,
+    schema_name: str,
+    prefix: str = "",
+    limit: int = Query(200, ge=1, le=1000),
+    offset: int = Query(0, ge=0)
+):
+    """List one page of a schema's table names, optionally filtered by name prefix."""
+    connection = await storage.get_connection(connection_id)
+    if not connection:
+        raise HTTPException(status_code=404, detail="Connection not found")
+    
+    result = await explorer.get_tables_page(connection, schema_name, prefix, limit, offset)
+    return {"success": True, **result}
+
+
+@router.get("/connections/{connection_id}/schema/{schema_name}/tables/{table_name}/columns")
+async def get_table_columns(connection_id: str, schema_name: str, table_name: str):
+    """Get one table's columns, for expanding it in the schema tree."""
+    connection = await storage.get_connection(connection_id)
+    if not connection:
+        raise HTTPException(status_code=404, detail="Connection not found")
+    
+    columns = await explorer.get_columns_cached(connection, table_name, schema_name)
+    return {"success": True, "columns": columns}
+
+
 @router.get("/connections/{connection_id}/schema/{schema_name}/tables/{table_name}")
 async def get_table_info(connection_id: str, schema_name: str, table_name: str):
     """Get detailed table information with sample data."""
@@ -38,13 +77,14 @@ async def refresh_schema(connection_id: str):
     if not connection:
         raise HTTPException(status_code=404, detail="Connection not found")
     
-    await explorer.refresh_schema(connection_id)
+    result = await explorer.refresh_schema(connection)
     
-    # Also clear query cache for this connection
-    from utils.cache import query_cache
+    # Also clear query cache and prepared statements for this connection
+    from utils.cache import query_cache, prepared_cache
     query_cache.invalidate_connection(connection_id)
+    prepared_cache.clear_connection(connection_id)
     
-    return {"success": True, "message": "Schema and query cache refreshed"}
+    return {"success": True, "message": "Schema and query cache refreshed", **result}
 
 
 @router.get("/cache/schemas")
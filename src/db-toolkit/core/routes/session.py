@@ -1,10 +1,11 @@
 """Session management routes."""
 
+import time
 from typing import Optional
 
 from fastapi import APIRouter
 
-from core.schemas import ConnectionState, SessionSettings, SessionState
+from core.schemas import ConnectionState, SessionRestoreResult, SessionSettings, SessionState
 from operations.connection_manager import connection_manager
 from operations.session_manager import session_manager
 
@@ -14,7 +15,7 @@ router = APIRouter(prefix="/session", tags=["Session"])
 @router.get("/state", response_model=SessionState)
 async def get_session_state():
     """Get current session state with all active connections."""
-    active_ids = await connection_manager.get_all_active_connections()
+    active_ids = await connection_manager.get_registered_connections()
     connections = []
 
     for conn_id in active_ids:
@@ -46,24 +47,25 @@ async def get_connection_status(connection_id: str):
 @router.post("/save")
 async def save_session(last_active: Optional[str] = None):
     """Save current session state."""
-    active_ids = await connection_manager.get_all_active_connections()
+    active_ids = await connection_manager.get_registered_connections()
     success = await session_manager.save_session(active_ids, last_active)
 
     return {"success": success, "saved_connections": len(active_ids)}
 
 
-@router.post("/restore")
-async def restore_session():
-    """Restore previous session state."""
-    connections = await session_manager.get_restorable_connections()
-    restored = 0
+@router.post("/restore", response_model=SessionRestoreResult)
+async def restore_session(lazy: bool = False):
+    """Restore previous session state, connecting in parallel or lazily on first use."""
+    start = time.perf_counter()
+    results = await session_manager.restore_connections(lazy=lazy)
+    restored = sum(1 for result in results if result["success"])
 
-    for conn in connections:
-        success = await connection_manager.connect(conn)
-        if success:
-            restored += 1
-
-    return {"success": restored > 0, "restored_connections": restored}
+    return SessionRestoreResult(
+        success=restored > 0,
+        restored_connections=restored,
+        elapsed_ms=round((time.perf_counter() - start) * 1000, 2),
+        connections=results,
+    )
 
 
 @router.delete("/clear")
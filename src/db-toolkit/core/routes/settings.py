@@ -25,6 +25,16 @@ class SettingsUpdateRequest(BaseModel):
     default_db_type: str | None = None
     connection_timeout: int | None = None
     auto_reconnect: bool | None = None
+    pool_min_size: int | None = None
+    pool_max_size: int | None = None
+    prepared_statement_cache_size: int | None = None
+    health_check_interval: int | None = None
+    reconnect_max_backoff: int | None = None
+    max_active_connections: int | None = None
+    idle_connection_timeout: int | None = None
+    mongo_schema_sample_size: int | None = None
+    schema_cache_max_mb: int | None = None
+    query_cache_max_mb: int | None = None
 
 
 @router.get("/settings", response_model=AppSettings)
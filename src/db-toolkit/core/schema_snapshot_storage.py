@@ -0,0 +1,126 @@
+"""Persistent schema tree snapshots."""
+
+import asyncio
+import hashlib
+import json
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+from core.models import DatabaseConnection
+from utils.result_format import dumps
+
+
+def catalog_fingerprint(table_fingerprints: Dict[str, Dict[str, str]]) -> str:
+    """Combine per-table fingerprints into one value for the whole catalog."""
+    return hashlib.sha256(json.dumps(table_fingerprints, sort_keys=True).encode()).hexdigest()
+
+
+class SchemaSnapshotStorage:
+    """Stores the last schema tree of each connection in a local SQLite file.
+
+    Snapshots are tagged with the database they were read from, so a
+    connection edited to point elsewhere does not get a stale tree.
+    """
+
+    def __init__(self, storage_path: Optional[Path] = None):
+        """Initialize snapshot storage."""
+        self.storage_path = storage_path or Path.home() / ".db-toolkit" / "schema_snapshots.db"
+        self.storage_path.parent.mkdir(parents=True, exist_ok=True)
+        self._initialized = False
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the snapshot database, creating its table on first use."""
+        conn = sqlite3.connect(self.storage_path, timeout=5)
+        if not self._initialized:
+            conn.execute("""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                connection_id TEXT PRIMARY KEY,
+                target TEXT NOT NULL,
+                fingerprint TEXT,
+                table_fingerprints BLOB,
+                tree BLOB NOT NULL,
+                saved_at REAL NOT NULL
+            )
+            """)
+            self._initialized = True
+        return conn
+
+    @staticmethod
+    def _target(connection: DatabaseConnection) -> str:
+        """Identify the database a connection points at."""
+        return (
+            f"{connection.db_type.value}://{connection.username or ''}@"
+            f"{connection.host or ''}:{connection.port or ''}/{connection.database}"
+        )
+
+    def _load(self, connection: DatabaseConnection) -> Optional[Dict[str, Any]]:
+        """Read a snapshot synchronously."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT target, fingerprint, table_fingerprints, tree, saved_at FROM snapshots WHERE connection_id = ?",
+                (connection.id,)
+            ).fetchone()
+        finally:
+            conn.close()
+        if not row or row[0] != self._target(connection):
+            return None
+        return {
+            "fingerprint": row[1],
+            "table_fingerprints": json.loads(zlib.decompress(row[2])) if row[2] else None,
+            "tree": json.loads(zlib.decompress(row[3])),
+            "saved_at": row[4]
+        }
+
+    def _save(
+        self,
+        connection: DatabaseConnection,
+        tree: Dict[str, Any],
+        table_fingerprints: Optional[Dict[str, Dict[str, str]]]
+    ) -> None:
+        """Write a snapshot synchronously."""
+        fingerprint = catalog_fingerprint(table_fingerprints) if table_fingerprints is not None else None
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO snapshots VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        connection.id,
+                        self._target(connection),
+                        fingerprint,
+                        zlib.compress(dumps(table_fingerprints).encode()) if table_fingerprints is not None else None,
+                        zlib.compress(dumps(tree).encode()),
+                        time.time()
+                    )
+                )
+        finally:
+            conn.close()
+
+    def _delete(self, connection_id: str) -> bool:
+        """Delete a snapshot synchronously."""
+        conn = self._connect()
+        try:
+            with conn:
+                return conn.execute("DELETE FROM snapshots WHERE connection_id = ?", (connection_id,)).rowcount > 0
+        finally:
+            conn.close()
+
+    async def load(self, connection: DatabaseConnection) -> Optional[Dict[str, Any]]:
+        """Get a connection's snapshot as {"fingerprint", "table_fingerprints", "tree", "saved_at"}."""
+        return await asyncio.to_thread(self._load, connection)
+
+    async def save(
+        self,
+        connection: DatabaseConnection,
+        tree: Dict[str, Any],
+        table_fingerprints: Optional[Dict[str, Dict[str, str]]] = None
+    ) -> None:
+        """Save a connection's schema tree with the table fingerprints it was read at."""
+        await asyncio.to_thread(self._save, connection, tree, table_fingerprints)
+
+    async def delete(self, connection_id: str) -> bool:
+        """Delete a connection's snapshot."""
+        return await asyncio.to_thread(self._delete, connection_id)
@@ -9,9 +9,21 @@ from .csv import (
     ValidateCSVRequest,
     ValidateCSVResponse,
 )
-from .data import DeleteRowRequest, InsertRowRequest, UpdateRowRequest
+from .data import (
+    BatchEditRequest,
+    DeleteRowRequest,
+    InsertRowRequest,
+    RowOperation,
+    UpdateRowRequest,
+)
 from .query import QueryRequest, QueryResponse
-from .session import ConnectionState, SessionSettings, SessionState
+from .session import (
+    ConnectionState,
+    RestoredConnection,
+    SessionRestoreResult,
+    SessionSettings,
+    SessionState,
+)
 
 __all__ = [
     "ConnectionRequest",
@@ -20,6 +32,8 @@ __all__ = [
     "UpdateRowRequest",
     "InsertRowRequest",
     "DeleteRowRequest",
+    "RowOperation",
+    "BatchEditRequest",
     "ExportCSVRequest",
     "ExportCSVResponse",
     "ValidateCSVRequest",
@@ -27,6 +41,8 @@ __all__ = [
     "ImportCSVRequest",
     "ImportCSVResponse",
     "ConnectionState",
+    "RestoredConnection",
+    "SessionRestoreResult",
     "SessionState",
     "SessionSettings",
 ]
\ No newline at end of file
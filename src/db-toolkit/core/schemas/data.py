@@ -1,6 +1,6 @@
 """Data editing schemas."""
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -27,4 +27,21 @@ class DeleteRowRequest(BaseModel):
 
     table: str
     schema_name: Optional[str] = Field(default="public", alias="schema")
-    primary_key: Dict[str, Any]
\ No newline at end of file
+    primary_key: Dict[str, Any]
+
+
+class RowOperation(BaseModel):
+    """Single change within a batch edit."""
+
+    action: Literal["insert", "update", "delete"]
+    primary_key: Optional[Dict[str, Any]] = None
+    changes: Optional[Dict[str, Any]] = None
+    data: Optional[Dict[str, Any]] = None
+
+
+class BatchEditRequest(BaseModel):
+    """Batch edit request applied in one transaction."""
+
+    table: str
+    schema_name: Optional[str] = Field(default="public", alias="schema")
+    operations: List[RowOperation] = Field(..., min_length=1)
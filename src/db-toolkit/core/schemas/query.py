@@ -1,6 +1,6 @@
 """Query schemas."""
 
-from typing import Optional
+from typing import Literal, Optional
 from pydantic import BaseModel, Field
 
 
@@ -10,6 +10,8 @@ class QueryRequest(BaseModel):
     limit: Optional[int] = Field(1000, ge=1, le=10000, description="Maximum rows to return")
     offset: int = Field(0, ge=0, description="Number of rows to skip")
     timeout: Optional[int] = Field(30, ge=1, le=300, description="Query timeout in seconds")
+    query_id: Optional[str] = Field(None, max_length=64, description="Client-chosen id for cancelling the query while it runs")
+    format: Literal["rows", "columnar"] = Field("rows", description="Result encoding: row arrays or one array per column")
 
 
 class QueryResponse(BaseModel):
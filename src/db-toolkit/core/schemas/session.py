@@ -23,6 +23,25 @@ class SessionState(BaseModel):
     total_connections: int
 
 
+class RestoredConnection(BaseModel):
+    """Outcome of restoring one connection."""
+
+    connection_id: str
+    name: str
+    success: bool
+    lazy: bool
+    elapsed_ms: float
+
+
+class SessionRestoreResult(BaseModel):
+    """Result of restoring a saved session."""
+
+    success: bool
+    restored_connections: int
+    elapsed_ms: float
+    connections: List[RestoredConnection]
+
+
 class SessionSettings(BaseModel):
     """Session settings to persist."""
 
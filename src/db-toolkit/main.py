@@ -6,6 +6,7 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from operations.background_tasks import cleanup_old_history_task, backup_scheduler_task
+from operations.connection_manager import connection_manager
 from utils.logger import logger
 
 
@@ -16,12 +17,16 @@ async def lifespan(app: FastAPI):
     # Start background tasks
     cleanup_task = asyncio.create_task(cleanup_old_history_task())
     scheduler_task = asyncio.create_task(backup_scheduler_task())
+    health_task = asyncio.create_task(connection_manager.run_health_checks())
+    reaper_task = asyncio.create_task(connection_manager.run_idle_reaper())
     logger.info("Background tasks started")
     yield
     # Cleanup
     logger.info("Shutting down DB Toolkit API")
     cleanup_task.cancel()
     scheduler_task.cancel()
+    health_task.cancel()
+    reaper_task.cancel()
     logger.info("Background tasks stopped")
     
 # Import routes
@@ -45,6 +50,7 @@ from ws.websocket import websocket_backups
 from ws.terminal import websocket_terminal
 from ws.migrator import websocket_migrator
 from ws.analytics import websocket_analytics
+from ws.query import websocket_query
 
 app = FastAPI(
     title="DB Toolkit API",
@@ -86,6 +92,7 @@ app.websocket("/ws/backups")(websocket_backups)
 app.websocket("/ws/terminal")(websocket_terminal)
 app.websocket("/ws/migrator")(websocket_migrator)
 app.websocket("/ws/analytics")(websocket_analytics)
+app.websocket("/ws/query")(websocket_query)
 
 if __name__ == "__main__":
     import socket
@@ -1,5 +1,6 @@
 """Table-level statistics."""
 
+from connectors.sqlite import estimate_table_rows
 from utils.logger import logger
 from typing import Dict, List, Any
 
@@ -96,10 +97,8 @@ async def get_table_stats_sqlite(connection) -> List[Dict[str, Any]]:
                 table_name = row[0]
                 index_count = row[1]
                 
-                count_query = f"SELECT COUNT(*) FROM {table_name}"
-                count_result = await connection.execute(count_query)
-                count_row = await count_result.fetchone()
-                row_count = count_row[0] if count_row else 0
+                # Statistics-based estimate; COUNT(*) scans every table
+                row_count = await estimate_table_rows(connection, table_name)
                 
                 stats.append({
                     'table_name': table_name,
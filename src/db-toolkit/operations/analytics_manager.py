@@ -182,27 +182,20 @@ class AnalyticsManager:
                 "error": str(e)
             }
 
-    def get_connection_pool_stats(self) -> Dict[str, Any]:
+    def get_connection_pool_stats(self, connection_id: str, pool: Dict[str, Any]) -> Dict[str, Any]:
         """Get connection pool statistics."""
-        # Basic pool stats from historical metrics
-        all_connections = []
-        for key, metrics in historical_metrics.items():
-            if metrics:
-                all_connections.extend([m.get('connections', 0) for m in metrics])
-        
-        if not all_connections:
-            return {
-                "avg_connections": 0,
-                "max_connections": 0,
-                "min_connections": 0,
-                "current_connections": 0
-            }
+        # Server-side trend for this connection from historical metrics
+        history = [
+            m.get('connections', 0)
+            for m in historical_metrics.get(f"conn_{connection_id}", [])
+        ]
         
         return {
-            "avg_connections": sum(all_connections) / len(all_connections),
-            "max_connections": max(all_connections),
-            "min_connections": min(all_connections),
-            "current_connections": all_connections[-1] if all_connections else 0
+            "avg_connections": sum(history) / len(history) if history else 0,
+            "max_connections": max(history) if history else 0,
+            "min_connections": min(history) if history else 0,
+            "current_connections": history[-1] if history else pool.get('size', 0),
+            "pool": pool
         }
     
     async def get_query_plan(self, query: str, config: DatabaseConnection) -> Dict[str, Any]:
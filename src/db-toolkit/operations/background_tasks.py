@@ -6,7 +6,7 @@ from datetime import datetime
 from typing import Dict, Any
 from operations.query_history import QueryHistory
 from core.settings_storage import SettingsStorage
-from utils.cache import schema_cache
+from utils.cache import query_cache, schema_cache
 from utils.logger import logger
 
 
@@ -75,7 +75,7 @@ async def cleanup_old_history_task():
             removed_history = history.cleanup_old_history(retention_days)
             
             # Cleanup expired cache entries
-            removed_schema = schema_cache.cleanup_expired()
+            removed_schema = schema_cache.cleanup_expired() + query_cache.store.cleanup_expired()
             
             # Record task execution
             duration = time.time() - start_time
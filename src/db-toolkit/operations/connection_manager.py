@@ -1,35 +1,107 @@
 """Connection management operations."""
 
 import asyncio
-from typing import Dict, List, Optional
+import random
+import time
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional
 
 from connectors.base import BaseConnector
 from connectors.factory import ConnectorFactory
 from core.models import DatabaseConnection
 from core.settings_storage import SettingsStorage
 from operations.operation_lock import operation_lock
+from utils.cache import prepared_cache, query_cache, schema_cache
 from utils.logger import logger
 
 
+class ConnectionHealth:
+    """Liveness state and latency history for one connection."""
+
+    def __init__(self, history_size: int = 60):
+        """Initialize health state."""
+        self.healthy = True
+        self.consecutive_successes = 0
+        self.consecutive_failures = 0
+        self.last_error: Optional[str] = None
+        self.last_checked: Optional[float] = None
+        self.next_check = 0.0
+        self.history: deque = deque(maxlen=history_size)
+        self.reconnect_lock = asyncio.Lock()
+
+    def record(self, ok: bool, latency: Optional[float], error: Optional[str] = None) -> None:
+        """Record the outcome of a ping or reconnect attempt."""
+        self.last_checked = time.time()
+        self.healthy = ok
+        self.last_error = error
+        if ok:
+            self.consecutive_successes += 1
+            self.consecutive_failures = 0
+        else:
+            self.consecutive_successes = 0
+            self.consecutive_failures += 1
+        self.history.append({
+            "timestamp": self.last_checked,
+            "ok": ok,
+            "latency_ms": round(latency * 1000, 2) if latency is not None else None
+        })
+
+    def schedule(self, base_interval: int, max_backoff: int) -> None:
+        """Schedule the next check; stable links back off, failing ones retry with jitter."""
+        if self.healthy:
+            # Check stable connections less often, up to 4x the base interval
+            delay = base_interval * min(4, 1 + self.consecutive_successes // 10)
+        else:
+            # Exponential backoff with full jitter so connections don't retry in lockstep
+            delay = random.uniform(1, min(max_backoff, 2 ** self.consecutive_failures))
+        self.next_check = time.time() + delay
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get health status with latency statistics."""
+        latencies = [entry["latency_ms"] for entry in self.history if entry["latency_ms"] is not None]
+        return {
+            "healthy": self.healthy,
+            "consecutive_failures": self.consecutive_failures,
+            "last_error": self.last_error,
+            "last_checked": self.last_checked,
+            "next_check": self.next_check,
+            "latency_ms": {
+                "last": latencies[-1] if latencies else None,
+                "avg": round(sum(latencies) / len(latencies), 2) if latencies else None,
+                "max": max(latencies) if latencies else None
+            },
+            "history": list(self.history)
+        }
+
+
 class ConnectionManager:
     """Manages active database connections."""
 
     def __init__(self):
         """Initialize connection manager."""
-        self._active_connections: Dict[str, BaseConnector] = {}
+        # Ordered from least to most recently used
+        self._active_connections: "OrderedDict[str, BaseConnector]" = OrderedDict()
+        self._last_used: Dict[str, float] = {}
+        # Metadata outlives evicted connectors so they can reconnect lazily
         self._connection_metadata: Dict[str, DatabaseConnection] = {}
+        self._health: Dict[str, ConnectionHealth] = {}
         self._settings_storage = SettingsStorage()
 
     async def connect(self, connection: DatabaseConnection, timeout: Optional[int] = None) -> bool:
         """Establish database connection with timeout."""
         logger.info(f"Connecting to '{connection.name}' ({connection.db_type.value})")
         try:
+            settings = await self._settings_storage.get_settings()
             # Get timeout from settings if not provided
             if timeout is None:
-                settings = await self._settings_storage.get_settings()
                 timeout = settings.connection_timeout
             
             connector = ConnectorFactory.create_connector(connection.db_type)
+            connector.connection_id = connection.id
+            connector.apply_settings(settings)
+            prepared_cache.max_per_connection = settings.prepared_statement_cache_size
+            schema_cache.resize(max_bytes=settings.schema_cache_max_mb * 1024 * 1024)
+            query_cache.store.resize(max_bytes=settings.query_cache_max_mb * 1024 * 1024)
             
             # Connect with timeout
             success = await asyncio.wait_for(
@@ -38,9 +110,21 @@ class ConnectionManager:
             )
 
             if success:
+                previous = self._active_connections.get(connection.id)
+                if previous is not None and previous is not connector:
+                    await previous.disconnect()
+                # Statements prepared on a previous session are gone with it
+                prepared_cache.clear_connection(connection.id)
                 self._active_connections[connection.id] = connector
                 self._connection_metadata[connection.id] = connection
+                self._touch(connection.id)
+                if connection.id not in self._health:
+                    self._health[connection.id] = ConnectionHealth()
+                    self._health[connection.id].schedule(
+                        settings.health_check_interval, settings.reconnect_max_backoff
+                    )
                 logger.info(f"Successfully connected to '{connection.name}'")
+                await self._enforce_capacity(settings.max_active_connections, keep=connection.id)
                 return True
             logger.error(f"Failed to connect to '{connection.name}'")
             return False
@@ -52,6 +136,10 @@ class ConnectionManager:
             logger.error(f"Connection error for '{connection.name}': {str(e)}")
             return False
 
+    def register(self, connection: DatabaseConnection) -> None:
+        """Register a connection without connecting; it opens on first get_connector."""
+        self._connection_metadata[connection.id] = connection
+
     async def disconnect(self, connection_id: str) -> bool:
         """Disconnect from database."""
         logger.info(f"Disconnecting from connection '{connection_id}'")
@@ -60,67 +148,258 @@ class ConnectionManager:
             success = await connector.disconnect()
             if success:
                 del self._active_connections[connection_id]
-                if connection_id in self._connection_metadata:
-                    del self._connection_metadata[connection_id]
-                operation_lock.cleanup(connection_id)
-                
-                # Clear caches for this connection
-                from utils.cache import schema_cache, query_cache, prepared_cache
-                
-                # Clear schema cache
-                keys_to_remove = []
-                for key in schema_cache.get_keys():
-                    if key.startswith(f"{connection_id}_"):
-                        keys_to_remove.append(key)
-                for key in keys_to_remove:
-                    schema_cache.delete(key)
-                
-                # Clear query cache
-                query_cache.invalidate_connection(connection_id)
-                
-                # Clear prepared statements
-                prepared_cache.clear_connection(connection_id)
-                
+                self._forget(connection_id)
             return success
+        if connection_id in self._connection_metadata:
+            # Closed by the connection limit or idle reaper; only the registration is left
+            self._forget(connection_id)
+            return True
         return False
 
+    def _forget(self, connection_id: str) -> None:
+        """Drop registration, locks and caches for an explicitly closed connection."""
+        self._connection_metadata.pop(connection_id, None)
+        self._health.pop(connection_id, None)
+        self._last_used.pop(connection_id, None)
+        operation_lock.cleanup(connection_id)
+        
+        # Clear schema cache
+        keys_to_remove = []
+        for key in schema_cache.get_keys():
+            if key.startswith(f"{connection_id}_"):
+                keys_to_remove.append(key)
+        for key in keys_to_remove:
+            schema_cache.delete(key)
+        
+        # Clear query cache
+        query_cache.invalidate_connection(connection_id)
+        
+        # Clear prepared statements
+        prepared_cache.clear_connection(connection_id)
+
+    def _touch(self, connection_id: str) -> None:
+        """Mark a connector as most recently used."""
+        self._active_connections.move_to_end(connection_id)
+        self._last_used[connection_id] = time.time()
+
+    def _is_busy(self, connection_id: str) -> bool:
+        """Check whether a connector has a write lock or checked-out connections."""
+        connector = self._active_connections.get(connection_id)
+        return operation_lock.is_locked(connection_id) or (
+            connector is not None and connector.active_operations > 0
+        )
+
+    async def _suspend(self, connection_id: str, reason: str) -> None:
+        """Close a connector but keep its registration for lazy reconnect."""
+        connector = self._active_connections.pop(connection_id, None)
+        if connector is None:
+            return
+        logger.info(f"Closing connection '{connection_id}' ({reason}); it will reconnect on next use")
+        prepared_cache.clear_connection(connection_id)
+        await connector.disconnect()
+
+    async def _enforce_capacity(self, max_active: int, keep: Optional[str] = None) -> int:
+        """Close least recently used connectors beyond max_active, skipping busy ones."""
+        evicted = 0
+        for connection_id in list(self._active_connections):
+            if len(self._active_connections) <= max_active:
+                break
+            if connection_id == keep or self._is_busy(connection_id):
+                continue
+            await self._suspend(connection_id, "connection limit reached")
+            evicted += 1
+        return evicted
+
+    async def reap_idle_connections(self) -> int:
+        """Close connectors unused for longer than the idle timeout."""
+        settings = await self._settings_storage.get_settings()
+        if not settings.idle_connection_timeout:
+            return 0
+        
+        cutoff = time.time() - settings.idle_connection_timeout
+        idle = [
+            connection_id for connection_id in self._active_connections
+            if self._last_used.get(connection_id, 0) < cutoff and not self._is_busy(connection_id)
+        ]
+        for connection_id in idle:
+            await self._suspend(connection_id, "idle timeout")
+        return len(idle)
+
+    async def run_idle_reaper(self):
+        """Background loop closing idle connectors."""
+        while True:
+            try:
+                await asyncio.sleep(60)
+                await self.reap_idle_connections()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in idle connection reaper: {e}")
+
     async def get_connector(self, connection_id: str, auto_reconnect: bool = True) -> Optional[BaseConnector]:
         """Get active connector by connection ID with auto-reconnect."""
         connector = self._active_connections.get(connection_id)
         
+        if connector is None:
+            # Reopen connectors closed by the LRU limit or idle reaper
+            if connection_id in self._connection_metadata:
+                return await self._resume(connection_id)
+            return None
+        
+        self._touch(connection_id)
+        
         # Check if auto-reconnect is enabled and connection is lost
-        if connector and not connector.is_connected and auto_reconnect:
+        if not connector.is_connected and auto_reconnect:
             settings = await self._settings_storage.get_settings()
-            if settings.auto_reconnect:
-                connection = self._connection_metadata.get(connection_id)
-                if connection:
-                    # Try to reconnect
-                    success = await self.connect(connection)
-                    if success:
-                        return self._active_connections.get(connection_id)
+            if settings.auto_reconnect and await self._reconnect(connection_id):
+                return self._active_connections.get(connection_id)
         
         return connector
 
+    async def _resume(self, connection_id: str) -> Optional[BaseConnector]:
+        """Reconnect a suspended connection, sharing one attempt between concurrent callers."""
+        health = self._health.setdefault(connection_id, ConnectionHealth())
+        async with health.reconnect_lock:
+            if connection_id not in self._active_connections:
+                connection = self._connection_metadata.get(connection_id)
+                if not connection or not await self.connect(connection):
+                    return None
+            return self._active_connections.get(connection_id)
+
+    async def _reconnect(self, connection_id: str, force: bool = False) -> bool:
+        """Replace a lost connector, sharing one attempt between concurrent callers.
+        
+        Unless force is set, attempts made during the backoff window after a
+        failed reconnect are skipped so request bursts don't hammer the server.
+        """
+        connection = self._connection_metadata.get(connection_id)
+        health = self._health.get(connection_id)
+        if not connection or not health:
+            return False
+        
+        async with health.reconnect_lock:
+            connector = self._active_connections.get(connection_id)
+            if connector and connector.is_connected:
+                # Another caller reconnected while we waited
+                return True
+            if not force and health.consecutive_failures and time.time() < health.next_check:
+                # Still backing off after a failed attempt
+                return False
+            
+            if connector:
+                await connector.disconnect()
+            start = time.perf_counter()
+            success = await self.connect(connection)
+            health.record(success, time.perf_counter() - start if success else None,
+                          None if success else "Reconnect failed")
+            settings = await self._settings_storage.get_settings()
+            health.schedule(settings.health_check_interval, settings.reconnect_max_backoff)
+            return success
+
+    @staticmethod
+    def _pool_saturated(connector: BaseConnector) -> bool:
+        """Check whether every connection of a pooled connector is in use."""
+        pool = connector.get_pool_stats()
+        return pool["pooled"] and connector.active_operations >= pool["max_size"]
+
+    async def check_health(self, connection_id: str) -> Optional[Dict[str, Any]]:
+        """Ping a connection now, reconnecting if it is down and auto-reconnect is on."""
+        connector = self._active_connections.get(connection_id)
+        health = self._health.get(connection_id)
+        if not connector or not health:
+            return None
+        
+        settings = await self._settings_storage.get_settings()
+        if connector.is_connected and self._pool_saturated(connector):
+            # Every pooled connection is running a query; a ping would only time the queue
+            health.schedule(settings.health_check_interval, settings.reconnect_max_backoff)
+            return health.to_dict()
+        
+        if connector.is_connected:
+            start = time.perf_counter()
+            ping = asyncio.ensure_future(connector.ping(timeout=settings.connection_timeout))
+            # Extra time to get a pool slot; running out of it is not a failed ping
+            done, _ = await asyncio.wait({ping}, timeout=settings.connection_timeout * 2)
+            if not done:
+                ping.cancel()
+                await asyncio.gather(ping, return_exceptions=True)
+                logger.info(f"Health check for connection '{connection_id}' skipped: no free pooled connection")
+                health.schedule(settings.health_check_interval, settings.reconnect_max_backoff)
+                return health.to_dict()
+            failure = ping.exception()
+            if failure is None:
+                health.record(True, time.perf_counter() - start)
+            else:
+                error = str(failure) or type(failure).__name__
+                logger.warning(f"Health check failed for connection '{connection_id}': {error}")
+                connector.is_connected = False
+                health.record(False, None, error)
+        
+        if not connector.is_connected and settings.auto_reconnect:
+            await self._reconnect(connection_id, force=True)
+        else:
+            health.schedule(settings.health_check_interval, settings.reconnect_max_backoff)
+        return health.to_dict()
+
+    async def run_health_checks(self):
+        """Background loop pinging each active connection when its check is due."""
+        while True:
+            try:
+                now = time.time()
+                due = [
+                    connection_id for connection_id, health in self._health.items()
+                    if connection_id in self._active_connections and health.next_check <= now
+                ]
+                if due:
+                    await asyncio.gather(*(self.check_health(connection_id) for connection_id in due))
+                
+                next_checks = [health.next_check for health in self._health.values()]
+                delay = min(next_checks) - time.time() if next_checks else 5
+                await asyncio.sleep(min(max(delay, 1), 5))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in connection health loop: {e}")
+                await asyncio.sleep(5)
+
+    def get_health(self, connection_id: str) -> Optional[Dict[str, Any]]:
+        """Get health status and latency history for a connection."""
+        health = self._health.get(connection_id)
+        return health.to_dict() if health else None
+
     async def get_connection(self, connection_id: str) -> Optional[DatabaseConnection]:
         """Get connection metadata by ID."""
         return self._connection_metadata.get(connection_id)
 
     async def is_connected(self, connection_id: str) -> bool:
-        """Check if connection is active."""
+        """Check if connection is active or suspended for lazy reconnect."""
         connector = self._active_connections.get(connection_id)
-        return connector is not None and connector.is_connected
+        if connector is None:
+            return connection_id in self._connection_metadata
+        return connector.is_connected
 
     async def get_all_active_connections(self) -> List[str]:
         """Get list of all active connection IDs."""
         return list(self._active_connections.keys())
 
+    async def get_registered_connections(self) -> List[str]:
+        """Get IDs of open connections, including ones suspended for lazy reconnect."""
+        return list(self._connection_metadata.keys())
+
     async def get_connection_count(self) -> int:
         """Get count of active connections."""
         return len(self._active_connections)
 
+    async def get_pool_stats(self, connection_id: str) -> Optional[Dict]:
+        """Get connection pool statistics for an active connection."""
+        connector = self._active_connections.get(connection_id)
+        if not connector:
+            return None
+        return connector.get_pool_stats()
+
     async def disconnect_all(self):
         """Disconnect all active connections."""
-        for connection_id in list(self._active_connections.keys()):
+        for connection_id in list(self._connection_metadata.keys()):
             await self.disconnect(connection_id)
 
     async def get_connection_status(self, connection_id: str) -> Dict:
@@ -129,11 +408,12 @@ class ConnectionManager:
         connector = self._active_connections.get(connection_id)
         metadata = self._connection_metadata.get(connection_id)
 
-        if not connector or not metadata:
+        if not metadata:
             return {"connected": False, "locked": False}
 
         return {
-            "connected": connector.is_connected,
+            "connected": await self.is_connected(connection_id),
+            "suspended": connector is None,
             "locked": operation_lock.is_locked(connection_id),
             "db_type": metadata.db_type.value,
             "name": metadata.name,
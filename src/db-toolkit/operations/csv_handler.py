@@ -2,15 +2,56 @@
 
 import csv
 import io
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from connectors.base import BaseConnector
 from core.models import DatabaseType
+from utils.cache import query_cache
 from utils.logger import logger
 
 class CSVHandler:
     """Handle CSV import and export operations."""
 
+    @staticmethod
+    def _build_export_query(
+        connector: BaseConnector,
+        table: str,
+        schema: Optional[str] = None,
+        query: Optional[str] = None,
+    ) -> str:
+        """Build the query used to export a table."""
+        if query:
+            return query
+        if connector.db_type == DatabaseType.MONGODB:
+            return f"db.{table}.find()"
+        full_table = f"{schema}.{table}" if schema else table
+        return f"SELECT * FROM {full_table}"
+
+    @staticmethod
+    async def stream_csv(
+        connector: BaseConnector,
+        table: str,
+        schema: Optional[str] = None,
+        query: Optional[str] = None,
+        delimiter: str = ",",
+        include_headers: bool = True,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[str]:
+        """Stream table or query results as CSV chunks, one chunk per batch."""
+        export_query = CSVHandler._build_export_query(connector, table, schema, query)
+        headers_written = False
+
+        async for batch in connector.stream_query(export_query, batch_size=batch_size):
+            output = io.StringIO()
+            writer = csv.writer(output, delimiter=delimiter)
+
+            if include_headers and not headers_written:
+                writer.writerow(batch["columns"])
+                headers_written = True
+
+            writer.writerows(batch["data"])
+            yield output.getvalue()
+
     @staticmethod
     async def export_to_csv(
         connector: BaseConnector,
@@ -21,36 +62,13 @@ class CSVHandler:
         include_headers: bool = True,
     ) -> str:
         """Export table or query results to CSV string."""
-        if query:
-            result = await connector.execute_query(query)
-        else:
-            full_table = f"{schema}.{table}" if schema else table
-            if connector.db_type == DatabaseType.MONGODB:
-                result = await connector.execute_query(f"db.{table}.find()")
-            else:
-                result = await connector.execute_query(f"SELECT * FROM {full_table}")
-
-        # Handle both dict and direct result formats
-        if isinstance(result, dict):
-            rows = result.get("rows") or result.get("data", [])
-            columns = result.get("columns", [])
-        else:
-            rows = []
-            columns = []
-
-        if not rows or not columns:
-            return ""
-
-        output = io.StringIO()
-        writer = csv.writer(output, delimiter=delimiter)
-        
-        if include_headers:
-            writer.writerow(columns)
-
-        for row in rows:
-            writer.writerow(row)
-
-        return output.getvalue()
+        chunks = []
+        async for chunk in CSVHandler.stream_csv(
+            connector, table, schema, query, delimiter, include_headers
+        ):
+            chunks.append(chunk)
+
+        return "".join(chunks)
 
     @staticmethod
     def validate_csv_data(
@@ -111,24 +129,33 @@ class CSVHandler:
                     await connector._db[table].insert_many(batch)
                     imported += len(batch)
                 else:
-                    for row in batch:
-                        columns = ", ".join(row.keys())
-                        placeholders = ", ".join([f":{k}" for k in row.keys()])
-                        query = f"INSERT INTO {full_table} ({columns}) VALUES ({placeholders})"
-
-                        try:
-                            await connector.execute_query(query, row)
-                            imported += 1
-                        except Exception as e:
-                            logger.error(f"CSV import row {i + batch.index(row) + 1} failed: {str(e)}")
-                            failed += 1
-                            errors.append(f"Row {i + batch.index(row) + 1}: {str(e)}")
+                    columns = ", ".join(batch[0].keys())
+                    placeholders = ", ".join(["?"] * len(batch[0]))
+                    query = f"INSERT INTO {full_table} ({columns}) VALUES ({placeholders})"
+                    values = [list(row.values()) for row in batch]
+
+                    result = await connector.execute_many(query, values)
+                    if result.get("success"):
+                        imported += len(batch)
+                    else:
+                        # Retry row by row so one bad row doesn't fail the whole batch
+                        for offset, row in enumerate(values, start=1):
+                            row_result = await connector.execute_query(query, row)
+                            if row_result.get("success"):
+                                imported += 1
+                            else:
+                                logger.error(f"CSV import row {i + offset} failed: {row_result.get('error')}")
+                                failed += 1
+                                errors.append(f"Row {i + offset}: {row_result.get('error')}")
 
             except Exception as e:
                 logger.error(f"CSV import batch {i // batch_size + 1} failed: {str(e)}")
                 failed += len(batch)
                 errors.append(f"Batch {i // batch_size + 1}: {str(e)}")
 
+        # Failed batches may still have written some rows
+        query_cache.invalidate_tables(connector.connection_id, [table])
+
         return {
             "success": imported > 0,
             "imported": imported,
@@ -1,8 +1,10 @@
 """Production-ready data editing operations."""
 
-from typing import Dict, Any
-from connectors.factory import ConnectorFactory
-from core.models import DatabaseConnection
+from typing import Dict, Any, List, Tuple
+from pymongo import DeleteOne, InsertOne, UpdateOne
+from core.models import DatabaseConnection, DatabaseType
+from operations.connection_manager import connection_manager
+from utils.cache import query_cache
 from utils.logger import logger
 
 
@@ -25,8 +27,7 @@ class DataEditor:
             return {"success": False, "error": "No changes provided"}
         
         try:
-            connector = ConnectorFactory.create_connector(connection.db_type)
-            await connector.connect(connection)
+            connector = await self._get_connector(connection)
             
             # Build UPDATE query
             if connection.db_type.value == "mongodb":
@@ -34,7 +35,8 @@ class DataEditor:
             else:
                 result = await self._update_sql(connector, table, schema_name, primary_key, changes)
             
-            await connector.disconnect()
+            if result.get("success"):
+                query_cache.invalidate_tables(connection.id, [table])
             return result
             
         except Exception as e:
@@ -53,15 +55,15 @@ class DataEditor:
             return {"success": False, "error": "No data provided"}
         
         try:
-            connector = ConnectorFactory.create_connector(connection.db_type)
-            await connector.connect(connection)
+            connector = await self._get_connector(connection)
             
             if connection.db_type.value == "mongodb":
                 result = await self._insert_mongodb(connector, table, data)
             else:
                 result = await self._insert_sql(connector, table, schema_name, data)
             
-            await connector.disconnect()
+            if result.get("success"):
+                query_cache.invalidate_tables(connection.id, [table])
             return result
             
         except Exception as e:
@@ -80,21 +82,158 @@ class DataEditor:
             return {"success": False, "error": "Primary key required for delete"}
         
         try:
-            connector = ConnectorFactory.create_connector(connection.db_type)
-            await connector.connect(connection)
+            connector = await self._get_connector(connection)
             
             if connection.db_type.value == "mongodb":
                 result = await self._delete_mongodb(connector, table, primary_key)
             else:
                 result = await self._delete_sql(connector, table, schema_name, primary_key)
             
-            await connector.disconnect()
+            if result.get("success"):
+                query_cache.invalidate_tables(connection.id, [table])
             return result
             
         except Exception as e:
             logger.error(f"Delete row failed on '{connection.name}.{table}': {str(e)}")
             return {"success": False, "error": str(e)}
     
+    async def apply_batch(
+        self,
+        connection: DatabaseConnection,
+        table: str,
+        schema_name: str,
+        operations: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Apply inserts, updates and deletes to one table as a single batch.
+        
+        Consecutive operations that produce the same statement are sent
+        together with executemany, and SQL databases apply the whole batch
+        in one transaction.
+        """
+        if not operations:
+            return {"success": False, "error": "No operations provided"}
+        
+        try:
+            connector = await self._get_connector(connection)
+            
+            if connection.db_type.value == "mongodb":
+                return await self._apply_batch_mongodb(connector, table, operations)
+            
+            statements: List[Tuple[str, List[Dict[str, Any]]]] = []
+            for operation in operations:
+                query, params = self._build_statement(connector, table, schema_name, operation)
+                if statements and statements[-1][0] == query:
+                    statements[-1][1].append(params)
+                else:
+                    statements.append((query, [params]))
+            
+            result = await connector.execute_batch(statements)
+            if result.get("success"):
+                query_cache.invalidate_tables(connection.id, [table])
+                return {
+                    "success": True,
+                    "message": f"Applied {len(operations)} changes",
+                    "applied": len(operations),
+                    "statements": len(statements)
+                }
+            return {"success": False, "error": result.get("error", "Batch failed")}
+        
+        except Exception as e:
+            logger.error(f"Batch edit failed on '{connection.name}.{table}': {str(e)}")
+            return {"success": False, "error": str(e)}
+    
+    async def _get_connector(self, connection: DatabaseConnection):
+        """Get the managed connector for a connection, connecting if needed."""
+        connector = await connection_manager.get_connector(connection.id)
+        if not connector:
+            success = await connection_manager.connect(connection)
+            if not success:
+                raise Exception("Failed to establish database connection")
+            connector = await connection_manager.get_connector(connection.id)
+            if not connector:
+                raise Exception("Connection manager failed to provide connector")
+        return connector
+    
+    def _table_ref(self, connector, table: str, schema: str) -> str:
+        """Build a quoted, schema-qualified table reference."""
+        # SQLite doesn't use schemas
+        if schema and schema not in ("main", "public") and connector.db_type != DatabaseType.SQLITE:
+            return f"{connector.quote_identifier(schema)}.{connector.quote_identifier(table)}"
+        return connector.quote_identifier(table)
+    
+    def _build_statement(
+        self,
+        connector,
+        table: str,
+        schema: str,
+        operation: Dict[str, Any]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build the parameterized statement for one batch operation."""
+        action = operation.get("action")
+        primary_key = operation.get("primary_key") or {}
+        
+        if action == "insert":
+            if not operation.get("data"):
+                raise ValueError("No data provided for insert")
+            return self._insert_statement(connector, table, schema, operation["data"])
+        if action == "update":
+            if not primary_key or not operation.get("changes"):
+                raise ValueError("Primary key and changes required for update")
+            return self._update_statement(connector, table, schema, primary_key, operation["changes"])
+        if action == "delete":
+            if not primary_key:
+                raise ValueError("Primary key required for delete")
+            return self._delete_statement(connector, table, schema, primary_key)
+        raise ValueError(f"Unknown action: {action}")
+    
+    def _update_statement(
+        self,
+        connector,
+        table: str,
+        schema: str,
+        primary_key: Dict[str, Any],
+        changes: Dict[str, Any]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build a parameterized UPDATE statement."""
+        quote = connector.quote_identifier
+        set_clause = ", ".join([f"{quote(col)} = :set_{i}" for i, col in enumerate(changes)])
+        where_clause = " AND ".join([f"{quote(col)} = :pk_{i}" for i, col in enumerate(primary_key)])
+        params = {f"set_{i}": val for i, val in enumerate(changes.values())}
+        params.update({f"pk_{i}": val for i, val in enumerate(primary_key.values())})
+        
+        query = f"UPDATE {self._table_ref(connector, table, schema)} SET {set_clause} WHERE {where_clause}"
+        return query, params
+    
+    def _insert_statement(
+        self,
+        connector,
+        table: str,
+        schema: str,
+        data: Dict[str, Any]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build a parameterized INSERT statement."""
+        columns = ", ".join([connector.quote_identifier(col) for col in data.keys()])
+        values = ", ".join([f":val_{i}" for i in range(len(data))])
+        params = {f"val_{i}": val for i, val in enumerate(data.values())}
+        
+        query = f"INSERT INTO {self._table_ref(connector, table, schema)} ({columns}) VALUES ({values})"
+        return query, params
+    
+    def _delete_statement(
+        self,
+        connector,
+        table: str,
+        schema: str,
+        primary_key: Dict[str, Any]
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Build a parameterized DELETE statement."""
+        quote = connector.quote_identifier
+        where_clause = " AND ".join([f"{quote(col)} = :pk_{i}" for i, col in enumerate(primary_key)])
+        params = {f"pk_{i}": val for i, val in enumerate(primary_key.values())}
+        
+        query = f"DELETE FROM {self._table_ref(connector, table, schema)} WHERE {where_clause}"
+        return query, params
+    
     async def _update_sql(
         self,
         connector,
@@ -104,16 +243,8 @@ class DataEditor:
         changes: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Update SQL row."""
-        set_clause = ", ".join([f'"{col}" = \'{val}\'' for col, val in changes.items()])
-        where_clause = " AND ".join([f'"{col}" = \'{val}\'' for col, val in primary_key.items()])
-        
-        # SQLite doesn't use schemas
-        if schema and schema not in ("main", "public") and connector.__class__.__name__ != "SQLiteConnector":
-            query = f'UPDATE {schema}."{table}" SET {set_clause} WHERE {where_clause}'
-        else:
-            query = f'UPDATE "{table}" SET {set_clause} WHERE {where_clause}'
-        
-        result = await connector.execute_query(query)
+        query, params = self._update_statement(connector, table, schema, primary_key, changes)
+        result = await connector.execute_query(query, params)
         
         if result.get("success"):
             return {"success": True, "message": "Row updated successfully"}
@@ -128,16 +259,8 @@ class DataEditor:
         data: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Insert SQL row."""
-        columns = ", ".join([f'"{col}"' for col in data.keys()])
-        values = ", ".join([f"'{val}'" for val in data.values()])
-        
-        # SQLite doesn't use schemas
-        if schema and schema not in ("main", "public") and connector.__class__.__name__ != "SQLiteConnector":
-            query = f'INSERT INTO {schema}."{table}" ({columns}) VALUES ({values})'
-        else:
-            query = f'INSERT INTO "{table}" ({columns}) VALUES ({values})'
-        
-        result = await connector.execute_query(query)
+        query, params = self._insert_statement(connector, table, schema, data)
+        result = await connector.execute_query(query, params)
         
         if result.get("success"):
             return {"success": True, "message": "Row inserted successfully"}
@@ -152,15 +275,8 @@ class DataEditor:
         primary_key: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Delete SQL row."""
-        where_clause = " AND ".join([f'"{col}" = \'{val}\'' for col, val in primary_key.items()])
-        
-        # SQLite doesn't use schemas
-        if schema and schema not in ("main", "public") and connector.__class__.__name__ != "SQLiteConnector":
-            query = f'DELETE FROM {schema}."{table}" WHERE {where_clause}'
-        else:
-            query = f'DELETE FROM "{table}" WHERE {where_clause}'
-        
-        result = await connector.execute_query(query)
+        query, params = self._delete_statement(connector, table, schema, primary_key)
+        result = await connector.execute_query(query, params)
         
         if result.get("success"):
             return {"success": True, "message": "Row deleted successfully"}
@@ -176,8 +292,7 @@ class DataEditor:
     ) -> Dict[str, Any]:
         """Update MongoDB document."""
         try:
-            db = connector.connection.get_default_database()
-            coll = db[collection]
+            coll = connector.connection[connector.database_name][collection]
             result = await coll.update_one(filter_doc, {"$set": changes})
             
             if result.modified_count > 0:
@@ -195,8 +310,7 @@ class DataEditor:
     ) -> Dict[str, Any]:
         """Insert MongoDB document."""
         try:
-            db = connector.connection.get_default_database()
-            coll = db[collection]
+            coll = connector.connection[connector.database_name][collection]
             result = await coll.insert_one(data)
             
             return {"success": True, "message": "Document inserted successfully", "id": str(result.inserted_id)}
@@ -211,8 +325,7 @@ class DataEditor:
     ) -> Dict[str, Any]:
         """Delete MongoDB document."""
         try:
-            db = connector.connection.get_default_database()
-            coll = db[collection]
+            coll = connector.connection[connector.database_name][collection]
             result = await coll.delete_one(filter_doc)
             
             if result.deleted_count > 0:
@@ -220,4 +333,37 @@ class DataEditor:
             else:
                 return {"success": False, "error": "No document matched the filter"}
         except Exception as e:
-            return {"success": False, "error": str(e)}
\ No newline at end of file
+            return {"success": False, "error": str(e)}
+    
+    async def _apply_batch_mongodb(
+        self,
+        connector,
+        collection: str,
+        operations: List[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """Apply MongoDB document changes with one ordered bulk write."""
+        requests = []
+        for operation in operations:
+            action = operation.get("action")
+            if action == "insert":
+                requests.append(InsertOne(operation["data"]))
+            elif action == "update":
+                requests.append(UpdateOne(operation["primary_key"], {"$set": operation["changes"]}))
+            elif action == "delete":
+                requests.append(DeleteOne(operation["primary_key"]))
+            else:
+                return {"success": False, "error": f"Unknown action: {action}"}
+        
+        try:
+            coll = connector.connection[connector.database_name][collection]
+            # Ordered writes stop at the first error; MongoDB has no multi-document
+            # transaction outside replica sets, so earlier writes are kept
+            await coll.bulk_write(requests, ordered=True)
+            return {
+                "success": True,
+                "message": f"Applied {len(operations)} changes",
+                "applied": len(operations),
+                "statements": 1
+            }
+        except Exception as e:
+            return {"success": False, "error": str(e)}
@@ -1,9 +1,14 @@
 """Data explorer operations."""
 
-from typing import Optional, Dict, Any
+import base64
+import json
+from typing import Optional, Dict, Any, List
 from core.models import DatabaseConnection
 from operations.connection_manager import connection_manager
+from operations.row_counter import row_counter
+from utils.cache import schema_cache
 from utils.logger import logger
+from utils.result_format import dumps
 
 
 class DataExplorer:
@@ -21,7 +26,7 @@ class DataExplorer:
             return {"success": False, "error": "Not connected"}
 
         try:
-            query = f"""
+            query = """
                 SELECT
                     kcu.column_name,
                     ccu.table_schema AS foreign_schema,
@@ -35,15 +40,74 @@ class DataExplorer:
                     ON ccu.constraint_name = tc.constraint_name
                     AND ccu.table_schema = tc.table_schema
                 WHERE tc.constraint_type = 'FOREIGN KEY'
-                    AND tc.table_schema = '{schema_name}'
-                    AND tc.table_name = '{table_name}'
+                    AND tc.table_schema = :schema_name
+                    AND tc.table_name = :table_name
             """
-            result = await connector.execute_query(query)
+            result = await connector.execute_query(
+                query, {"schema_name": schema_name, "table_name": table_name}
+            )
             return {"success": True, "relationships": result.get("rows", [])}
         except Exception as e:
             logger.error(f"Failed to get table relationships for '{connection.name}.{schema_name}.{table_name}': {str(e)}")
             return {"success": False, "error": str(e)}
 
+    @staticmethod
+    def _encode_cursor(values: Optional[List[Any]], offset: int) -> str:
+        """Encode the last row's key values and the next offset as an opaque token."""
+        return base64.urlsafe_b64encode(dumps({"after": values, "offset": offset}).encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Dict[str, Any]:
+        """Decode a continuation token from _encode_cursor."""
+        try:
+            token = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return {"after": token.get("after"), "offset": int(token.get("offset", 0))}
+        except (ValueError, TypeError, AttributeError):
+            raise ValueError("Invalid cursor")
+
+    @staticmethod
+    def _seek_condition(quote, key_columns: List[str], after: List[Any], sort_order: str):
+        """Build the row comparison and parameters selecting rows after the given key values.
+
+        A NULL first value means the page ended among the NULLs of a nullable
+        sort column, which sort after every value; the seek then continues on
+        the primary key among them.
+        """
+        operator = "<" if sort_order == "DESC" else ">"
+        names = [f"key_{i}" for i in range(len(key_columns))]
+        params = dict(zip(names, after))
+        prefix = ""
+        if after[0] is None:
+            prefix = f"{quote(key_columns[0])} IS NULL AND "
+            params.pop(names[0])
+            key_columns, names = key_columns[1:], names[1:]
+
+        left = ", ".join(quote(column) for column in key_columns)
+        right = ", ".join(f":{name}" for name in names)
+        if len(key_columns) > 1:
+            left, right = f"({left})", f"({right})"
+        return f"{prefix}{left} {operator} {right}", params
+
+    async def _get_primary_key(self, connector, connection: DatabaseConnection, schema_name: str, table_name: str) -> List[str]:
+        """Get a table's primary key columns, cached with the schema."""
+        cache_key = f"{connection.id}_pk_{schema_name}_{table_name}"
+        primary_key = schema_cache.get(cache_key)
+        if primary_key is None:
+            primary_key = await connector.get_primary_key(table_name, schema_name)
+            schema_cache.set(cache_key, primary_key, ttl=900)
+        return primary_key
+
+    async def _is_nullable(self, connector, connection: DatabaseConnection, schema_name: str, table_name: str, column_name: str) -> bool:
+        """Check whether a column can hold NULL, from the columns cached with the schema."""
+        cache_key = f"{connection.id}_columns_{schema_name}_{table_name}"
+        columns = schema_cache.get(cache_key)
+        if columns is None:
+            columns = await connector.get_columns(table_name, schema_name)
+            schema_cache.set(cache_key, columns, ttl=600)
+        column = next((column for column in columns if column.get("column_name") == column_name), None)
+        # Unknown columns count as nullable, which never skips rows
+        return column is None or column.get("is_nullable") != "NO"
+
     async def browse_data(
         self,
         connection: DatabaseConnection,
@@ -54,8 +118,16 @@ class DataExplorer:
         sort_column: Optional[str] = None,
         sort_order: str = "ASC",
         filters: Optional[Dict[str, Any]] = None,
+        pagination: str = "offset",
+        cursor: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Browse table data with pagination, sorting, and filtering."""
+        """Browse table data with pagination, sorting, and filtering.
+
+        With pagination="keyset", pages seek past the previous page's last
+        (sort column, primary key) values carried in an opaque cursor, so deep
+        pages cost the same as the first. Tables without a primary key fall
+        back to OFFSET.
+        """
         connector = await connection_manager.get_connector(connection.id)
         if not connector:
             # Try to establish connection if not exists
@@ -67,28 +139,95 @@ class DataExplorer:
                 return {"success": False, "error": "Connection manager failed to provide connector"}
 
         try:
-            # Build query
-            query = f'SELECT * FROM "{schema_name}"."{table_name}"'
-            
+            quote = connector.quote_identifier
+            sort_order = "DESC" if (sort_order or "").upper() == "DESC" else "ASC"
+
+            # Seek on the sort column, with the primary key as tiebreaker
+            key_columns: List[str] = []
+            primary_key: List[str] = []
+            after = None
+            if pagination == "keyset":
+                primary_key = await self._get_primary_key(connector, connection, schema_name, table_name)
+                if primary_key:
+                    key_columns = ([sort_column] if sort_column else []) + [
+                        column for column in primary_key if column != sort_column
+                    ]
+                if cursor:
+                    token = self._decode_cursor(cursor)
+                    after, offset = token["after"], token["offset"]
+                    if after is not None and len(after) != len(key_columns):
+                        raise ValueError("Invalid cursor")
+
             # Add filters
+            params = {}
+            conditions = []
             if filters:
-                conditions = []
                 for column, value in filters.items():
                     if value:
-                        conditions.append(f'"{column}" ILIKE \'%{value}%\'')
-                if conditions:
-                    query += " WHERE " + " AND ".join(conditions)
-            
-            # Add sorting
-            if sort_column:
-                query += f' ORDER BY "{sort_column}" {sort_order}'
-            
-            # Add pagination
-            query += f" LIMIT {limit} OFFSET {offset}"
+                        name = f"filter_{len(params)}"
+                        conditions.append(f"{quote(column)} ILIKE :{name}")
+                        params[name] = f"%{value}%"
+
+            def build(where: List[str], order_columns: List[str], paging: str) -> str:
+                """Build the page query from its conditions, sort columns and LIMIT clause."""
+                query = f"SELECT * FROM {quote(schema_name)}.{quote(table_name)}"
+                if where:
+                    query += " WHERE " + " AND ".join(where)
+                order_by = [f"{quote(column)} {sort_order}" for column in order_columns]
+                if order_by and order_columns[0] == sort_column and null_sort and after is None:
+                    # NULLs of a nullable sort column come last on every database
+                    if connector.supports_nulls_last:
+                        order_by[0] += " NULLS LAST"
+                    else:
+                        order_by.insert(0, f"{quote(sort_column)} IS NULL")
+                if order_by:
+                    query += " ORDER BY " + ", ".join(order_by)
+                return query + paging
 
-            result = await connector.execute_query(query)
+            # Only nullable sort columns need NULL handling, which indexes serve less well
+            null_sort = (
+                bool(key_columns) and bool(sort_column) and sort_column not in primary_key
+                and await self._is_nullable(connector, connection, schema_name, table_name, sort_column)
+            )
+            order_columns = key_columns or ([sort_column] if sort_column else [])
+            seek = []
+            if key_columns and after is not None:
+                condition, key_params = self._seek_condition(quote, key_columns, after, sort_order)
+                seek.append(condition)
+                params.update(key_params)
+
+            # Keyset pages fetch one extra row to detect the end
+            if key_columns and after is not None:
+                query = build(conditions + seek, order_columns, f" LIMIT {limit + 1}")
+            else:
+                query = build(conditions, order_columns, f" LIMIT {limit + 1} OFFSET {offset}")
+
+            result = await connector.execute_query(query, params or None)
+            if not result.get("success"):
+                return {"success": False, "error": result.get("error", "Query failed")}
             rows = result.get("data", [])
             columns = result.get("columns", [])
+
+            if null_sort and after is not None and after[0] is not None and len(rows) <= limit:
+                # The row comparison stops at the last value; the NULL rows follow in key order
+                null_query = build(
+                    conditions + [f"{quote(sort_column)} IS NULL"], key_columns[1:], f" LIMIT {limit + 1 - len(rows)}"
+                )
+                null_params = {key: value for key, value in params.items() if not key.startswith("key_")}
+                null_result = await connector.execute_query(null_query, null_params or None)
+                if not null_result.get("success"):
+                    return {"success": False, "error": null_result.get("error", "Query failed")}
+                rows = rows + null_result.get("data", [])
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+
+            next_cursor = None
+            if pagination == "keyset" and has_more:
+                next_offset = offset + limit
+                last = None
+                if key_columns and all(column in columns for column in key_columns):
+                    last = [rows[-1][columns.index(column)] for column in key_columns]
+                next_cursor = self._encode_cursor(last, next_offset)
             
             # Truncate large text/blob fields
             truncated_rows = []
@@ -101,13 +240,18 @@ class DataExplorer:
                         truncated_row.append(val)
                 truncated_rows.append(truncated_row)
             
-            return {
+            response = {
                 "success": True,
                 "rows": truncated_rows,
                 "columns": columns,
                 "limit": limit,
                 "offset": offset,
+                "has_more": has_more,
             }
+            if pagination == "keyset":
+                response["pagination"] = "keyset" if key_columns else "offset"
+                response["next_cursor"] = next_cursor
+            return response
 
         except Exception as e:
             logger.error(f"Failed to browse data for '{connection.name}.{schema_name}.{table_name}': {str(e)}")
@@ -127,11 +271,13 @@ class DataExplorer:
             return {"success": False, "error": "Not connected"}
 
         try:
-            conditions = [f'"{k}" = \'{v}\'' for k, v in row_identifier.items()]
+            quote = connector.quote_identifier
+            conditions = [f"{quote(k)} = :key_{i}" for i, k in enumerate(row_identifier)]
+            params = {f"key_{i}": v for i, v in enumerate(row_identifier.values())}
             where_clause = " AND ".join(conditions)
-            query = f'SELECT "{column_name}" FROM "{schema_name}"."{table_name}" WHERE {where_clause} LIMIT 1'
+            query = f"SELECT {quote(column_name)} FROM {quote(schema_name)}.{quote(table_name)} WHERE {where_clause} LIMIT 1"
             
-            result = await connector.execute_query(query)
+            result = await connector.execute_query(query, params)
             if result.get("success") and result.get("data"):
                 return {"success": True, "data": result["data"][0][0]}
             return {"success": False, "error": "No data found"}
@@ -144,20 +290,17 @@ class DataExplorer:
         connection: DatabaseConnection,
         schema_name: str,
         table_name: str,
-    ) -> int:
-        """Get total row count for a table."""
+        exact: bool = False,
+    ) -> Dict[str, Any]:
+        """Get a table's row count, estimated from statistics unless an exact count has finished."""
         connector = await connection_manager.get_connector(connection.id)
         if not connector:
-            return 0
+            return {"success": False, "error": "Not connected"}
 
         try:
-            query = f'SELECT COUNT(*) FROM "{schema_name}"."{table_name}"'
-            result = await connector.execute_query(query)
-            
-            if result.get("success") and result.get("data"):
-                return result["data"][0][0]
-            return 0
+            result = await row_counter.get_count(connection.id, connector, schema_name, table_name, exact)
+            return {"success": True, **result}
 
         except Exception as e:
             logger.error(f"Failed to get row count for '{connection.name}.{schema_name}.{table_name}': {str(e)}")
-            return 0
+            return {"success": False, "error": str(e)}
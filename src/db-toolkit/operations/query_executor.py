@@ -3,11 +3,15 @@
 import time
 import asyncio
 import hashlib
-from typing import Dict, Any, Optional
-from core.models import DatabaseConnection
+from typing import Dict, Any, Iterable, Optional, Set
+from core.models import DatabaseConnection, DatabaseType
 from operations.connection_manager import connection_manager
-from utils.cache import query_cache, prepared_cache
+from operations.query_registry import query_registry
+from utils.cache import CacheStore, query_cache, schema_cache
 from utils.logger import logger
+from utils.mongo_query import apply_cursor_defaults
+from utils.single_flight import SingleFlight
+from utils.sql_lexer import classify
 
 
 class QueryValidationCache:
@@ -15,53 +19,33 @@ class QueryValidationCache:
     
     def __init__(self, max_size: int = 1000):
         """Initialize validation cache."""
-        self.cache: Dict[str, Dict[str, Any]] = {}
-        self.access_times: Dict[str, float] = {}
-        self.max_size = max_size
+        self.store = CacheStore("validation", max_entries=max_size)
     
     def _generate_key(self, query: str, db_type: str) -> str:
         """Generate cache key for query validation."""
-        query_normalized = ' '.join(query.upper().strip().split())
-        key_string = f"{db_type}:{query_normalized}"
+        # Exact text: whitespace and case can matter, e.g. a newline ending a -- comment
+        key_string = f"{db_type}:{query}"
         return hashlib.md5(key_string.encode()).hexdigest()[:16]
     
-    def _evict_lru(self) -> None:
-        """Evict least recently used entries."""
-        if len(self.cache) >= self.max_size:
-            # Remove 20% of oldest entries
-            sorted_keys = sorted(self.access_times.items(), key=lambda x: x[1])
-            keys_to_remove = [k for k, _ in sorted_keys[:self.max_size // 5]]
-            for key in keys_to_remove:
-                self.cache.pop(key, None)
-                self.access_times.pop(key, None)
-    
     def get_validation(self, query: str, db_type: str) -> Optional[Dict[str, Any]]:
         """Get cached validation result."""
-        key = self._generate_key(query, db_type)
-        
-        if key not in self.cache:
-            return None
-        
-        # Update access time
-        self.access_times[key] = time.time()
-        return self.cache[key]
+        return self.store.get(self._generate_key(query, db_type))
     
     def set_validation(self, query: str, db_type: str, result: Dict[str, Any]) -> None:
         """Cache validation result."""
-        key = self._generate_key(query, db_type)
-        
-        self._evict_lru()
-        
-        self.cache[key] = result
-        self.access_times[key] = time.time()
+        self.store.set(self._generate_key(query, db_type), result)
     
     def clear(self) -> None:
         """Clear validation cache."""
-        self.cache.clear()
-        self.access_times.clear()
+        self.store.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return self.store.get_stats()
 
 
 validation_cache = QueryValidationCache()
+query_flights = SingleFlight("query")
 
 
 class QueryExecutor:
@@ -78,9 +62,13 @@ class QueryExecutor:
         query: str,
         limit: Optional[int] = None,
         offset: int = 0,
-        timeout: Optional[int] = None
+        timeout: Optional[int] = None,
+        query_id: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Execute query with safety checks and pagination."""
+        """Execute query with safety checks and pagination.
+        
+        query_id optionally names the running query so it can be cancelled through query_registry.
+        """
         if not query or not query.strip():
             return {
                 "success": False,
@@ -107,12 +95,34 @@ class QueryExecutor:
                 "execution_time": 0.0
             }
         
-        # Check query cache first (only for SELECT queries)
-        if query.strip().upper().startswith('SELECT'):
-            cached_result = query_cache.get_query_result(connection.id, query)
+        # Check query cache first (only for cacheable reads); each page is cached separately
+        page = {"limit": limit, "offset": offset}
+        if connection.db_type != DatabaseType.MONGODB and classify(query, connection.db_type.value).cacheable:
+            cached_result = query_cache.get_query_result(connection.id, query, page)
             if cached_result:
                 return cached_result
+            
+            # Identical reads that miss together run once; named queries stay separate so they can be cancelled
+            if query_id is None:
+                flight_key = f"{connection.id}:{query.strip()}:{limit}:{offset}"
+                return await query_flights.run(
+                    flight_key,
+                    lambda: self._run_query(connection, query, limit, offset, timeout, query_id, page)
+                )
         
+        return await self._run_query(connection, query, limit, offset, timeout, query_id, page)
+    
+    async def _run_query(
+        self,
+        connection: DatabaseConnection,
+        query: str,
+        limit: int,
+        offset: int,
+        timeout: int,
+        query_id: Optional[str],
+        page: Dict[str, int]
+    ) -> Dict[str, Any]:
+        """Run a validated query against the database and cache a successful SELECT page."""
         start_time = time.time()
         
         try:
@@ -128,18 +138,22 @@ class QueryExecutor:
                     raise Exception("Connection manager failed to provide connector")
             
             # Add pagination for SQL queries
-            paginated_query = self._add_pagination(query, connection.db_type.value, limit, offset)
-            
-            # Get prepared statement (placeholder for future optimization)
-            prepared_query = prepared_cache.get_prepared_query(
-                connection.id, paginated_query, connection.db_type.value
-            )
+            paginated_query = self._add_pagination(query, connection.db_type.value, limit, offset, timeout)
             
-            # Execute with timeout
-            result = await asyncio.wait_for(
-                connector.execute_query(prepared_query),
-                timeout=timeout
-            )
+            # Registered so it can be cancelled, and is cancelled on the server if it times out
+            try:
+                result = await query_registry.run(
+                    connection.id,
+                    connector,
+                    query,
+                    connector.execute_query(paginated_query),
+                    timeout=timeout,
+                    query_id=query_id
+                )
+            finally:
+                # A write may have changed rows even if it failed or was cancelled part way
+                if connection.db_type != DatabaseType.MONGODB and not self.is_read_only(query, connection.db_type.value):
+                    query_cache.invalidate_query(connection.id, query, dialect=connection.db_type.value)
             
             execution_time = time.time() - start_time
             
@@ -153,9 +167,16 @@ class QueryExecutor:
                     "has_more": result.get("row_count", 0) >= limit
                 }
                 
-                # Cache successful SELECT queries
-                if query.strip().upper().startswith('SELECT'):
-                    query_cache.set_query_result(connection.id, query, formatted_result)
+                # Cache successful reads
+                if connection.db_type != DatabaseType.MONGODB:
+                    query_cache.set_query_result(
+                        connection.id,
+                        query,
+                        formatted_result,
+                        params=page,
+                        base_tables=self._base_tables(connection.id, classify(query, connection.db_type.value).tables or ()),
+                        dialect=connection.db_type.value
+                    )
                 
                 # Record query activity for adaptive scheduling
                 from operations.background_tasks import record_query_activity
@@ -172,6 +193,17 @@ class QueryExecutor:
                     "execution_time": round(execution_time, 3)
                 }
                 
+        except asyncio.TimeoutError:
+            execution_time = time.time() - start_time
+            logger.warning(f"Query on '{connection.name}' timed out after {timeout}s and was cancelled")
+            return {
+                "success": False,
+                "error": f"Query timed out after {timeout} seconds and was cancelled",
+                "columns": [],
+                "rows": [],
+                "total_rows": 0,
+                "execution_time": round(execution_time, 3)
+            }
         except Exception as e:
             execution_time = time.time() - start_time
             logger.error(f"Query execution failed on '{connection.name}': {str(e)}")
@@ -184,52 +216,82 @@ class QueryExecutor:
                 "execution_time": round(execution_time, 3)
             }
     
+    @staticmethod
+    def _base_tables(connection_id: str, tables: Iterable[str]) -> Set[str]:
+        """Pick the referenced names that are tables in the cached schema tree, which holds no views."""
+        schema_tree = schema_cache.get(f"{connection_id}_schema")
+        if not schema_tree:
+            return set()
+        schemas = schema_tree["schemas"].values()
+        return {table for table in tables if any(table in schema["tables"] for schema in schemas)}
+    
+    def validate_query(self, query: str, db_type: str) -> Dict[str, Any]:
+        """Check a query is safe to run, returning {"safe", "error"}."""
+        return self._validate_query_cached(query.strip(), db_type)
+    
+    def is_read_only(self, query: str, db_type: Optional[str] = None) -> bool:
+        """Check whether a query only reads data and can share the connection pool."""
+        return classify(query, db_type).read_only
+    
     def _validate_query(self, query: str, db_type: str) -> Dict[str, Any]:
         """Validate query for safety."""
-        query_upper = query.upper().strip()
-        
-        # Block dangerous operations
-        dangerous_keywords = [
-            "DROP DATABASE",
-            "DROP SCHEMA",
-            "TRUNCATE",
-            "DELETE FROM" if "WHERE" not in query_upper else None,
-            "UPDATE" if "WHERE" not in query_upper else None,
-        ]
-        
-        for keyword in dangerous_keywords:
-            if keyword and keyword in query_upper:
+        # MongoDB specific validation
+        if db_type == "mongodb":
+            if not query.startswith("db."):
                 return {
                     "safe": False,
-                    "error": f"Dangerous operation detected: {keyword}. Use with caution."
+                    "error": "MongoDB query must use db.<collection>.find(...) or db.<collection>.aggregate([...]) syntax"
                 }
+            return {"safe": True}
         
-        # MongoDB specific validation
-        if db_type == "mongodb":
-            if not (query.startswith("{") or query.startswith("db.")):
+        # Block dangerous operations in any statement, including writes inside CTEs
+        for statement in classify(query, db_type).statements:
+            keyword = None
+            if statement.keyword == "DROP" and statement.object_type in ("DATABASE", "SCHEMA"):
+                keyword = f"DROP {statement.object_type}"
+            elif statement.keyword == "TRUNCATE":
+                keyword = "TRUNCATE"
+            elif statement.unfiltered_write == "DELETE":
+                keyword = "DELETE FROM"
+            elif statement.unfiltered_write == "UPDATE":
+                keyword = "UPDATE"
+            
+            if keyword:
                 return {
                     "safe": False,
-                    "error": "MongoDB query must be valid JSON or db.collection syntax"
+                    "error": f"Dangerous operation detected: {keyword}. Use with caution."
                 }
         
         return {"safe": True}
     
-    def _add_pagination(self, query: str, db_type: str, limit: int, offset: int) -> str:
+    def _add_pagination(
+        self,
+        query: str,
+        db_type: str,
+        limit: int,
+        offset: int,
+        timeout: Optional[int] = None
+    ) -> str:
         """Add pagination to query if not present."""
-        query_upper = query.upper().strip()
-        
         if db_type == "mongodb":
-            return query  # MongoDB pagination handled in connector
+            # Pushed to the server as cursor skip/limit (or $skip/$limit stages) and maxTimeMS
+            return apply_cursor_defaults(
+                query,
+                limit=limit,
+                skip=offset,
+                max_time_ms=timeout * 1000 if timeout else None
+            )
         
-        # Check if LIMIT already exists
-        if "LIMIT" in query_upper:
+        # Only single reads without a top-level LIMIT; a LIMIT inside a subquery or literal does not count
+        if not classify(query, db_type).paginatable:
             return query
         
-        # Add LIMIT and OFFSET
+        # Add LIMIT and OFFSET on a new line, so a trailing line comment cannot swallow them
+        query = query.rstrip().rstrip(";")
         if db_type == "sqlite":
-            return f"{query} LIMIT {limit} OFFSET {offset}"
+            return f"{query}\nLIMIT {limit} OFFSET {offset}"
         elif db_type in ["postgresql", "mysql"]:
-            return f"{query} LIMIT {limit} OFFSET {offset}"
+            return f"{query}\nLIMIT {limit} OFFSET {offset}"
         
         return query
     
@@ -0,0 +1,115 @@
+"""Registry of in-flight queries with server-side cancellation."""
+
+import asyncio
+import time
+import uuid
+from typing import Any, Awaitable, Dict, List, Optional
+from connectors.base import BaseConnector, current_query
+from utils.logger import logger
+
+
+class QueryRegistry:
+    """Tracks running queries so users and timeouts can cancel them on the server."""
+
+    def __init__(self, cancel_timeout: float = 5.0, cancel_grace: float = 2.0):
+        """Initialize registry."""
+        self._queries: Dict[str, Dict[str, Any]] = {}
+        # Seconds allowed for the cancel request itself, and for the query to stop afterwards
+        self.cancel_timeout = cancel_timeout
+        self.cancel_grace = cancel_grace
+
+    async def run(
+        self,
+        connection_id: str,
+        connector: BaseConnector,
+        query: str,
+        operation: Awaitable[Dict[str, Any]],
+        timeout: Optional[float] = None,
+        query_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Run a connector operation as a registered query.
+
+        On timeout the query is cancelled on the server before asyncio.TimeoutError
+        is raised, so it does not keep running after the caller gives up.
+        """
+        if query_id in self._queries:
+            raise ValueError(f"Query id '{query_id}' is already running")
+
+        entry = {
+            "id": query_id or uuid.uuid4().hex,
+            "connection_id": connection_id,
+            "query": query,
+            "started_at": time.time(),
+            "backend_id": None,
+            "session": None,
+            "connector": connector,
+            "cancelled": False
+        }
+        # The task copies the context, so the connector sees this entry
+        token = current_query.set(entry)
+        try:
+            entry["task"] = asyncio.ensure_future(operation)
+        finally:
+            current_query.reset(token)
+        self._queries[entry["id"]] = entry
+
+        try:
+            done, _ = await asyncio.wait({entry["task"]}, timeout=timeout)
+            if not done:
+                await self._cancel_entry(entry)
+                raise asyncio.TimeoutError()
+            if entry["task"].cancelled():
+                raise RuntimeError("Query was cancelled")
+            return entry["task"].result()
+        except asyncio.CancelledError:
+            # The caller went away; do not leave the statement running
+            await self._cancel_entry(entry)
+            raise
+        finally:
+            self._queries.pop(entry["id"], None)
+
+    async def _cancel_entry(self, entry: Dict[str, Any]) -> bool:
+        """Cancel a query on the server, then stop its task if it does not finish."""
+        entry["cancelled"] = True
+        task = entry["task"]
+        cancelled = False
+        try:
+            cancelled = bool(await asyncio.wait_for(entry["connector"].cancel_query(entry), timeout=self.cancel_timeout))
+        except Exception as e:
+            logger.warning(f"Server-side cancel failed for query {entry['id']}: {str(e)}")
+
+        if not task.done():
+            await asyncio.wait({task}, timeout=self.cancel_grace if cancelled else 0)
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        return cancelled
+
+    async def cancel(self, query_id: str) -> bool:
+        """Cancel a running query; returns False if no such query is running."""
+        entry = self._queries.get(query_id)
+        if not entry or entry["task"].done():
+            return False
+        logger.info(f"Cancelling query {query_id} on '{entry['connection_id']}'")
+        await self._cancel_entry(entry)
+        return True
+
+    def list_queries(self, connection_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """List running queries, oldest first."""
+        now = time.time()
+        return [
+            {
+                "query_id": entry["id"],
+                "connection_id": entry["connection_id"],
+                "backend_id": entry["backend_id"],
+                "query": entry["query"],
+                "started_at": entry["started_at"],
+                "elapsed_ms": round((now - entry["started_at"]) * 1000, 1),
+                "cancelled": entry["cancelled"]
+            }
+            for entry in sorted(self._queries.values(), key=lambda e: e["started_at"])
+            if connection_id is None or entry["connection_id"] == connection_id
+        ]
+
+
+query_registry = QueryRegistry()
@@ -0,0 +1,108 @@
+"""Estimate-first table row counts with exact counts as background jobs."""
+
+import asyncio
+from typing import Any, Dict, Optional
+from connectors.base import BaseConnector
+from operations.query_registry import query_registry
+from utils.cache import schema_cache
+from utils.logger import logger
+
+
+class RowCounter:
+    """Serves row counts from planner statistics and refines them with exact counts."""
+
+    def __init__(self, estimate_ttl: int = 60, exact_ttl: int = 300):
+        """Initialize counter."""
+        self._jobs: Dict[str, asyncio.Task] = {}
+        self.estimate_ttl = estimate_ttl
+        self.exact_ttl = exact_ttl
+
+    @staticmethod
+    def _cache_key(connection_id: str, schema: str, table: str) -> str:
+        """Build the cache key for a table's count."""
+        return f"{connection_id}_rowcount_{schema}_{table}"
+
+    @staticmethod
+    def _query_id(cache_key: str) -> str:
+        """Name the registered query of a table's exact count."""
+        return f"rowcount:{cache_key}"
+
+    async def get_count(
+        self,
+        connection_id: str,
+        connector: BaseConnector,
+        schema: str,
+        table: str,
+        exact: bool = False
+    ) -> Dict[str, Any]:
+        """Get a table's row count without waiting for a full scan.
+
+        Returns {"count", "estimated", "counting", "query_id"}. count is None
+        when the database has no estimate. An exact count is started in the
+        background only when requested, since it scans the whole table;
+        "query_id" identifies it in the query registry while it runs.
+        """
+        key = self._cache_key(connection_id, schema, table)
+        cached = schema_cache.get(key)
+        if cached is None:
+            count = await connector.estimate_row_count(table, schema)
+            cached = {"count": count, "estimated": True}
+            schema_cache.set(key, cached, ttl=self.estimate_ttl)
+
+        if cached["estimated"] and exact:
+            self._start_exact(connection_id, connector, schema, table)
+
+        counting = key in self._jobs
+        return {
+            "count": cached["count"],
+            "estimated": cached["estimated"],
+            "counting": counting,
+            "query_id": self._query_id(key) if counting else None
+        }
+
+    def _start_exact(self, connection_id: str, connector: BaseConnector, schema: str, table: str) -> None:
+        """Start an exact count unless one is already running for the table."""
+        key = self._cache_key(connection_id, schema, table)
+        if key in self._jobs:
+            return
+        task = asyncio.create_task(self._count_exact(connection_id, connector, schema, table, key))
+        self._jobs[key] = task
+        task.add_done_callback(lambda _: self._jobs.pop(key, None))
+
+    async def _count_exact(
+        self,
+        connection_id: str,
+        connector: BaseConnector,
+        schema: str,
+        table: str,
+        key: str
+    ) -> Optional[int]:
+        """Count a table's rows as a registered, cancellable query and cache the result."""
+        try:
+            count = await query_registry.run(
+                connection_id,
+                connector,
+                f"COUNT(*) {schema}.{table}",
+                connector.count_rows(table, schema),
+                query_id=self._query_id(key)
+            )
+        except Exception as e:
+            logger.warning(f"Exact row count failed for '{schema}.{table}': {str(e)}")
+            return None
+        schema_cache.set(key, {"count": count, "estimated": False}, ttl=self.exact_ttl)
+        return count
+
+    async def cancel_exact(self, connection_id: str, schema: str, table: str) -> bool:
+        """Cancel a table's running exact count; returns False if none is running."""
+        key = self._cache_key(connection_id, schema, table)
+        task = self._jobs.get(key)
+        if not task or task.done():
+            return False
+        if not await query_registry.cancel(self._query_id(key)):
+            # Not registered yet, so nothing runs on the server
+            task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return True
+
+
+row_counter = RowCounter()
@@ -1,10 +1,34 @@
 """Schema exploration operations."""
 
-from typing import Dict, List, Any
+import asyncio
+import json
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
 from core.models import DatabaseConnection
+from core.schema_snapshot_storage import SchemaSnapshotStorage, catalog_fingerprint
 from utils.cache import schema_cache
 from operations.connection_manager import connection_manager
 from utils.logger import logger
+from utils.single_flight import SingleFlight
+
+snapshot_storage = SchemaSnapshotStorage()
+schema_loads = SingleFlight("schema_tree")
+# Schema trees are fresh for 15 minutes, then served stale for up to a day while they are revalidated
+SCHEMA_TREE_TTL = 900
+SCHEMA_TREE_STALE_TTL = 24 * 3600
+# Background snapshot checks by connection ID
+_revalidations: Dict[str, asyncio.Task] = {}
+
+
+def _table_node(table: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a schema tree node from a get_catalog table entry."""
+    return {
+        "columns": table["columns"],
+        "column_count": len(table["columns"]),
+        "primary_key": table["primary_key"],
+        "foreign_keys": table["foreign_keys"],
+        "indexes": table["indexes"]
+    }
 
 
 class SchemaExplorer:
@@ -16,7 +40,13 @@ class SchemaExplorer:
         pass
     
     async def get_schema_tree(self, connection: DatabaseConnection, use_cache: bool = True) -> Dict[str, Any]:
-        """Get complete schema tree for connection."""
+        """Get complete schema tree for connection.
+        
+        Without a tree in memory, the snapshot saved by a previous run is
+        returned at once (marked "revalidating") and checked against the
+        database's catalog fingerprint in the background. A cached tree past
+        its TTL is likewise returned at once and revalidated in the background.
+        """
         cache_key = f"{connection.id}_schema"
         
         logger.info(f"Getting schema tree for connection '{connection.name}' (use_cache={use_cache})")
@@ -24,54 +54,248 @@ class SchemaExplorer:
         if use_cache:
             cached = schema_cache.get(cache_key)
             if cached:
+                if schema_cache.is_stale(cache_key):
+                    # Served as is while the catalog is checked in the background
+                    self._start_revalidation(connection, self._cached_snapshot(connection, cached))
                 logger.info(f"Returning cached schema for '{connection.name}'")
                 return cached
+            
+            # Concurrent misses share one snapshot read or catalog load
+            return await schema_loads.run(cache_key, lambda: self._load_missing_tree(connection))
         
+        return await self._load_tree_or_error(connection)
+    
+    async def _load_missing_tree(self, connection: DatabaseConnection) -> Dict[str, Any]:
+        """Serve the saved snapshot of a tree that is not cached, or load it from the database."""
+        snapshot = await self._load_snapshot(connection)
+        if snapshot:
+            self._cache_schema_tree(connection.id, snapshot["tree"], snapshot["table_fingerprints"])
+            self._start_revalidation(connection, snapshot)
+            logger.info(f"Returning saved schema snapshot for '{connection.name}'")
+            return {**snapshot["tree"], "revalidating": True}
+        
+        return await self._load_tree_or_error(connection)
+    
+    async def _load_tree_or_error(self, connection: DatabaseConnection) -> Dict[str, Any]:
+        """Load the schema tree from the database, reporting failure as an error result."""
         try:
+            return await self._load_schema_tree(connection)
+            
+        except Exception as e:
+            logger.error(f"Failed to get schema tree for '{connection.name}': {str(e)}", exc_info=True)
+            return {"error": str(e), "success": False}
+    
+    async def _get_connector(self, connection: DatabaseConnection):
+        """Get the managed connector for a connection, connecting if needed."""
+        connector = await connection_manager.get_connector(connection.id)
+        if not connector:
+            # Try to establish connection if not exists
+            success = await connection_manager.connect(connection)
+            if not success:
+                raise Exception("Failed to establish database connection")
             connector = await connection_manager.get_connector(connection.id)
             if not connector:
-                # Try to establish connection if not exists
-                success = await connection_manager.connect(connection)
-                if not success:
-                    raise Exception("Failed to establish database connection")
-                connector = await connection_manager.get_connector(connection.id)
-                if not connector:
-                    raise Exception("Connection manager failed to provide connector")
-            
-            schema_tree = {
-                "connection_id": connection.id,
-                "db_type": connection.db_type.value,
-                "schemas": {}
+                raise Exception("Connection manager failed to provide connector")
+        return connector
+    
+    async def _load_schema_tree(self, connection: DatabaseConnection) -> Dict[str, Any]:
+        """Read the schema tree from the database, then cache it and save a snapshot."""
+        connector = await self._get_connector(connection)
+        
+        # Fingerprinted first, so a change made during the catalog fetch is caught next time
+        table_fingerprints = await connector.get_table_fingerprints()
+        
+        schema_tree = {
+            "connection_id": connection.id,
+            "db_type": connection.db_type.value,
+            "schemas": {}
+        }
+        
+        # One bulk catalog fetch instead of a round trip per table
+        catalog = await connector.get_catalog()
+        logger.info(f"Found {len(catalog)} schemas: {list(catalog)}")
+        
+        for schema_name, tables in catalog.items():
+            schema_tree["schemas"][schema_name] = {
+                "tables": {},
+                "table_count": len(tables)
             }
             
-            schemas = await connector.get_schemas()
-            logger.info(f"Found {len(schemas)} schemas: {schemas}")
-            
-            for schema_name in schemas:
-                tables = await connector.get_tables(schema_name)
-                logger.info(f"Schema '{schema_name}' has {len(tables)} tables: {tables}")
-                schema_tree["schemas"][schema_name] = {
-                    "tables": {},
-                    "table_count": len(tables)
-                }
-                
-                for table_name in tables:
-                    columns = await connector.get_columns(table_name, schema_name)
-                    schema_tree["schemas"][schema_name]["tables"][table_name] = {
-                        "columns": columns,
-                        "column_count": len(columns)
-                    }
-            
-            # Don't disconnect - let connection manager handle connection lifecycle
-            
-            # Cache the result with longer TTL for schema data
-            schema_cache.set(cache_key, schema_tree, ttl=900)  # 15 minutes
-            
-            return schema_tree
+            for table_name, table in tables.items():
+                schema_tree["schemas"][schema_name]["tables"][table_name] = _table_node(table)
+        
+        # Don't disconnect - let connection manager handle connection lifecycle
+        
+        await self._store_schema_tree(connection, schema_tree, table_fingerprints)
+        return schema_tree
+    
+    @staticmethod
+    def _cache_schema_tree(
+        connection_id: str,
+        schema_tree: Dict[str, Any],
+        table_fingerprints: Optional[Dict[str, Dict[str, str]]]
+    ) -> None:
+        """Cache a schema tree and its table fingerprints, servable as stale past their TTL."""
+        schema_cache.set(f"{connection_id}_schema", schema_tree, ttl=SCHEMA_TREE_TTL, stale_ttl=SCHEMA_TREE_STALE_TTL)
+        if table_fingerprints is not None:
+            schema_cache.set(
+                f"{connection_id}_schema_fingerprints",
+                table_fingerprints,
+                ttl=SCHEMA_TREE_TTL,
+                stale_ttl=SCHEMA_TREE_STALE_TTL
+            )
+    
+    @staticmethod
+    def _cached_snapshot(connection: DatabaseConnection, schema_tree: Dict[str, Any]) -> Dict[str, Any]:
+        """Describe a cached tree the way a saved snapshot is, for revalidation."""
+        table_fingerprints = schema_cache.get(f"{connection.id}_schema_fingerprints")
+        return {
+            "tree": schema_tree,
+            "table_fingerprints": table_fingerprints,
+            "fingerprint": catalog_fingerprint(table_fingerprints) if table_fingerprints is not None else None
+        }
+    
+    async def _store_schema_tree(
+        self,
+        connection: DatabaseConnection,
+        schema_tree: Dict[str, Any],
+        table_fingerprints: Optional[Dict[str, Dict[str, str]]]
+    ) -> None:
+        """Cache a schema tree with the table fingerprints it was read at, and save a snapshot."""
+        self._cache_schema_tree(connection.id, schema_tree, table_fingerprints)
+        # Name lists are derived from the tree and rebuilt from it on next use
+        for key in schema_cache.get_keys():
+            if key == f"{connection.id}_schemas_list" or key.startswith(f"{connection.id}_tables_"):
+                schema_cache.delete(key)
+        try:
+            await snapshot_storage.save(connection, schema_tree, table_fingerprints)
+        except Exception as e:
+            logger.warning(f"Failed to save schema snapshot for '{connection.name}': {str(e)}")
+    
+    async def _patch_schema_tree(
+        self,
+        connection: DatabaseConnection,
+        connector,
+        schema_tree: Dict[str, Any],
+        old_fingerprints: Dict[str, Dict[str, str]],
+        new_fingerprints: Dict[str, Dict[str, str]]
+    ) -> Dict[str, int]:
+        """Re-read only tables whose fingerprint changed and patch them into a copy of the tree.
+        
+        Unchanged table nodes are shared with the old tree, which is left intact
+        for responses still being serialized. Returns counts of added, changed
+        and removed tables.
+        """
+        added: Dict[str, List[str]] = {}
+        changed: Dict[str, List[str]] = {}
+        for schema_name, tables in new_fingerprints.items():
+            old_tables = old_fingerprints.get(schema_name, {})
+            for table_name, fingerprint in tables.items():
+                if table_name not in old_tables:
+                    added.setdefault(schema_name, []).append(table_name)
+                elif old_tables[table_name] != fingerprint:
+                    changed.setdefault(schema_name, []).append(table_name)
+        removed = [
+            (schema_name, table_name)
+            for schema_name, tables in old_fingerprints.items()
+            for table_name in tables
+            if table_name not in new_fingerprints.get(schema_name, {})
+        ]
+        
+        stale = {
+            schema_name: added.get(schema_name, []) + changed.get(schema_name, [])
+            for schema_name in {*added, *changed}
+        }
+        catalog = await connector.get_catalog(stale) if stale else {}
+        # Schemas without tables have no fingerprints
+        schema_names = set(await connector.get_schemas()) | set(new_fingerprints)
+        
+        schemas = {
+            schema_name: {**schema, "tables": dict(schema["tables"])}
+            for schema_name, schema in schema_tree["schemas"].items()
+        }
+        schemas_changed = set(schemas) != schema_names
+        for schema_name in list(schemas):
+            if schema_name not in schema_names:
+                del schemas[schema_name]
+        for schema_name in schema_names:
+            schemas.setdefault(schema_name, {"tables": {}, "table_count": 0})
+        
+        for schema_name, table_name in removed:
+            if schema_name in schemas:
+                schemas[schema_name]["tables"].pop(table_name, None)
+            self._forget_table(connection.id, schema_name, table_name)
+        for schema_name, table_names in stale.items():
+            for table_name in table_names:
+                table = catalog.get(schema_name, {}).get(table_name)
+                if table is None:
+                    # Dropped after it was fingerprinted
+                    schemas[schema_name]["tables"].pop(table_name, None)
+                else:
+                    schemas[schema_name]["tables"][table_name] = _table_node(table)
+                self._forget_table(connection.id, schema_name, table_name)
+        
+        for schema_name, schema in schemas.items():
+            schema["table_count"] = len(schema["tables"])
+        if schemas_changed:
+            schema_cache.delete(f"{connection.id}_schemas_list")
+        for schema_name in {*added, *(schema_name for schema_name, _ in removed)}:
+            schema_cache.delete(f"{connection.id}_tables_{schema_name}")
+        
+        await self._store_schema_tree(connection, {**schema_tree, "schemas": schemas}, new_fingerprints)
+        return {
+            "added": sum(len(tables) for tables in added.values()),
+            "changed": sum(len(tables) for tables in changed.values()),
+            "removed": len(removed)
+        }
+    
+    @staticmethod
+    def _forget_table(connection_id: str, schema: str, table: str) -> None:
+        """Drop per-table cache entries after a table's definition changed."""
+        for key in (
+            f"{connection_id}_table_{schema}_{table}",
+            f"{connection_id}_columns_{schema}_{table}",
+            f"{connection_id}_pk_{schema}_{table}",
+        ):
+            schema_cache.delete(key)
+    
+    async def _load_snapshot(self, connection: DatabaseConnection) -> Optional[Dict[str, Any]]:
+        """Get the saved schema snapshot, or None if there is none or it cannot be read."""
+        try:
+            return await snapshot_storage.load(connection)
+        except Exception as e:
+            logger.warning(f"Failed to read schema snapshot for '{connection.name}': {str(e)}")
+            return None
+    
+    def _start_revalidation(self, connection: DatabaseConnection, snapshot: Dict[str, Any]) -> None:
+        """Check a served snapshot against the database in the background."""
+        task = _revalidations.get(connection.id)
+        if task and not task.done():
+            return
+        _revalidations[connection.id] = asyncio.create_task(self._revalidate(connection, snapshot))
+    
+    async def _revalidate(self, connection: DatabaseConnection, snapshot: Dict[str, Any]) -> bool:
+        """Reload the schema tree if the catalog changed since the snapshot; returns True if it did."""
+        try:
+            connector = await self._get_connector(connection)
+            table_fingerprints = await connector.get_table_fingerprints()
+            if table_fingerprints is not None and catalog_fingerprint(table_fingerprints) == snapshot["fingerprint"]:
+                logger.info(f"Schema snapshot for '{connection.name}' is current")
+                # Fresh again for another TTL
+                self._cache_schema_tree(connection.id, snapshot["tree"], table_fingerprints)
+                return False
             
+            logger.info(f"Schema of '{connection.name}' changed since its snapshot, reloading")
+            if table_fingerprints is not None and snapshot["table_fingerprints"] is not None:
+                await self._patch_schema_tree(
+                    connection, connector, snapshot["tree"], snapshot["table_fingerprints"], table_fingerprints
+                )
+            else:
+                await self._load_schema_tree(connection)
+            return True
         except Exception as e:
-            logger.error(f"Failed to get schema tree for '{connection.name}': {str(e)}", exc_info=True)
-            return {"error": str(e), "success": False}
+            logger.warning(f"Failed to revalidate schema snapshot for '{connection.name}': {str(e)}")
+            return False
     
     async def get_table_info(self, connection: DatabaseConnection, schema: str, table: str) -> Dict[str, Any]:
         """Get detailed table information."""
@@ -119,22 +343,51 @@ class SchemaExplorer:
     def _build_sample_query(self, db_type: str, schema: str, table: str) -> str:
         """Build sample data query for different database types."""
         if db_type == "mongodb":
-            return "{}"  # Empty filter for MongoDB
+            return f"db.getCollection({json.dumps(table)}).find().limit(5)"
         elif db_type == "sqlite":
             return f"SELECT * FROM {table} LIMIT 5"
         else:
             return f"SELECT * FROM {schema}.{table} LIMIT 5"
     
-    async def refresh_schema(self, connection_id: str):
-        """Refresh cached schema for connection."""
+    async def refresh_schema(self, connection: DatabaseConnection) -> Dict[str, Any]:
+        """Refresh cached schema for connection.
+        
+        When the cached tree's table fingerprints are known, only tables whose
+        fingerprint changed, appeared or disappeared are re-read and patched
+        into the tree; otherwise every cache entry for the connection is dropped.
+        """
+        schema_tree = schema_cache.get(f"{connection.id}_schema")
+        old_fingerprints = schema_cache.get(f"{connection.id}_schema_fingerprints")
+        if schema_tree is None or old_fingerprints is None:
+            snapshot = await self._load_snapshot(connection)
+            if snapshot:
+                schema_tree, old_fingerprints = snapshot["tree"], snapshot["table_fingerprints"]
+        
+        if schema_tree is not None and old_fingerprints is not None:
+            try:
+                connector = await self._get_connector(connection)
+                new_fingerprints = await connector.get_table_fingerprints()
+                if new_fingerprints is not None:
+                    counts = await self._patch_schema_tree(
+                        connection, connector, schema_tree, old_fingerprints, new_fingerprints
+                    )
+                    logger.info(f"Refreshed schema of '{connection.name}' incrementally: {counts}")
+                    return {"incremental": True, **counts}
+            except Exception as e:
+                logger.warning(f"Incremental schema refresh failed for '{connection.name}': {str(e)}")
+        
         # Clear all cache entries for this connection
         keys_to_remove = []
         for key in schema_cache.get_keys():
-            if key.startswith(f"{connection_id}_"):
+            if key.startswith(f"{connection.id}_"):
                 keys_to_remove.append(key)
         
         for key in keys_to_remove:
             schema_cache.delete(key)
+        
+        # Otherwise the next load would serve the snapshot again
+        await snapshot_storage.delete(connection.id)
+        return {"incremental": False}
     
     def get_cached_schemas(self) -> List[str]:
         """Get list of cached schema keys."""
@@ -147,6 +400,12 @@ class SchemaExplorer:
         if cached:
             return cached
         
+        schema_tree = schema_cache.get(f"{connection.id}_schema")
+        if schema_tree:
+            schemas = sorted(schema_tree["schemas"])
+            schema_cache.set(cache_key, schemas, ttl=600)
+            return schemas
+        
         try:
             connector = await connection_manager.get_connector(connection.id)
             if not connector:
@@ -165,12 +424,19 @@ class SchemaExplorer:
             return []
     
     async def get_tables_cached(self, connection: DatabaseConnection, schema: str) -> List[str]:
-        """Get tables with caching."""
+        """Get tables with caching, sorted case-insensitively."""
         cache_key = f"{connection.id}_tables_{schema}"
         cached = schema_cache.get(cache_key)
         if cached:
             return cached
         
+        schema_tree = schema_cache.get(f"{connection.id}_schema")
+        if schema_tree and schema in schema_tree["schemas"]:
+            # Sorted once, so later pages only bisect
+            tables = sorted(schema_tree["schemas"][schema]["tables"], key=str.lower)
+            schema_cache.set(cache_key, tables, ttl=600)
+            return tables
+        
         try:
             connector = await connection_manager.get_connector(connection.id)
             if not connector:
@@ -181,7 +447,7 @@ class SchemaExplorer:
                 if not connector:
                     return []
             
-            tables = await connector.get_tables(schema)
+            tables = sorted(await connector.get_tables(schema), key=str.lower)
             schema_cache.set(cache_key, tables, ttl=600)  # 10 minutes
             return tables
         except Exception as e:
@@ -195,6 +461,11 @@ class SchemaExplorer:
         if cached:
             return cached
         
+        schema_tree = schema_cache.get(f"{connection.id}_schema")
+        table_node = schema_tree["schemas"].get(schema, {}).get("tables", {}).get(table) if schema_tree else None
+        if table_node:
+            return table_node["columns"]
+        
         try:
             connector = await connection_manager.get_connector(connection.id)
             if not connector:
@@ -210,4 +481,26 @@ class SchemaExplorer:
             return columns
         except Exception as e:
             logger.error(f"Failed to get columns for '{connection.name}.{schema}.{table}': {str(e)}")
-            return []
\ No newline at end of file
+            return []
+    
+    async def get_tables_page(
+        self,
+        connection: DatabaseConnection,
+        schema: str,
+        prefix: str = "",
+        limit: int = 200,
+        offset: int = 0
+    ) -> Dict[str, Any]:
+        """Get one page of a schema's tables whose names start with prefix (case-insensitive)."""
+        tables = await self.get_tables_cached(connection, schema)
+        # Names are sorted case-insensitively, so matches form one contiguous run
+        prefix = prefix.lower()
+        start = bisect_left(tables, prefix, key=str.lower)
+        end = bisect_left(tables, prefix + chr(0x10FFFF), key=str.lower) if prefix else len(tables)
+        page = tables[start + offset:min(start + offset + limit, end)]
+        return {
+            "tables": page,
+            "total": end - start,
+            "offset": offset,
+            "has_more": start + offset + len(page) < end
+        }
@@ -1,13 +1,19 @@
 """Session state management."""
 
+import asyncio
 import json
+import time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 
 from core.models import DatabaseConnection
 from core.storage import ConnectionStorage
+from operations.connection_manager import connection_manager
 from utils.logger import logger
 
+# Connections opened at once when restoring a session
+RESTORE_CONCURRENCY = 4
+
 
 class SessionManager:
     """Manages session state and settings."""
@@ -61,14 +67,44 @@ class SessionManager:
     async def get_restorable_connections(self) -> list[DatabaseConnection]:
         """Get connections that can be restored from session."""
         session = await self.load_session()
-        connections = []
-
-        for conn_id in session.get("active_connection_ids", []):
-            conn = await self.storage.get_connection(conn_id)
-            if conn:
-                connections.append(conn)
+        # Read saved connections once instead of once per ID
+        saved = {conn.id: conn for conn in await self.storage.get_all_connections()}
+
+        return [
+            saved[conn_id]
+            for conn_id in session.get("active_connection_ids", [])
+            if conn_id in saved
+        ]
+
+    async def restore_connections(
+        self, lazy: bool = False, max_concurrency: int = RESTORE_CONCURRENCY
+    ) -> List[Dict]:
+        """Reconnect saved connections concurrently, or register them to connect on first use."""
+        connections = await self.get_restorable_connections()
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def restore(conn: DatabaseConnection) -> Dict:
+            if lazy:
+                start = time.perf_counter()
+                connection_manager.register(conn)
+                success = True
+            else:
+                async with semaphore:
+                    start = time.perf_counter()
+                    success = await connection_manager.connect(conn)
+            return {
+                "connection_id": conn.id,
+                "name": conn.name,
+                "success": success,
+                "lazy": lazy,
+                "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+            }
 
-        return connections
+        results = await asyncio.gather(*(restore(conn) for conn in connections))
+        for result in results:
+            if not result["success"]:
+                logger.warning(f"Failed to restore connection '{result['name']}'")
+        return results
 
 
 session_manager = SessionManager()
@@ -3,7 +3,7 @@
 import time
 import unittest
 
-from utils.cache import SchemaCache as Cache
+from utils.cache import CacheStore, PreparedStatementCache, QueryCache, SchemaCache as Cache
 
 
 class TestCache(unittest.TestCase):
@@ -34,6 +34,24 @@ class TestCache(unittest.TestCase):
         time.sleep(1.1)
         self.assertIsNone(self.cache.get("key1"))
 
+    def test_stale_while_revalidate(self):
+        """Test entries with a stale TTL are served as stale past their TTL, then expire."""
+        self.cache.set("tree", "v1", ttl=0.05, stale_ttl=0.1)
+        self.cache.set("plain", "v1", ttl=0.05)
+        self.assertFalse(self.cache.is_stale("tree"))
+
+        time.sleep(0.07)
+        self.assertEqual(self.cache.get("tree"), "v1")
+        self.assertTrue(self.cache.is_stale("tree"))
+        self.assertIsNone(self.cache.get("plain"))
+        self.assertEqual(self.cache.get_stats()["stale_hits"], 1)
+
+        self.cache.set("tree", "v2", ttl=0.05, stale_ttl=0.1)
+        self.assertFalse(self.cache.is_stale("tree"))
+        time.sleep(0.17)
+        self.assertIsNone(self.cache.get("tree"))
+        self.assertFalse(self.cache.is_stale("tree"))
+
     def test_delete(self):
         """Test deleting cache entry."""
         self.cache.set("key1", "value1")
@@ -58,5 +76,146 @@ class TestCache(unittest.TestCase):
         self.assertIn("key2", keys)
 
 
+class TestCacheStore(unittest.TestCase):
+    """Test CacheStore class."""
+
+    def test_lru_eviction_by_bytes(self):
+        """Test the least recently used entries are evicted once the byte budget is exceeded."""
+        cache = CacheStore("test", max_bytes=250)
+        cache.set("a", "x", size=100)
+        cache.set("b", "x", size=100)
+        cache.get("a")
+        cache.set("c", "x", size=100)
+
+        self.assertEqual(cache.get_keys(), ["a", "c"])
+        self.assertEqual(cache.bytes, 200)
+        self.assertFalse(cache.set("huge", "x", size=300))
+        stats = cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"]), (1, 0, 1))
+
+    def test_expired_entries_are_purged(self):
+        """Test expired entries are purged from the expiry heap and counted."""
+        cache = CacheStore("test", max_entries=10)
+        cache.set("short", 1, ttl=0.01)
+        cache.set("long", 2, ttl=60)
+        cache.set("forever", 3)
+        time.sleep(0.02)
+
+        self.assertEqual(cache.cleanup_expired(), 1)
+        self.assertIsNone(cache.get("short"))
+        self.assertEqual(cache.get_keys(), ["long", "forever"])
+        self.assertEqual(cache.get_stats()["expirations"], 1)
+
+    def test_on_remove_called_for_evictions(self):
+        """Test on_remove sees every entry that leaves the cache."""
+        removed = []
+        cache = CacheStore("test", max_entries=1, on_remove=lambda key, value: removed.append(key))
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.delete("b")
+
+        self.assertEqual(removed, ["a", "b"])
+
+
+class TestQueryCache(unittest.TestCase):
+    """Test QueryCache class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.cache = QueryCache()
+        self.result = {"success": True, "rows": [[1]]}
+
+    def test_invalidate_by_referenced_table(self):
+        """Test a write to one table drops only the results that read it."""
+        base_tables = ["users", "orders", "products"]
+        self.cache.set_query_result(
+            "conn", 'SELECT * FROM users u JOIN "public"."Orders" o ON o.uid = u.id', self.result, base_tables=base_tables
+        )
+        self.cache.set_query_result("conn", "SELECT * FROM products", self.result, base_tables=base_tables)
+        self.cache.set_query_result("other", "SELECT * FROM orders", self.result, base_tables=base_tables)
+
+        self.assertEqual(self.cache.invalidate_query("conn", "UPDATE public.orders SET paid = 1 WHERE id = 2"), 1)
+        self.assertIsNone(self.cache.get_query_result("conn", 'SELECT * FROM users u JOIN "public"."Orders" o ON o.uid = u.id'))
+        self.assertIsNotNone(self.cache.get_query_result("conn", "SELECT * FROM products"))
+        self.assertIsNotNone(self.cache.get_query_result("other", "SELECT * FROM orders"))
+
+    def test_views_and_table_functions(self):
+        """Test results reading views are dropped by any write, and table functions are not cached."""
+        self.cache.set_query_result("conn", "SELECT * FROM v_orders", self.result, base_tables=["orders"])
+        self.cache.set_query_result("conn", "SELECT * FROM my_func(1) f", self.result, base_tables=["orders"])
+        self.assertIsNone(self.cache.get_query_result("conn", "SELECT * FROM my_func(1) f"))
+
+        self.assertEqual(self.cache.invalidate_query("conn", "DELETE FROM orders WHERE id = 1"), 1)
+        self.assertIsNone(self.cache.get_query_result("conn", "SELECT * FROM v_orders"))
+
+    def test_literal_whitespace_is_part_of_key(self):
+        """Test queries differing only in whitespace inside a literal do not share results."""
+        self.cache.set_query_result("conn", "SELECT * FROM t WHERE name = 'a  b'", self.result)
+
+        self.assertIsNone(self.cache.get_query_result("conn", "SELECT * FROM t WHERE name = 'a b'"))
+        self.assertIsNotNone(self.cache.get_query_result("conn", "  SELECT * FROM t WHERE name = 'a  b'\n"))
+
+    def test_table_less_reads_not_cached(self):
+        """Test results no write would invalidate are not cached."""
+        for query in ("SELECT now()", "SELECT nextval('s')", "SELECT CURRENT_TIMESTAMP FROM t"):
+            self.cache.set_query_result("conn", query, self.result)
+            self.assertIsNone(self.cache.get_query_result("conn", query), query)
+
+    def test_invalidate_connection(self):
+        """Test statements without known tables invalidate the whole connection."""
+        self.cache.set_query_result("conn", "SELECT * FROM a", self.result)
+        self.cache.set_query_result("conn", "SELECT * FROM b", self.result, params={"limit": 10})
+
+        self.assertEqual(self.cache.invalidate_query("conn", "CALL refresh_all()"), 2)
+        self.assertEqual(self.cache.get_stats()["entries"], 0)
+        self.assertEqual(self.cache.table_keys, {})
+
+
+class TestPreparedStatementCache(unittest.TestCase):
+    """Test PreparedStatementCache class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.cache = PreparedStatementCache(max_per_connection=2)
+
+    def test_hit_and_miss(self):
+        """Test lookups are counted and keyed by trimmed query text."""
+        self.assertIsNone(self.cache.get("conn", 1, "SELECT 1"))
+        self.cache.put("conn", 1, "SELECT 1", "stmt")
+        self.assertEqual(self.cache.get("conn", 1, "  SELECT 1; "), "stmt")
+        self.assertIsNone(self.cache.get("conn", 2, "SELECT 1"))
+
+        stats = self.cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+
+    def test_lru_eviction(self):
+        """Test the least recently used statement of a session is evicted."""
+        self.cache.put("conn", 1, "SELECT 1", "s1")
+        self.cache.put("conn", 1, "SELECT 2", "s2")
+        self.cache.get("conn", 1, "SELECT 1")
+        evicted = self.cache.put("conn", 1, "SELECT 3", "s3")
+
+        self.assertEqual(evicted, ["s2"])
+        self.assertEqual(self.cache.get("conn", 1, "SELECT 1"), "s1")
+        self.assertEqual(self.cache.get_stats()["evictions"], 1)
+
+    def test_clear_connection(self):
+        """Test clearing statements for one connection."""
+        self.cache.put("conn", 1, "SELECT 1", "s1")
+        self.cache.put("conn", 2, "SELECT 1", "s1")
+        self.cache.put("other", 1, "SELECT 1", "s1")
+
+        self.assertEqual(self.cache.clear_connection("conn"), 2)
+        self.assertEqual(self.cache.get_stats()["total_statements"], 1)
+
+    def test_statement_classification(self):
+        """Test which statements are prepared and which invalidate the cache."""
+        self.assertTrue(self.cache.is_preparable("select * from t"))
+        self.assertFalse(self.cache.is_preparable("SELECT 1; SELECT 2"))
+        self.assertFalse(self.cache.is_preparable("CREATE TABLE t (id INT)"))
+        self.assertTrue(self.cache.is_schema_change("alter table t add c int"))
+        self.assertFalse(self.cache.is_schema_change("SELECT 1"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -3,10 +3,22 @@
 import asyncio
 import unittest
 
-from core.models import DatabaseConnection, DatabaseType
+from core.models import AppSettings, DatabaseConnection, DatabaseType
 from operations.connection_manager import ConnectionManager
 
 
+class StaticSettingsStorage:
+    """Settings storage returning fixed settings."""
+
+    def __init__(self, **overrides):
+        """Initialize with setting overrides."""
+        self.settings = AppSettings(**overrides)
+
+    async def get_settings(self) -> AppSettings:
+        """Get the fixed settings."""
+        return self.settings
+
+
 class TestConnectionManager(unittest.TestCase):
     """Test ConnectionManager class."""
 
@@ -45,6 +57,118 @@ class TestConnectionManager(unittest.TestCase):
         conn = asyncio.run(self.manager.get_connection("non-existent"))
         self.assertIsNone(conn)
 
+    def test_get_pool_stats_none(self):
+        """Test get_pool_stats returns None for non-existent connection."""
+        stats = asyncio.run(self.manager.get_pool_stats("non-existent"))
+        self.assertIsNone(stats)
+
+    def test_unpooled_connector_pool_stats(self):
+        """Test single-connection connectors report a fixed pool of one."""
+
+        async def connect_and_get_stats():
+            await self.manager.connect(self.test_connection)
+            try:
+                return await self.manager.get_pool_stats(self.test_connection.id)
+            finally:
+                await self.manager.disconnect(self.test_connection.id)
+
+        stats = asyncio.run(connect_and_get_stats())
+        self.assertFalse(stats["pooled"])
+        self.assertEqual(stats["size"], 1)
+
+    def test_check_health_records_latency(self):
+        """Test a successful ping is recorded with its latency."""
+
+        async def connect_and_check():
+            await self.manager.connect(self.test_connection)
+            try:
+                return await self.manager.check_health(self.test_connection.id)
+            finally:
+                await self.manager.disconnect(self.test_connection.id)
+
+        health = asyncio.run(connect_and_check())
+        self.assertTrue(health["healthy"])
+        self.assertEqual(len(health["history"]), 1)
+        self.assertIsNotNone(health["latency_ms"]["last"])
+
+    def test_failed_ping_reconnects(self):
+        """Test a dead connection is detected and replaced."""
+
+        async def break_and_check():
+            await self.manager.connect(self.test_connection)
+            try:
+                dead = await self.manager.get_connector(self.test_connection.id)
+                await dead.connection.close()
+                health = await self.manager.check_health(self.test_connection.id)
+                current = await self.manager.get_connector(self.test_connection.id)
+                return dead, current, current.is_connected, health
+            finally:
+                await self.manager.disconnect(self.test_connection.id)
+
+        dead, current, connected, health = asyncio.run(break_and_check())
+        self.assertIsNot(dead, current)
+        self.assertTrue(connected)
+        self.assertEqual([entry["ok"] for entry in health["history"]], [False, True])
+
+    def test_saturated_pool_is_not_pinged(self):
+        """Test a pool busy with queries is neither marked down nor reconnected."""
+
+        async def saturate_and_check():
+            await self.manager.connect(self.test_connection)
+            try:
+                connector = await self.manager.get_connector(self.test_connection.id)
+                connector.get_pool_stats = lambda: {"pooled": True, "max_size": 2}
+                connector.active_operations = 2
+                health = await self.manager.check_health(self.test_connection.id)
+                current = await self.manager.get_connector(self.test_connection.id)
+                connector.active_operations = 0
+                return connector, current, health
+            finally:
+                await self.manager.disconnect(self.test_connection.id)
+
+        connector, current, health = asyncio.run(saturate_and_check())
+        self.assertIs(connector, current)
+        self.assertTrue(health["healthy"])
+        self.assertEqual(health["history"], [])
+
+    def test_lru_eviction_and_lazy_reconnect(self):
+        """Test the least recently used connector is closed and reopened on demand."""
+        self.manager._settings_storage = StaticSettingsStorage(max_active_connections=1)
+        other = self.test_connection.model_copy(update={"id": "test-456"})
+
+        async def run():
+            await self.manager.connect(self.test_connection)
+            first = await self.manager.get_connector(self.test_connection.id)
+            await self.manager.connect(other)
+            active_after_limit = await self.manager.get_all_active_connections()
+            reopened = await self.manager.get_connector(self.test_connection.id)
+            active_after_reopen = await self.manager.get_all_active_connections()
+            await self.manager.disconnect_all()
+            return first, reopened, active_after_limit, active_after_reopen
+
+        first, reopened, after_limit, after_reopen = asyncio.run(run())
+        self.assertEqual(after_limit, ["test-456"])
+        self.assertFalse(first.is_connected)
+        self.assertIsNot(first, reopened)
+        self.assertEqual(after_reopen, [self.test_connection.id])
+
+    def test_reap_idle_connections(self):
+        """Test idle connectors are closed but stay registered."""
+        self.manager._settings_storage = StaticSettingsStorage(idle_connection_timeout=60)
+
+        async def run():
+            await self.manager.connect(self.test_connection)
+            self.manager._last_used[self.test_connection.id] = 0
+            reaped = await self.manager.reap_idle_connections()
+            status = await self.manager.get_connection_status(self.test_connection.id)
+            await self.manager.disconnect(self.test_connection.id)
+            return reaped, status
+
+        reaped, status = asyncio.run(run())
+        self.assertEqual(reaped, 1)
+        self.assertTrue(status["suspended"])
+        self.assertEqual(asyncio.run(self.manager.get_registered_connections()), [])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,81 @@
+"""Unit tests for data editor."""
+
+import asyncio
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from core.models import DatabaseConnection, DatabaseType
+from operations.connection_manager import connection_manager
+from operations.data_editor import DataEditor
+
+
+class TestDataEditor(unittest.TestCase):
+    """Test DataEditor class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = TemporaryDirectory()
+        self.editor = DataEditor()
+        self.connection = DatabaseConnection(
+            id="editor-test",
+            name="Editor SQLite",
+            db_type=DatabaseType.SQLITE,
+            database=str(Path(self.temp_dir.name) / "edit.db"),
+        )
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        asyncio.run(connection_manager.disconnect(self.connection.id))
+        self.temp_dir.cleanup()
+
+    async def _run_batch(self, operations):
+        """Create the items table, apply a batch and return the result and rows."""
+        connector = await self.editor._get_connector(self.connection)
+        await connector.execute_query("CREATE TABLE IF NOT EXISTS items (id INTEGER PRIMARY KEY, name TEXT)")
+        await connector.execute_query("INSERT INTO items (id, name) VALUES (1, 'one')")
+        result = await self.editor.apply_batch(self.connection, "items", "main", operations)
+        rows = await connector.execute_query("SELECT id, name FROM items ORDER BY id")
+        return result, rows["data"]
+
+    def test_edits_reuse_managed_connector(self):
+        """Test single-row edits go through the connection manager."""
+
+        async def run():
+            await self._run_batch([{"action": "insert", "data": {"id": 2, "name": "two"}}])
+            first = await connection_manager.get_connector(self.connection.id)
+            await self.editor.update_row(self.connection, "items", "main", {"id": 2}, {"name": "2"})
+            return first, await connection_manager.get_connector(self.connection.id)
+
+        first, second = asyncio.run(run())
+        self.assertIs(first, second)
+
+    def test_apply_batch_groups_statements(self):
+        """Test consecutive operations of the same shape share one statement."""
+        operations = [
+            {"action": "insert", "data": {"id": i, "name": f"item {i}"}} for i in range(2, 6)
+        ] + [
+            {"action": "update", "primary_key": {"id": 1}, "changes": {"name": "first"}},
+            {"action": "delete", "primary_key": {"id": 5}},
+        ]
+
+        result, rows = asyncio.run(self._run_batch(operations))
+        self.assertTrue(result["success"])
+        self.assertEqual(result["applied"], 6)
+        self.assertEqual(result["statements"], 3)
+        self.assertEqual(rows, [[1, "first"], [2, "item 2"], [3, "item 3"], [4, "item 4"]])
+
+    def test_apply_batch_rolls_back_on_error(self):
+        """Test a failing operation leaves the table unchanged."""
+        operations = [
+            {"action": "insert", "data": {"id": 2, "name": "two"}},
+            {"action": "insert", "data": {"id": 1, "name": "duplicate"}},
+        ]
+
+        result, rows = asyncio.run(self._run_batch(operations))
+        self.assertFalse(result["success"])
+        self.assertEqual(rows, [[1, "one"]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""Unit tests for data explorer."""
+
+import asyncio
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from core.models import DatabaseConnection, DatabaseType
+from operations.connection_manager import connection_manager
+from operations.data_explorer import DataExplorer
+from operations.row_counter import row_counter
+
+
+class TestDataExplorer(unittest.TestCase):
+    """Test DataExplorer class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = TemporaryDirectory()
+        self.explorer = DataExplorer()
+        self.connection = DatabaseConnection(
+            id="explorer-test",
+            name="Explorer SQLite",
+            db_type=DatabaseType.SQLITE,
+            database=str(Path(self.temp_dir.name) / "browse.db"),
+        )
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        asyncio.run(connection_manager.disconnect(self.connection.id))
+        self.temp_dir.cleanup()
+
+    async def _browse_all(self, **options):
+        """Create a table and page through it with keyset pagination."""
+        await connection_manager.connect(self.connection)
+        connector = await connection_manager.get_connector(self.connection.id)
+        await connector.execute_query("CREATE TABLE items (id INTEGER PRIMARY KEY, grp INTEGER, label TEXT NOT NULL)")
+        await connector.execute_many(
+            "INSERT INTO items (id, grp, label) VALUES (?, ?, ?)",
+            [[i, None if i % 7 == 0 else i % 3, f"item {i % 5}"] for i in range(1, 26)]
+        )
+        pages = []
+        cursor = None
+        while True:
+            result = await self.explorer.browse_data(
+                self.connection, "main", "items", limit=4, pagination="keyset", cursor=cursor, **options
+            )
+            pages.append(result)
+            cursor = result["next_cursor"]
+            if not cursor:
+                return pages
+
+    def test_keyset_pages_by_primary_key(self):
+        """Test keyset pages cover every row once in key order."""
+        pages = asyncio.run(self._browse_all())
+        ids = [row[0] for page in pages for row in page["rows"]]
+        self.assertEqual(ids, list(range(1, 26)))
+        self.assertTrue(all(page["pagination"] == "keyset" for page in pages))
+        self.assertFalse(pages[-1]["has_more"])
+
+    def test_keyset_with_sort_column_and_nulls(self):
+        """Test sorting by a nullable column uses the key as tiebreaker without skipping rows."""
+        pages = asyncio.run(self._browse_all(sort_column="grp", sort_order="DESC"))
+        ids = [row[0] for page in pages for row in page["rows"]]
+        self.assertEqual(sorted(ids), list(range(1, 26)))
+        grps = [row[1] for page in pages for row in page["rows"]]
+        self.assertEqual(grps[:7], [2] * 7)
+        self.assertEqual(grps[-3:], [None] * 3)
+
+    def test_keyset_nulls_follow_values_ascending(self):
+        """Test an ascending nullable sort continues from the last value into the NULL rows."""
+        pages = asyncio.run(self._browse_all(sort_column="grp"))
+        grps = [row[1] for page in pages for row in page["rows"]]
+        self.assertEqual(len(grps), 25)
+        self.assertEqual(grps, sorted(grps[:-3]) + [None] * 3)
+
+    def test_keyset_with_not_null_sort_column(self):
+        """Test a NOT NULL sort column pages by plain row comparison."""
+        pages = asyncio.run(self._browse_all(sort_column="label"))
+        rows = [row for page in pages for row in page["rows"]]
+        self.assertEqual(sorted(row[0] for row in rows), list(range(1, 26)))
+        self.assertEqual(rows, sorted(rows, key=lambda row: (row[2], row[0])))
+
+    def test_get_cell_data_quotes_identifiers(self):
+        """Test a cell is read with the connector's identifier quoting."""
+
+        async def run():
+            await self._browse_all()
+            return await self.explorer.get_cell_data(self.connection, "main", "items", "label", {"id": 6})
+
+        self.assertEqual(asyncio.run(run()), {"success": True, "data": "item 1"})
+
+    def test_invalid_cursor(self):
+        """Test a malformed cursor is reported as an error."""
+
+        async def run():
+            await connection_manager.connect(self.connection)
+            return await self.explorer.browse_data(
+                self.connection, "main", "items", pagination="keyset", cursor="not-a-cursor"
+            )
+
+        result = asyncio.run(run())
+        self.assertFalse(result["success"])
+        self.assertEqual(result["error"], "Invalid cursor")
+
+    async def _count_rows(self):
+        """Create a table with a deleted row, then count it estimated and exactly."""
+        await connection_manager.connect(self.connection)
+        connector = await connection_manager.get_connector(self.connection.id)
+        await connector.execute_query("CREATE TABLE counted (id INTEGER PRIMARY KEY)")
+        await connector.execute_many("INSERT INTO counted (id) VALUES (?)", [[i] for i in range(1, 11)])
+        await connector.execute_query("DELETE FROM counted WHERE id = 3")
+        estimate = await self.explorer.get_row_count(self.connection, "main", "counted", exact=True)
+        await asyncio.gather(*row_counter._jobs.values())
+        exact = await self.explorer.get_row_count(self.connection, "main", "counted")
+        return estimate, exact
+
+    def test_row_count_without_estimate_does_not_scan(self):
+        """Test a table with no estimate reports no count instead of starting a full count."""
+
+        async def run():
+            await connection_manager.connect(self.connection)
+            connector = await connection_manager.get_connector(self.connection.id)
+            await connector.execute_query("CREATE TABLE keyed (k TEXT PRIMARY KEY) WITHOUT ROWID")
+            return await self.explorer.get_row_count(self.connection, "main", "keyed")
+
+        result = asyncio.run(run())
+        self.assertEqual((result["count"], result["counting"], result["query_id"]), (None, False, None))
+        self.assertEqual(row_counter._jobs, {})
+
+    def test_row_count_is_estimated_then_exact(self):
+        """Test the estimate returns at once and the background exact count replaces it."""
+        estimate, exact = asyncio.run(self._count_rows())
+        self.assertEqual((estimate["count"], estimate["estimated"], estimate["counting"]), (10, True, True))
+        self.assertIsNotNone(estimate["query_id"])
+        self.assertEqual((exact["count"], exact["estimated"], exact["counting"]), (9, False, False))
+
+
+if __name__ == "__main__":
+    unittest.main()
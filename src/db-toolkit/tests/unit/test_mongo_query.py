@@ -0,0 +1,145 @@
+"""Unit tests for MongoDB query parsing."""
+
+import asyncio
+import unittest
+from datetime import datetime
+
+from bson.decimal128 import Decimal128
+from bson.int64 import Int64
+from bson.objectid import ObjectId
+
+from connectors.mongodb import MongoDBConnector
+from utils.mongo_query import apply_cursor_defaults, infer_fields, parse_mongo_query, to_json_value
+
+
+class TestParseMongoQuery(unittest.TestCase):
+    """Test parse_mongo_query and apply_cursor_defaults."""
+
+    def test_find_with_shell_syntax_and_cursor_methods(self):
+        """Test bare keys, single quotes and chained cursor methods."""
+        parsed = parse_mongo_query(
+            "db.users.find({age: {$gt: 30}, name: 'bob'}, {name: 1, _id: 0}).sort({age: -1}).skip(5).limit(10);"
+        )
+        self.assertEqual(parsed["collection"], "users")
+        self.assertEqual(parsed["operation"], "find")
+        self.assertEqual(parsed["filter"], {"age": {"$gt": 30}, "name": "bob"})
+        self.assertEqual(parsed["projection"], {"name": 1, "_id": 0})
+        self.assertEqual(parsed["sort"], {"age": -1})
+        self.assertEqual((parsed["skip"], parsed["limit"]), (5, 10))
+
+    def test_aggregate_with_constructors(self):
+        """Test aggregate pipelines, getCollection and shell constructors."""
+        parsed = parse_mongo_query(
+            'db.getCollection("audit.log").aggregate(['
+            '{$match: {_id: ObjectId("5f1d7f1b2c3a4b5c6d7e8f90"), at: ISODate("2024-01-01")}}'
+            '], {maxTimeMS: 500})'
+        )
+        self.assertEqual(parsed["collection"], "audit.log")
+        self.assertEqual(parsed["operation"], "aggregate")
+        match = parsed["pipeline"][0]["$match"]
+        self.assertEqual(match["_id"], ObjectId("5f1d7f1b2c3a4b5c6d7e8f90"))
+        self.assertEqual(match["at"].replace(tzinfo=None), datetime(2024, 1, 1))
+        self.assertEqual(parsed["max_time_ms"], 500)
+
+    def test_rejects_unsupported_queries(self):
+        """Test queries without a collection or with write operations are rejected."""
+        for query in ("{}", "db.users", "db.users.deleteMany({})", "db.users.find().limit(-1)"):
+            with self.assertRaises(ValueError):
+                parse_mongo_query(query)
+
+    def test_apply_cursor_defaults_keeps_explicit_options(self):
+        """Test defaults are appended only where the query does not set them."""
+        self.assertEqual(
+            apply_cursor_defaults("db.t.find({})", limit=100, skip=20, max_time_ms=30000),
+            "db.t.find({}).skip(20).limit(100).maxTimeMS(30000)",
+        )
+        self.assertEqual(
+            apply_cursor_defaults("db.t.find().limit(5);", limit=100, skip=0),
+            "db.t.find().limit(5)",
+        )
+
+    def test_apply_cursor_defaults_skips_output_pipelines(self):
+        """Test pipelines ending in $out or $merge get no default skip or limit."""
+        self.assertEqual(
+            apply_cursor_defaults('db.t.aggregate([{"$match": {}}, {"$out": "copy"}])', limit=100, skip=20, max_time_ms=1000),
+            'db.t.aggregate([{"$match": {}}, {"$out": "copy"}]).maxTimeMS(1000)',
+        )
+
+    def test_to_json_value_preserves_types(self):
+        """Test numbers, booleans and nesting survive while BSON types become strings."""
+        oid = ObjectId("5f1d7f1b2c3a4b5c6d7e8f90")
+        value = to_json_value({
+            "_id": oid,
+            "n": 3,
+            "ok": True,
+            "price": Decimal128("1.10"),
+            "at": datetime(2024, 1, 1, 12, 30),
+            "tags": [{"x": 1.5}],
+        })
+        self.assertEqual(value, {
+            "_id": str(oid),
+            "n": 3,
+            "ok": True,
+            "price": "1.10",
+            "at": "2024-01-01T12:30:00",
+            "tags": [{"x": 1.5}],
+        })
+
+
+class TestInferFields(unittest.TestCase):
+    """Test infer_fields."""
+
+    def test_merges_sparse_and_nested_fields(self):
+        """Test fields missing from some documents and nested paths are all reported."""
+        columns = {
+            column["column_name"]: column
+            for column in infer_fields([
+                {"_id": 1, "address": {"city": "Oslo"}, "tags": [{"name": "a"}]},
+                {"_id": 2, "address": None, "score": Int64(7)},
+                {"_id": 3, "address": {"city": "Rome", "zip": 101}, "score": 2.5},
+                {"_id": 4, "score": Int64(9)},
+            ])
+        }
+        self.assertEqual(list(columns), ["_id", "address", "address.city", "tags", "tags.name", "score", "address.zip"])
+        self.assertEqual(columns["_id"]["is_nullable"], "NO")
+        self.assertEqual(columns["address"]["data_type"], "object")
+        self.assertEqual(columns["address"]["types"], {"object": 2, "null": 1})
+        self.assertEqual(columns["address.city"]["frequency"], 0.5)
+        self.assertEqual(columns["score"]["data_type"], "long")
+        self.assertEqual(columns["score"]["types"], {"long": 2, "double": 1})
+        self.assertEqual(columns["tags.name"]["data_type"], "string")
+
+
+class TestStreamColumns(unittest.TestCase):
+    """Test MongoDB stream columns stay fixed across batches."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.connector = MongoDBConnector()
+        self.connector.database_name = "app"
+
+        async def get_columns(table, schema=None):
+            return [{"column_name": name} for name in ("_id", "name", "tags", "tags.label", "email")]
+
+        self.connector.get_columns = get_columns
+
+    def test_sampled_columns_follow_projection(self):
+        """Test sampled top-level fields are filtered by the projection."""
+        sampled = self.connector._sampled_columns
+        self.assertEqual(asyncio.run(sampled("db.users.find({})")), ["_id", "name", "tags", "email"])
+        self.assertEqual(asyncio.run(sampled("db.users.find({}, {name: 1})")), ["_id", "name"])
+        self.assertEqual(asyncio.run(sampled("db.users.find({}, {email: 0, _id: 0})")), ["name", "tags"])
+        self.assertEqual(asyncio.run(sampled("db.users.aggregate([])")), [])
+
+    def test_later_batches_keep_columns(self):
+        """Test rows after the first batch are padded to, and cut at, its columns."""
+        columns = ["_id"]
+        MongoDBConnector._to_rows([{"_id": 1, "name": "a"}], columns)
+        rows = MongoDBConnector._to_rows([{"_id": 2, "extra": True}], columns, grow=False)
+
+        self.assertEqual(columns, ["_id", "name"])
+        self.assertEqual(rows, [[2, None]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+"""Unit tests for MySQL connector prepared statements."""
+
+import asyncio
+import unittest
+
+import aiomysql
+
+from connectors.mysql import ER_UNKNOWN_STMT_HANDLER, MySQLConnector
+from utils.cache import prepared_cache
+
+
+class _Cursor:
+    """Cursor stand-in whose server forgot every statement prepared before a restart."""
+
+    def __init__(self):
+        """Initialize cursor."""
+        self.prepared = set()
+        self.executed = []
+
+    async def execute(self, query, args=None):
+        """Run PREPARE and EXECUTE against the known statement names."""
+        self.executed.append(query)
+        name = query.split()[1]
+        if query.startswith("PREPARE"):
+            self.prepared.add(name)
+        elif query.startswith("EXECUTE") and name not in self.prepared:
+            raise aiomysql.OperationalError(ER_UNKNOWN_STMT_HANDLER, f"Unknown prepared statement handler ({name})")
+
+    async def __aenter__(self):
+        """Enter cursor context."""
+        return self
+
+    async def __aexit__(self, *exc):
+        """Exit cursor context."""
+        return False
+
+
+class _Connection:
+    """Connection stand-in handing out one cursor."""
+
+    def __init__(self, cursor):
+        """Initialize connection."""
+        self._cursor = cursor
+
+    def cursor(self):
+        """Get the cursor."""
+        return self._cursor
+
+
+class TestMySQLPreparedStatements(unittest.TestCase):
+    """Test MySQLConnector prepared statement handling."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.connector = MySQLConnector()
+        self.connector.connection_id = "mysql-test"
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        prepared_cache.clear_connection("mysql-test")
+
+    def test_lost_statement_is_reprepared(self):
+        """Test EXECUTE of a statement the server dropped clears the session and prepares it again."""
+        cursor = _Cursor()
+        conn = _Connection(cursor)
+        prepared_cache.put("mysql-test", conn, "SELECT 1", "dbtk_stale")
+        prepared_cache.put("mysql-test", conn, "SELECT 2", "dbtk_other")
+
+        asyncio.run(self.connector._execute_prepared(conn, cursor, "SELECT 1", None))
+
+        self.assertEqual(cursor.executed[0], "EXECUTE dbtk_stale")
+        self.assertTrue(cursor.executed[-1].startswith("EXECUTE dbtk_"))
+        self.assertNotEqual(cursor.executed[-1], "EXECUTE dbtk_stale")
+        self.assertIsNone(prepared_cache.get("mysql-test", conn, "SELECT 2"))
+
+
+if __name__ == "__main__":
+    unittest.main()
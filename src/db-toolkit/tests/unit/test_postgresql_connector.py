@@ -0,0 +1,97 @@
+"""Unit tests for PostgreSQL connector session handling."""
+
+import asyncio
+import unittest
+
+import asyncpg
+
+from connectors.postgresql import PostgreSQLConnector
+from utils.cache import prepared_cache
+
+
+class _Statement:
+    """Prepared statement stand-in that fails once its connection is gone."""
+
+    def __init__(self, conn):
+        """Initialize statement."""
+        self.conn = conn
+
+    def get_parameters(self):
+        """Get parameter types."""
+        return ()
+
+    async def fetch(self, *args):
+        """Fetch rows, or fail like asyncpg on a closed connection."""
+        if self.conn.closed:
+            raise asyncpg.exceptions.InterfaceError("connection is closed")
+        return [("row",)]
+
+
+class _Connection:
+    """Driver connection stand-in with a server PID."""
+
+    def __init__(self, pid):
+        """Initialize connection."""
+        self.pid = pid
+        self.closed = False
+
+    def get_server_pid(self):
+        """Get the backend PID."""
+        return self.pid
+
+    async def prepare(self, query):
+        """Prepare a statement."""
+        return _Statement(self)
+
+
+class _PoolProxy:
+    """Pool proxy stand-in wrapping a driver connection."""
+
+    def __init__(self, con):
+        """Initialize proxy."""
+        self._con = con
+
+    def get_server_pid(self):
+        """Get the backend PID."""
+        return self._con.get_server_pid()
+
+    async def prepare(self, query):
+        """Prepare a statement on the wrapped connection."""
+        return await self._con.prepare(query)
+
+
+class TestPostgreSQLSessions(unittest.TestCase):
+    """Test prepared statement sessions of PostgreSQLConnector."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.connector = PostgreSQLConnector()
+        self.connector.connection_id = "pg-test"
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        prepared_cache.clear_connection("pg-test")
+
+    def test_reused_pid_is_a_new_session(self):
+        """Test a new connection with a closed one's PID gets its own statements."""
+        old, new = _Connection(42), _Connection(42)
+
+        self.assertIs(self.connector._session_key(_PoolProxy(old)), old)
+        self.assertIsNot(self.connector._session_key(_PoolProxy(new)), old)
+        self.assertEqual(self.connector._backend_id(_PoolProxy(new)), 42)
+
+    def test_closed_connection_statement_is_reprepared(self):
+        """Test a statement bound to a closed connection is dropped and prepared again."""
+        conn = _Connection(42)
+        proxy = _PoolProxy(conn)
+        prepared_cache.put("pg-test", conn, "SELECT 1", _Statement(_Connection(42)))
+        prepared_cache.get("pg-test", conn, "SELECT 1").conn.closed = True
+
+        rows = asyncio.run(self.connector._fetch_prepared(proxy, "SELECT 1", ()))
+
+        self.assertEqual(rows, [("row",)])
+        self.assertIs(prepared_cache.get("pg-test", conn, "SELECT 1").conn, conn)
+
+
+if __name__ == "__main__":
+    unittest.main()
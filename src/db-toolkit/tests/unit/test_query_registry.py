@@ -0,0 +1,100 @@
+"""Unit tests for the in-flight query registry."""
+
+import asyncio
+import time
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from connectors.sqlite import SQLiteConnector
+from core.models import DatabaseConnection, DatabaseType
+from operations.query_registry import QueryRegistry
+
+ENDLESS_QUERY = "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) SELECT COUNT(*) FROM c"
+
+
+class TestQueryRegistry(unittest.TestCase):
+    """Test QueryRegistry class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = TemporaryDirectory()
+        self.registry = QueryRegistry()
+        self.config = DatabaseConnection(
+            id="registry-test",
+            name="Registry SQLite",
+            db_type=DatabaseType.SQLITE,
+            database=str(Path(self.temp_dir.name) / "registry.db"),
+        )
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+
+    async def _connect(self) -> SQLiteConnector:
+        """Connect a SQLite connector."""
+        connector = SQLiteConnector()
+        await connector.connect(self.config)
+        return connector
+
+    def test_timeout_interrupts_query(self):
+        """Test a timed out query is interrupted on the database and unregistered."""
+
+        async def run():
+            connector = await self._connect()
+            try:
+                started = time.time()
+                with self.assertRaises(asyncio.TimeoutError):
+                    await self.registry.run(
+                        self.config.id, connector, ENDLESS_QUERY,
+                        connector.execute_query(ENDLESS_QUERY), timeout=0.2
+                    )
+                return time.time() - started, self.registry.list_queries(), connector.active_operations
+            finally:
+                await connector.disconnect()
+
+        elapsed, running, active = asyncio.run(run())
+        self.assertLess(elapsed, 2)
+        self.assertEqual(running, [])
+        self.assertEqual(active, 0)
+
+    def test_cancel_running_query(self):
+        """Test a listed query can be cancelled by id."""
+
+        async def run():
+            connector = await self._connect()
+            try:
+                task = asyncio.create_task(self.registry.run(
+                    self.config.id, connector, ENDLESS_QUERY,
+                    connector.execute_query(ENDLESS_QUERY), query_id="q1"
+                ))
+                await asyncio.sleep(0.1)
+                listed = self.registry.list_queries(self.config.id)
+                cancelled = await self.registry.cancel("q1")
+                return listed, cancelled, await task
+            finally:
+                await connector.disconnect()
+
+        listed, cancelled, result = asyncio.run(run())
+        self.assertEqual([q["query_id"] for q in listed], ["q1"])
+        self.assertIsNotNone(listed[0]["backend_id"])
+        self.assertTrue(cancelled)
+        self.assertFalse(result["success"])
+        self.assertIn("interrupt", result["error"])
+
+    def test_cancel_targets_only_the_held_session(self):
+        """Test a cancel is dropped once the query no longer holds its session."""
+
+        async def run():
+            session = object()
+            entry = {"session": session, "backend_id": 7, "task": asyncio.ensure_future(asyncio.sleep(0))}
+            checks = [SQLiteConnector._still_running_on(entry, session, 7)]
+            await entry["task"]
+            checks.append(SQLiteConnector._still_running_on(entry, session, 7))
+            checks.append(SQLiteConnector._still_running_on(dict(entry, session=None, task=None), session, 7))
+            return checks
+
+        self.assertEqual(asyncio.run(run()), [True, False, False])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+"""Unit tests for the query streaming WebSocket."""
+
+import asyncio
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.models import DatabaseConnection, DatabaseType
+from operations.connection_manager import connection_manager
+from ws.query import MAX_CREDITS, _credit_count, _CreditWindow, websocket_query
+
+
+class TestQueryWebSocket(unittest.TestCase):
+    """Test websocket_query."""
+
+    def setUp(self):
+        """Set up an app with the endpoint and a populated SQLite connection."""
+        self.temp_dir = TemporaryDirectory()
+        self.connection = DatabaseConnection(
+            id="ws-query-test",
+            name="Stream SQLite",
+            db_type=DatabaseType.SQLITE,
+            database=str(Path(self.temp_dir.name) / "stream.db"),
+        )
+        app = FastAPI()
+        app.websocket("/ws/query")(websocket_query)
+        self.client = TestClient(app)
+        self.client.__enter__()
+        portal = self.client.portal
+        portal.call(connection_manager.connect, self.connection)
+        self.connector = portal.call(connection_manager.get_connector, self.connection.id)
+        portal.call(self.connector.execute_query, "CREATE TABLE items (id INTEGER PRIMARY KEY)")
+        portal.call(self.connector.execute_many, "INSERT INTO items (id) VALUES (?)", [[i] for i in range(1000)])
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.client.portal.call(connection_manager.disconnect, self.connection.id)
+        self.client.__exit__(None, None, None)
+        self.temp_dir.cleanup()
+
+    def test_streams_batches_as_credits_arrive(self):
+        """Test a small first batch, one batch per credit and a completion message."""
+        with self.client.websocket_connect("/ws/query") as websocket:
+            websocket.send_json({
+                "connection_id": self.connection.id,
+                "query": "SELECT id FROM items ORDER BY id",
+                "batch_size": 300,
+                "first_batch_size": 20,
+                "credits": 1,
+            })
+            first = websocket.receive_json()
+            websocket.send_json({"type": "credit", "credits": 10})
+            messages = [websocket.receive_json() for _ in range(5)]
+
+        self.assertEqual(first["columns"], ["id"])
+        self.assertEqual(len(first["rows"]), 20)
+        self.assertEqual([len(m["rows"]) for m in messages[:4]], [300, 300, 300, 80])
+        self.assertEqual(messages[4]["type"], "complete")
+        self.assertEqual(messages[4]["total_rows"], 1000)
+
+    def test_cancel_releases_connection(self):
+        """Test cancelling stops the stream and releases the reader."""
+        with self.client.websocket_connect("/ws/query") as websocket:
+            websocket.send_json({
+                "connection_id": self.connection.id,
+                "query": "SELECT id FROM items",
+                "credits": 1,
+                "format": "columnar",
+            })
+            first = websocket.receive_json()
+            websocket.send_json({"type": "cancel"})
+            cancelled = websocket.receive_json()
+
+        self.assertEqual(first["column_types"], ["integer"])
+        self.assertEqual(cancelled["type"], "cancelled")
+        self.assertEqual(self.connector.active_operations, 0)
+
+    def test_rejects_writes(self):
+        """Test only read queries are streamed."""
+        with self.client.websocket_connect("/ws/query") as websocket:
+            websocket.send_json({"connection_id": self.connection.id, "query": "DELETE FROM items WHERE id = 1"})
+            message = websocket.receive_json()
+
+        self.assertEqual(message["type"], "error")
+
+
+
+class TestCreditWindow(unittest.TestCase):
+    """Test _CreditWindow."""
+
+    async def _grant_and_take(self):
+        """Grant an oversized credit count, then take one credit."""
+        window = _CreditWindow(1)
+        await window.grant(_credit_count(10 ** 9, 1))
+        await window.take()
+        return window.available
+
+    def test_window_is_bounded(self):
+        """Test huge or malformed credit counts are clamped."""
+        self.assertEqual(asyncio.run(self._grant_and_take()), MAX_CREDITS - 1)
+        self.assertEqual(_credit_count(1e9, 1), 1)
+        self.assertEqual(_credit_count("5", 1), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,40 @@
+"""Unit tests for result encodings."""
+
+import json
+import unittest
+from datetime import date
+from decimal import Decimal
+
+from utils.result_format import encode_columnar, to_columnar
+
+
+class TestColumnarFormat(unittest.TestCase):
+    """Test to_columnar and encode_columnar."""
+
+    def test_transposes_rows_and_types_columns(self):
+        """Test rows become one array per column with types from the first non-null value."""
+        result = to_columnar(["id", "name", "note"], [[1, None, None], [2, "b", None]])
+        self.assertEqual(result["data"], [[1, 2], [None, "b"], [None, None]])
+        self.assertEqual(result["column_types"], ["integer", "string", "null"])
+
+    def test_empty_result_keeps_columns(self):
+        """Test an empty result still has one empty array per column."""
+        self.assertEqual(to_columnar(["a", "b"], [])["data"], [[], []])
+
+    def test_encode_columnar_passes_through_metadata(self):
+        """Test encoding keeps response fields and serializes driver values."""
+        body = json.loads(encode_columnar({
+            "success": True,
+            "columns": ["price", "day"],
+            "rows": [[Decimal("1.10"), date(2024, 1, 2)]],
+            "total_rows": 1,
+        }))
+        self.assertEqual(body["format"], "columnar")
+        self.assertEqual(body["total_rows"], 1)
+        self.assertNotIn("rows", body)
+        self.assertEqual(body["data"], [["1.10"], ["2024-01-02"]])
+        self.assertEqual(body["column_types"], ["decimal", "date"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+"""Unit tests for schema explorer."""
+
+import asyncio
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from core.models import DatabaseConnection, DatabaseType
+from core.schema_snapshot_storage import SchemaSnapshotStorage
+from operations import schema_explorer
+from operations.connection_manager import connection_manager
+from operations.schema_explorer import SchemaExplorer
+from utils.cache import schema_cache
+
+
+class TestSchemaSnapshots(unittest.TestCase):
+    """Test schema trees persisted across restarts."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = TemporaryDirectory()
+        self.original_storage = schema_explorer.snapshot_storage
+        schema_explorer.snapshot_storage = SchemaSnapshotStorage(Path(self.temp_dir.name) / "snapshots.db")
+        self.explorer = SchemaExplorer()
+        self.connection = DatabaseConnection(
+            id="snapshot-test",
+            name="Snapshot SQLite",
+            db_type=DatabaseType.SQLITE,
+            database=str(Path(self.temp_dir.name) / "schema.db"),
+        )
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        asyncio.run(connection_manager.disconnect(self.connection.id))
+        schema_explorer.snapshot_storage = self.original_storage
+        self.temp_dir.cleanup()
+
+    async def _restart_and_load(self):
+        """Drop the in-memory tree as a restart would, then load and revalidate the snapshot."""
+        schema_cache.delete(f"{self.connection.id}_schema")
+        tree = await self.explorer.get_schema_tree(self.connection)
+        changed = await schema_explorer._revalidations[self.connection.id]
+        return tree, changed
+
+    async def _run(self):
+        """Load a tree, reload it unchanged, then reload it after a schema change."""
+        await connection_manager.connect(self.connection)
+        connector = await connection_manager.get_connector(self.connection.id)
+        await connector.execute_query("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+        await self.explorer.get_schema_tree(self.connection, use_cache=False)
+
+        unchanged = await self._restart_and_load()
+        await connector.execute_query("ALTER TABLE items ADD COLUMN name TEXT")
+        altered = await self._restart_and_load()
+        return unchanged, altered, await self.explorer.get_schema_tree(self.connection)
+
+    def test_snapshot_served_then_revalidated(self):
+        """Test the saved tree is served at once and reloaded only after the catalog changes."""
+        (tree, changed), (stale_tree, altered), current = asyncio.run(self._run())
+
+        self.assertTrue(tree["revalidating"])
+        self.assertEqual(list(tree["schemas"]["main"]["tables"]), ["items"])
+        self.assertFalse(changed)
+
+        self.assertEqual(stale_tree["schemas"]["main"]["tables"]["items"]["column_count"], 1)
+        self.assertTrue(altered)
+        self.assertEqual(current["schemas"]["main"]["tables"]["items"]["column_count"], 2)
+        self.assertNotIn("revalidating", current)
+
+    async def _refresh_after_migration(self):
+        """Load a tree, change one table and add another, then refresh."""
+        await connection_manager.connect(self.connection)
+        connector = await connection_manager.get_connector(self.connection.id)
+        for name in ("a", "b", "c"):
+            await connector.execute_query(f"CREATE TABLE {name} (id INTEGER PRIMARY KEY)")
+        before = await self.explorer.get_schema_tree(self.connection, use_cache=False)
+        await connector.execute_query("ALTER TABLE b ADD COLUMN note TEXT")
+        await connector.execute_query("DROP TABLE c")
+        await connector.execute_query("CREATE TABLE d (id INTEGER PRIMARY KEY)")
+        counts = await self.explorer.refresh_schema(self.connection)
+        return before, counts, await self.explorer.get_schema_tree(self.connection)
+
+    def test_refresh_patches_only_changed_tables(self):
+        """Test refresh re-reads changed tables and leaves unchanged nodes untouched."""
+        before, counts, after = asyncio.run(self._refresh_after_migration())
+
+        self.assertEqual(counts, {"incremental": True, "added": 1, "changed": 1, "removed": 1})
+        tables = after["schemas"]["main"]["tables"]
+        self.assertEqual(sorted(tables), ["a", "b", "d"])
+        self.assertEqual(after["schemas"]["main"]["table_count"], 3)
+        self.assertEqual(tables["b"]["column_count"], 2)
+        self.assertIs(tables["a"], before["schemas"]["main"]["tables"]["a"])
+        self.assertIn("c", before["schemas"]["main"]["tables"])
+
+    async def _browse_lazily(self):
+        """Page through tables by prefix and expand one, without loading the full tree."""
+        await connection_manager.connect(self.connection)
+        connector = await connection_manager.get_connector(self.connection.id)
+        for name in ("orders", "Order_items", "order_notes", "users"):
+            await connector.execute_query(f"CREATE TABLE {name} (id INTEGER PRIMARY KEY, note TEXT)")
+        return (
+            await self.explorer.get_schemas_cached(self.connection),
+            await self.explorer.get_tables_page(self.connection, "main", prefix="ORDER", limit=2),
+            await self.explorer.get_tables_page(self.connection, "main", prefix="order", limit=2, offset=2),
+            await self.explorer.get_columns_cached(self.connection, "users", "main"),
+        )
+
+    def test_lazy_tree_pages_by_prefix(self):
+        """Test table pages match prefixes case-insensitively and columns load per table."""
+        schemas, first, second, columns = asyncio.run(self._browse_lazily())
+
+        self.assertEqual(schemas, ["main"])
+        self.assertEqual(first, {"tables": ["Order_items", "order_notes"], "total": 3, "offset": 0, "has_more": True})
+        self.assertEqual(second, {"tables": ["orders"], "total": 3, "offset": 2, "has_more": False})
+        self.assertEqual([column["column_name"] for column in columns], ["id", "note"])
+        self.assertIsNone(schema_cache.get(f"{self.connection.id}_schema"))
+
+    async def _read_stale_tree(self):
+        """Load a tree, let it go stale, add a table and read it again."""
+        await connection_manager.connect(self.connection)
+        connector = await connection_manager.get_connector(self.connection.id)
+        await connector.execute_query("CREATE TABLE items (id INTEGER PRIMARY KEY)")
+        await self.explorer.get_schema_tree(self.connection, use_cache=False)
+        await connector.execute_query("CREATE TABLE orders (id INTEGER PRIMARY KEY)")
+
+        schema_cache._fresh_until[f"{self.connection.id}_schema"] = 0
+        stale = await self.explorer.get_schema_tree(self.connection)
+        changed = await schema_explorer._revalidations[self.connection.id]
+        return stale, changed, await self.explorer.get_schema_tree(self.connection)
+
+    def test_stale_tree_served_then_revalidated(self):
+        """Test a tree past its TTL is returned at once and refreshed in the background."""
+        stale, changed, current = asyncio.run(self._read_stale_tree())
+
+        self.assertEqual(list(stale["schemas"]["main"]["tables"]), ["items"])
+        self.assertTrue(changed)
+        self.assertEqual(sorted(current["schemas"]["main"]["tables"]), ["items", "orders"])
+        self.assertFalse(schema_cache.is_stale(f"{self.connection.id}_schema"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+"""Unit tests for session manager."""
+
+import asyncio
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from core.models import DatabaseType
+from core.storage import ConnectionStorage
+from operations.connection_manager import connection_manager
+from operations.session_manager import SessionManager
+
+
+class TestSessionManager(unittest.TestCase):
+    """Test SessionManager class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = TemporaryDirectory()
+        self.manager = SessionManager()
+        self.manager.session_file = Path(self.temp_dir.name) / "session.json"
+        self.manager.storage = ConnectionStorage(Path(self.temp_dir.name) / "connections.json")
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        asyncio.run(connection_manager.disconnect_all())
+        self.temp_dir.cleanup()
+
+    async def _save_session(self, count: int) -> list:
+        """Save a session with the given number of SQLite connections."""
+        ids = []
+        for i in range(count):
+            conn = await self.manager.storage.add_connection(
+                name=f"DB {i}", db_type=DatabaseType.SQLITE, database=":memory:"
+            )
+            ids.append(conn.id)
+        await self.manager.save_session(ids + ["missing"])
+        return ids
+
+    def test_get_restorable_connections_skips_missing(self):
+        """Test saved IDs without a stored connection are skipped."""
+
+        async def run():
+            ids = await self._save_session(2)
+            restorable = await self.manager.get_restorable_connections()
+            return ids, [conn.id for conn in restorable]
+
+        ids, restorable = asyncio.run(run())
+        self.assertEqual(restorable, ids)
+
+    def test_restore_connections(self):
+        """Test connections are restored with per-connection timings."""
+
+        async def run():
+            await self._save_session(3)
+            results = await self.manager.restore_connections()
+            return results, await connection_manager.get_all_active_connections()
+
+        results, active = asyncio.run(run())
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(result["success"] for result in results))
+        self.assertTrue(all(result["elapsed_ms"] >= 0 for result in results))
+        self.assertEqual(sorted(active), sorted(result["connection_id"] for result in results))
+
+    def test_lazy_restore_connects_on_first_use(self):
+        """Test lazy restore registers connections without opening them."""
+
+        async def run():
+            ids = await self._save_session(1)
+            await self.manager.restore_connections(lazy=True)
+            active_before = await connection_manager.get_all_active_connections()
+            connector = await connection_manager.get_connector(ids[0])
+            return active_before, connector
+
+        active_before, connector = asyncio.run(run())
+        self.assertEqual(active_before, [])
+        self.assertIsNotNone(connector)
+
+
+if __name__ == "__main__":
+    unittest.main()
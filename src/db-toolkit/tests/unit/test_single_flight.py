@@ -0,0 +1,60 @@
+"""Unit tests for single flight request coalescing."""
+
+import asyncio
+import unittest
+
+from utils.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Test SingleFlight class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.flights = SingleFlight("test")
+        self.loads = 0
+
+    async def _load(self):
+        """Simulate a slow database read."""
+        self.loads += 1
+        await asyncio.sleep(0.05)
+        return {"load": self.loads}
+
+    async def _concurrent_misses(self):
+        """Miss the same key five times at once, then once more after the load finished."""
+        results = await asyncio.gather(*(self.flights.run("k", self._load) for _ in range(5)))
+        return results, await self.flights.run("k", self._load)
+
+    def test_concurrent_calls_share_one_load(self):
+        """Test concurrent calls for a key await one load and later calls start a new one."""
+        results, later = asyncio.run(self._concurrent_misses())
+
+        self.assertEqual(results, [{"load": 1}] * 5)
+        self.assertEqual(later, {"load": 2})
+        stats = self.flights.get_stats()
+        self.assertEqual((stats["calls"], stats["coalesced"], stats["in_flight"]), (2, 4, 0))
+
+    async def _cancel_waiters(self):
+        """Cancel one of two waiters, then the other."""
+        first = asyncio.create_task(self.flights.run("k", self._load))
+        second = asyncio.create_task(self.flights.run("k", self._load))
+        await asyncio.sleep(0)
+        load = self.flights._flights["k"].task
+
+        first.cancel()
+        await asyncio.sleep(0)
+        survived = not load.cancelled()
+        second.cancel()
+        await asyncio.gather(first, second, load, return_exceptions=True)
+        return survived, load.cancelled()
+
+    def test_load_cancelled_only_when_all_callers_leave(self):
+        """Test a shared load keeps running while any caller still waits on it."""
+        survived, cancelled = asyncio.run(self._cancel_waiters())
+
+        self.assertTrue(survived)
+        self.assertTrue(cancelled)
+
+
+if __name__ == "__main__":
+    unittest.main()
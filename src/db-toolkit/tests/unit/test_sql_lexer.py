@@ -0,0 +1,87 @@
+"""Unit tests for SQL statement classification."""
+
+import unittest
+
+from operations.query_executor import QueryExecutor
+from utils.sql_lexer import classify
+
+
+class TestClassify(unittest.TestCase):
+    """Test classify function."""
+
+    def test_reads_and_writes(self):
+        """Test read-only detection, including CTEs and locking reads."""
+        self.assertTrue(classify("WITH recent AS (SELECT * FROM orders) SELECT * FROM recent").read_only)
+        self.assertTrue(classify("select last_update from t").read_only)
+        self.assertFalse(classify("WITH gone AS (DELETE FROM orders RETURNING *) SELECT * FROM gone").read_only)
+        self.assertFalse(classify("SELECT * FROM orders FOR UPDATE").read_only)
+        self.assertFalse(classify("EXPLAIN ANALYZE DELETE FROM orders").read_only)
+        self.assertFalse(classify("SELECT 1; DELETE FROM orders WHERE id = 1").read_only)
+
+    def test_literals_and_comments_are_not_clauses(self):
+        """Test keywords inside strings and comments are ignored."""
+        statement = classify("SELECT * FROM notes WHERE body = 'LIMIT 5; DROP DATABASE x' -- LIMIT 1")
+        self.assertFalse(statement.has_limit)
+        self.assertFalse(statement.multi_statement)
+        self.assertTrue(statement.paginatable)
+        self.assertEqual(statement.tables, frozenset({"notes"}))
+        self.assertFalse(classify("SELECT * FROM (SELECT * FROM t LIMIT 5) s").has_limit)
+
+    def test_offset_counts_as_paging(self):
+        """Test a query with its own OFFSET is not paged again."""
+        self.assertFalse(classify("SELECT * FROM t OFFSET 5").paginatable)
+
+    def test_mysql_backslash_escapes(self):
+        """Test backslash-escaped quotes end MySQL strings where the server does."""
+        query = "SELECT 'it\\'s; DELETE FROM t' FROM notes"
+        self.assertTrue(classify(query, "mysql").read_only)
+        self.assertFalse(classify(query, "mysql").multi_statement)
+        self.assertTrue(classify("SELECT '\\' FROM notes; DELETE FROM t", "postgresql").multi_statement)
+
+    def test_cacheable(self):
+        """Test only single reads with known tables are cacheable."""
+        self.assertTrue(classify("WITH x AS (SELECT 1) SELECT * FROM x JOIN t ON true").cacheable)
+        self.assertFalse(classify("SELECT 1; SELECT 2").cacheable)
+        self.assertFalse(classify("SHOW TABLES").cacheable)
+
+    def test_table_less_and_volatile_reads_not_cacheable(self):
+        """Test reads no write can invalidate, or whose result changes per call, are not cacheable."""
+        for query in ("SELECT now()", "SELECT random()", "SELECT pg_sleep(10)", "SELECT 1"):
+            self.assertFalse(classify(query).cacheable, query)
+        self.assertFalse(classify("SELECT id, random() FROM t").cacheable)
+        self.assertFalse(classify("SELECT nextval('s')").read_only)
+        self.assertTrue(classify("SELECT \"now\" FROM t").cacheable)
+
+
+class TestQueryValidation(unittest.TestCase):
+    """Test QueryExecutor validation and pagination."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.executor = QueryExecutor()
+
+    def test_unfiltered_writes_blocked(self):
+        """Test UPDATE and DELETE need a WHERE of their own."""
+        self.assertFalse(self.executor._validate_query("UPDATE t SET a = (SELECT b FROM u WHERE u.id = 1)", "postgresql")["safe"])
+        self.assertFalse(self.executor._validate_query("SELECT 1; DELETE FROM t", "postgresql")["safe"])
+        self.assertTrue(self.executor._validate_query("DELETE FROM t WHERE id = 1", "postgresql")["safe"])
+        self.assertTrue(self.executor._validate_query("SELECT updated_at FROM t", "postgresql")["safe"])
+        self.assertTrue(self.executor._validate_query("SELECT * FROM t WHERE note = 'truncate'", "postgresql")["safe"])
+
+    def test_validation_cache_respects_comments(self):
+        """Test a cached safe query does not vouch for a variant whose WHERE is commented out."""
+        self.assertTrue(self.executor.validate_query("DELETE FROM t --c\nWHERE id=1", "postgresql")["safe"])
+        self.assertFalse(self.executor.validate_query("DELETE FROM t --c WHERE id=1", "postgresql")["safe"])
+
+    def test_pagination(self):
+        """Test LIMIT is appended only to reads without one."""
+        self.assertEqual(
+            self.executor._add_pagination("SELECT 'LIMIT' FROM t;", "sqlite", 10, 20),
+            "SELECT 'LIMIT' FROM t\nLIMIT 10 OFFSET 20"
+        )
+        self.assertEqual(self.executor._add_pagination("SELECT * FROM t LIMIT 5", "sqlite", 10, 0), "SELECT * FROM t LIMIT 5")
+        self.assertEqual(self.executor._add_pagination("INSERT INTO t VALUES (1)", "sqlite", 10, 0), "INSERT INTO t VALUES (1)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+"""Unit tests for bind parameter translation."""
+
+import unittest
+
+from utils.sql_params import FORMAT, NUMERIC, QMARK, bind_many, bind_params
+
+
+class TestBindParams(unittest.TestCase):
+    """Test bind_params and bind_many."""
+
+    def test_named_to_numeric(self):
+        """Test :name placeholders become $n and repeated names are bound once."""
+        query, args = bind_params(
+            "SELECT * FROM t WHERE a = :a AND b = :b OR a = :a", {"a": 1, "b": 2}, NUMERIC
+        )
+        self.assertEqual(query, "SELECT * FROM t WHERE a = $1 AND b = $2 OR a = $1")
+        self.assertEqual(args, [1, 2])
+
+    def test_named_to_format_escapes_percent(self):
+        """Test :name placeholders become %s and literal % signs are escaped."""
+        query, args = bind_params("SELECT * FROM t WHERE a LIKE '5%' AND b = :b", {"b": 2}, FORMAT)
+        self.assertEqual(query, "SELECT * FROM t WHERE a LIKE '5%%' AND b = %s")
+        self.assertEqual(args, [2])
+
+    def test_ignores_literals_comments_and_casts(self):
+        """Test placeholders in strings, comments and :: casts are left untouched."""
+        query, args = bind_params(
+            "SELECT ':a', \"?\", x::text -- :a\nFROM t WHERE y = :a", {"a": 1}, QMARK
+        )
+        self.assertEqual(query, "SELECT ':a', \"?\", x::text -- :a\nFROM t WHERE y = ?")
+        self.assertEqual(args, [1])
+
+    def test_backslash_escapes(self):
+        """Test a backslash-escaped quote does not end a MySQL string on either placeholder style."""
+        query = "SELECT * FROM t WHERE a = 'it\\'s :b' AND b = :b"
+        for style in (FORMAT, QMARK):
+            compiled, args = bind_params(query, {"b": 2}, style, backslash_escapes=True)
+            self.assertTrue(compiled.endswith("AND b = %s" if style == FORMAT else "AND b = ?"))
+            self.assertEqual(args, [2])
+
+    def test_positional_qmark(self):
+        """Test ? placeholders with sequence parameters."""
+        query, args = bind_params("UPDATE t SET a = ? WHERE id = ?", ("x", 5), NUMERIC)
+        self.assertEqual(query, "UPDATE t SET a = $1 WHERE id = $2")
+        self.assertEqual(args, ["x", 5])
+
+    def test_native_placeholders_pass_through(self):
+        """Test a sequence with driver-native placeholders is passed unchanged."""
+        self.assertEqual(bind_params("SELECT $1", [5], NUMERIC), ("SELECT $1", [5]))
+
+    def test_no_params(self):
+        """Test queries without parameters are unchanged."""
+        self.assertEqual(bind_params("SELECT '50%'", None, FORMAT), ("SELECT '50%'", None))
+
+    def test_bind_many(self):
+        """Test executemany parameter sets are arranged in placeholder order."""
+        query, args = bind_many(
+            "INSERT INTO t (a, b) VALUES (:a, :b)", [{"b": 2, "a": 1}, {"a": 3, "b": 4}], QMARK
+        )
+        self.assertEqual(query, "INSERT INTO t (a, b) VALUES (?, ?)")
+        self.assertEqual(args, [[1, 2], [3, 4]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,187 @@
+"""Unit tests for SQLite connector."""
+
+import asyncio
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from connectors.sqlite import SQLiteConnector
+from core.models import DatabaseConnection, DatabaseType
+from operations.csv_handler import CSVHandler
+from utils.cache import prepared_cache
+
+
+class TestSQLiteConnector(unittest.TestCase):
+    """Test SQLiteConnector class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = TemporaryDirectory()
+        self.config = DatabaseConnection(
+            id="sqlite-test",
+            name="Test SQLite",
+            db_type=DatabaseType.SQLITE,
+            database=str(Path(self.temp_dir.name) / "test.db"),
+        )
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        self.temp_dir.cleanup()
+
+    async def _connect_with_rows(self, count: int) -> SQLiteConnector:
+        """Connect and create a table with the given number of rows."""
+        connector = SQLiteConnector()
+        await connector.connect(self.config)
+        await connector.execute_query("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        for i in range(count):
+            await connector.execute_query(f"INSERT INTO items (id, name) VALUES ({i}, 'item {i}')")
+        return connector
+
+    def test_stream_query_batches(self):
+        """Test streaming returns rows in bounded batches."""
+
+        async def stream():
+            connector = await self._connect_with_rows(25)
+            try:
+                return [
+                    batch
+                    async for batch in connector.stream_query(
+                        "SELECT id, name FROM items ORDER BY id", batch_size=10
+                    )
+                ]
+            finally:
+                await connector.disconnect()
+
+        batches = asyncio.run(stream())
+        self.assertEqual([len(b["data"]) for b in batches], [10, 10, 5])
+        self.assertEqual(batches[0]["columns"], ["id", "name"])
+        self.assertEqual(batches[2]["data"][-1], [24, "item 24"])
+
+    def test_export_to_csv_streams_table(self):
+        """Test CSV export is built from streamed batches."""
+
+        async def export():
+            connector = await self._connect_with_rows(3)
+            try:
+                return await CSVHandler.export_to_csv(connector, "items")
+            finally:
+                await connector.disconnect()
+
+        content = asyncio.run(export())
+        self.assertEqual(content.splitlines(), ["id,name", "0,item 0", "1,item 1", "2,item 2"])
+
+    def test_execute_query_with_params(self):
+        """Test named parameters are bound instead of interpolated."""
+
+        async def run():
+            connector = await self._connect_with_rows(3)
+            try:
+                return await connector.execute_query(
+                    "SELECT name FROM items WHERE id = :id OR name = :name",
+                    {"id": 1, "name": "it's"},
+                )
+            finally:
+                await connector.disconnect()
+
+        result = asyncio.run(run())
+        self.assertTrue(result["success"])
+        self.assertEqual(result["data"], [["item 1"]])
+
+    def test_execute_many(self):
+        """Test executemany inserts every parameter set."""
+
+        async def run():
+            connector = await self._connect_with_rows(0)
+            try:
+                await connector.execute_many(
+                    "INSERT INTO items (id, name) VALUES (?, ?)", [(1, "a"), (2, "b")]
+                )
+                return await connector.execute_query("SELECT COUNT(*) FROM items")
+            finally:
+                await connector.disconnect()
+
+        self.assertEqual(asyncio.run(run())["data"], [[2]])
+
+    def test_prepared_statements_cached_and_invalidated(self):
+        """Test repeated statements hit the cache and DDL clears it."""
+
+        async def run():
+            connector = await self._connect_with_rows(1)
+            connector.connection_id = "sqlite-test"
+            try:
+                before = prepared_cache.hits
+                await connector.execute_query("SELECT name FROM items WHERE id = ?", [1])
+                await connector.execute_query("SELECT name FROM items WHERE id = ?", [1])
+                hits = prepared_cache.hits - before
+                await connector.execute_query("ALTER TABLE items ADD COLUMN price REAL")
+                return hits, prepared_cache.statements.get("sqlite-test")
+            finally:
+                await connector.disconnect()
+
+        hits, statements = asyncio.run(run())
+        self.assertEqual(hits, 1)
+        self.assertIsNone(statements)
+
+    def test_get_catalog(self):
+        """Test the bulk catalog includes columns, keys and indexes."""
+
+        async def run():
+            connector = await self._connect_with_rows(0)
+            try:
+                await connector.execute_query(
+                    "CREATE TABLE orders (id INTEGER PRIMARY KEY, "
+                    "item_id INTEGER NOT NULL REFERENCES items(id), note TEXT)"
+                )
+                await connector.execute_query("CREATE UNIQUE INDEX idx_orders_note ON orders (note)")
+                return await connector.get_catalog()
+            finally:
+                await connector.disconnect()
+
+        catalog = asyncio.run(run())
+        self.assertEqual(sorted(catalog["main"]), ["items", "orders"])
+
+        orders = catalog["main"]["orders"]
+        self.assertEqual([c["column_name"] for c in orders["columns"]], ["id", "item_id", "note"])
+        self.assertEqual(orders["columns"][1]["is_nullable"], "NO")
+        self.assertEqual(orders["primary_key"], ["id"])
+        self.assertEqual(orders["foreign_keys"][0]["referenced_table"], "items")
+        self.assertEqual(orders["foreign_keys"][0]["columns"], ["item_id"])
+        self.assertIn(
+            {"name": "idx_orders_note", "columns": ["note"], "unique": True}, orders["indexes"]
+        )
+
+
+    def test_wal_reads_run_on_read_only_pool(self):
+        """Test reads use the reader pool in parallel and writes stay on the writer."""
+
+        async def run():
+            connector = await self._connect_with_rows(3)
+            try:
+                mode = await connector.execute_query("PRAGMA journal_mode")
+                counts = await asyncio.gather(
+                    *(connector.execute_query("SELECT COUNT(*) FROM items") for _ in range(4))
+                )
+                stats = connector.get_pool_stats()
+                reader = await connector.acquire_connection()
+                try:
+                    await reader.execute("INSERT INTO items (id, name) VALUES (99, 'x')")
+                    reader_write = None
+                except Exception as e:
+                    reader_write = e
+                finally:
+                    await connector.release_connection(reader)
+                return mode, counts, stats, reader_write
+            finally:
+                await connector.disconnect()
+
+        mode, counts, stats, reader_write = asyncio.run(run())
+        self.assertEqual(mode["data"], [["wal"]])
+        self.assertTrue(all(c["data"] == [[3]] for c in counts))
+        self.assertTrue(stats["pooled"])
+        self.assertGreater(stats["size"], 2)
+        self.assertEqual(stats["idle"], stats["size"] - 1)
+        self.assertIsNotNone(reader_write)
+
+
+if __name__ == "__main__":
+    unittest.main()
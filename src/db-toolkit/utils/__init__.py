@@ -1,10 +1,10 @@
 """Utility functions and helpers."""
 
 from .pdf import PDFReport, format_bytes, format_duration, truncate_text
-from .cache import SchemaCache, QueryCache, PreparedStatementCache, schema_cache, query_cache, prepared_cache
+from .cache import CacheStore, SchemaCache, QueryCache, PreparedStatementCache, schema_cache, query_cache, prepared_cache
 
 __all__ = [
     'PDFReport', 'format_bytes', 'format_duration', 'truncate_text',
-    'SchemaCache', 'QueryCache', 'PreparedStatementCache', 
+    'CacheStore', 'SchemaCache', 'QueryCache', 'PreparedStatementCache', 
     'schema_cache', 'query_cache', 'prepared_cache'
 ]
\ No newline at end of file
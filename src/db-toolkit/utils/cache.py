@@ -1,93 +1,305 @@
 """Caching utilities for database metadata and query results."""
 
-import time
 import hashlib
-from typing import Dict, Any, Optional, List
+import heapq
+import itertools
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from utils.sql_lexer import classify, normalize_table
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate the bytes held by a value and everything it contains."""
+    size = 0
+    seen: Set[int] = set()
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return size
+
+
+class _Entry:
+    """A cached value with its expiry time and estimated size."""
+    
+    __slots__ = ("value", "expiry", "size")
+    
+    def __init__(self, value: Any, expiry: Optional[float], size: int):
+        """Initialize entry."""
+        self.value = value
+        self.expiry = expiry
+        self.size = size
 
 
-class SchemaCache:
-    """In-memory cache for database schema metadata."""
+class CacheStore:
+    """LRU cache bounded by entry count and estimated bytes, with per-entry TTLs.
     
-    def __init__(self, default_ttl: int = 300):
-        """Initialize cache with default TTL (5 minutes)."""
-        self.cache: Dict[str, Dict[str, Any]] = {}
+    Entries are kept in recency order in an OrderedDict, so lookups and
+    evictions are O(1). Expiry times are kept in a heap, so expired entries
+    are purged in O(log n) each without scanning the cache. on_remove is
+    called with (key, value) whenever an entry leaves the cache.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        default_ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        on_remove: Optional[Callable[[str, Any], None]] = None
+    ):
+        """Initialize cache; None leaves the TTL or a bound unset."""
+        self.name = name
         self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.on_remove = on_remove
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._expiry_heap: List[Tuple[float, int, str]] = []
+        self._sequence = itertools.count()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
     
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
-        """Set cache value with TTL."""
-        expiry = time.time() + (ttl or self.default_ttl)
-        self.cache[key] = {
-            "value": value,
-            "expiry": expiry
-        }
+    def __len__(self) -> int:
+        """Count entries, including expired ones not purged yet."""
+        return len(self._entries)
     
-    def get(self, key: str) -> Optional[Any]:
-        """Get cache value if not expired."""
-        if key not in self.cache:
-            return None
+    def __contains__(self, key: str) -> bool:
+        """Check for an unexpired entry without counting a hit or miss."""
+        entry = self._entries.get(key)
+        return entry is not None and not self._expired(entry, time.time())
+    
+    @staticmethod
+    def _expired(entry: _Entry, now: float) -> bool:
+        """Check whether an entry's TTL has passed."""
+        return entry.expiry is not None and now > entry.expiry
+    
+    def _remove(self, key: str) -> Optional[_Entry]:
+        """Remove an entry, notifying on_remove."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry.size
+            if self.on_remove:
+                self.on_remove(key, entry.value)
+        return entry
+    
+    def set(self, key: str, value: Any, ttl: Optional[float] = None, size: Optional[int] = None) -> bool:
+        """Set cache value with TTL; returns False if it is larger than the whole byte budget."""
+        size = estimate_size(value) if size is None else size
+        self._remove(key)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return False
         
-        entry = self.cache[key]
-        if time.time() > entry["expiry"]:
-            del self.cache[key]
-            return None
+        ttl = ttl or self.default_ttl
+        expiry = time.time() + ttl if ttl else None
+        self._entries[key] = _Entry(value, expiry, size)
+        self.bytes += size
+        if expiry is not None:
+            heapq.heappush(self._expiry_heap, (expiry, next(self._sequence), key))
         
-        return entry["value"]
+        self.cleanup_expired()
+        self._evict()
+        return True
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get cache value if not expired, marking it as recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        
+        if self._expired(entry, time.time()):
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return default
+        
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
     
     def delete(self, key: str) -> bool:
         """Delete cache entry."""
-        if key in self.cache:
-            del self.cache[key]
-            return True
-        return False
+        return self._remove(key) is not None
     
-    def clear(self) -> None:
-        """Clear all cache entries."""
-        self.cache.clear()
+    def _evict(self) -> None:
+        """Drop least recently used entries until the cache is within its bounds."""
+        while self._entries and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self.bytes > self.max_bytes)
+        ):
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
     
-    def get_keys(self) -> List[str]:
-        """Get all cache keys."""
-        return list(self.cache.keys())
+    def resize(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        """Change the bounds and evict down to them; None keeps a bound unchanged."""
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        self._evict()
     
     def cleanup_expired(self) -> int:
         """Remove expired entries and return count."""
-        current_time = time.time()
-        expired_keys = [
-            key for key, entry in self.cache.items()
-            if current_time > entry["expiry"]
-        ]
+        now = time.time()
+        removed = 0
+        heap = self._expiry_heap
+        while heap and heap[0][0] < now:
+            expiry, _, key = heapq.heappop(heap)
+            entry = self._entries.get(key)
+            # Entries set again since this push have a newer heap item
+            if entry is not None and entry.expiry == expiry:
+                self._remove(key)
+                removed += 1
+        self.expirations += removed
         
-        for key in expired_keys:
-            del self.cache[key]
+        # Overwritten and deleted entries leave stale heap items behind
+        if len(heap) > 2 * len(self._entries) + 64:
+            self._expiry_heap = [item for item in heap if item[2] in self._entries and self._entries[item[2]].expiry == item[0]]
+            heapq.heapify(self._expiry_heap)
+        return removed
+    
+    def clear(self) -> None:
+        """Clear all cache entries."""
+        for key in list(self._entries):
+            self._remove(key)
+        self._expiry_heap.clear()
+    
+    def get_keys(self) -> List[str]:
+        """Get all cache keys, least recently used first."""
+        return list(self._entries.keys())
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        requests = self.hits + self.misses
+        return {
+            'name': self.name,
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_ratio': self.hits / requests if requests else 0.0
+        }
+
+
+class SchemaCache(CacheStore):
+    """In-memory cache for database schema metadata.
+    
+    Entries set with a stale_ttl are kept that long past their TTL. get()
+    keeps returning them in that window and is_stale() tells the caller to
+    refresh them in the background; only past TTL + stale_ttl do they expire.
+    """
+    
+    def __init__(self, default_ttl: int = 300, max_bytes: int = 64 * 1024 * 1024):
+        """Initialize cache with default TTL (5 minutes) and a 64 MB budget."""
+        super().__init__("schema", default_ttl=default_ttl, max_bytes=max_bytes, on_remove=self._forget_freshness)
+        # Soft expiry times of entries that may be served stale
+        self._fresh_until: Dict[str, float] = {}
+        self.stale_hits = 0
+    
+    def _forget_freshness(self, key: str, value: Any) -> None:
+        """Drop an entry's soft expiry once the store removes it."""
+        self._fresh_until.pop(key, None)
+    
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        size: Optional[int] = None,
+        stale_ttl: Optional[float] = None
+    ) -> bool:
+        """Set cache value with TTL, servable as stale for stale_ttl seconds after it."""
+        ttl = ttl or self.default_ttl
+        if not stale_ttl:
+            return super().set(key, value, ttl=ttl, size=size)
         
-        return len(expired_keys)
+        if not super().set(key, value, ttl=ttl + stale_ttl, size=size):
+            return False
+        self._fresh_until[key] = time.time() + ttl
+        return True
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get cache value if not expired, including stale values still in their grace period."""
+        value = super().get(key, default)
+        if self.is_stale(key):
+            self.stale_hits += 1
+        return value
+    
+    def is_stale(self, key: str) -> bool:
+        """Check whether an entry is past its TTL but still being served."""
+        fresh_until = self._fresh_until.get(key)
+        return fresh_until is not None and time.time() > fresh_until and key in self
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        return {**super().get_stats(), 'stale_hits': self.stale_hits}
 
 
 class QueryCache:
-    """In-memory cache for query results and prepared statements."""
+    """In-memory cache for query results, indexed by the tables each query reads.
     
-    def __init__(self, default_ttl: int = 600, max_size: int = 1000):
-        """Initialize query cache with TTL (10 minutes) and size limit."""
-        self.cache: Dict[str, Dict[str, Any]] = {}
-        self.access_times: Dict[str, float] = {}
-        self.default_ttl = default_ttl
-        self.max_size = max_size
+    Every entry is filed under its connection and under each table its query
+    references, so writes can drop exactly the results they make stale.
+    Entries that read views or other relations not known to be base tables
+    are also filed under ANY_TABLE and dropped by every write on the connection.
+    """
+    
+    ANY_TABLE = '*'
+    
+    def __init__(self, default_ttl: int = 600, max_size: int = 1000, max_bytes: int = 128 * 1024 * 1024):
+        """Initialize query cache with TTL (10 minutes), entry limit and a 128 MB budget."""
+        self.store = CacheStore(
+            "query",
+            default_ttl=default_ttl,
+            max_entries=max_size,
+            max_bytes=max_bytes,
+            on_remove=self._unindex
+        )
+        # connection ID -> keys, and (connection ID, table) -> keys
+        self.connection_keys: Dict[str, Set[str]] = {}
+        self.table_keys: Dict[Tuple[str, str], Set[str]] = {}
     
     def _generate_key(self, connection_id: str, query: str, params: Optional[Dict] = None) -> str:
         """Generate cache key from connection, query and parameters."""
-        query_normalized = ' '.join(query.strip().split())
+        # Only trim the edges; inner whitespace may be part of a literal
+        query_normalized = query.strip()
         params_str = str(sorted(params.items())) if params else ''
         key_string = f"{connection_id}:{query_normalized}:{params_str}"
         return hashlib.md5(key_string.encode()).hexdigest()
     
-    def _evict_lru(self) -> None:
-        """Evict least recently used entries when cache is full."""
-        if len(self.cache) >= self.max_size:
-            # Remove 20% of oldest entries
-            sorted_keys = sorted(self.access_times.items(), key=lambda x: x[1])
-            keys_to_remove = [k for k, _ in sorted_keys[:self.max_size // 5]]
-            for key in keys_to_remove:
-                self.cache.pop(key, None)
-                self.access_times.pop(key, None)
+    def _unindex(self, key: str, entry: Dict[str, Any]) -> None:
+        """Drop an entry's index references once the store removes it."""
+        connection_id = entry['connection_id']
+        keys = self.connection_keys.get(connection_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.connection_keys[connection_id]
+        for table in entry['tables']:
+            keys = self.table_keys.get((connection_id, table))
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self.table_keys[(connection_id, table)]
     
     def set_query_result(
         self, 
@@ -95,28 +307,41 @@ class QueryCache:
         query: str, 
         result: Dict[str, Any], 
         ttl: Optional[int] = None,
-        params: Optional[Dict] = None
+        params: Optional[Dict] = None,
+        base_tables: Optional[Iterable[str]] = None,
+        dialect: Optional[str] = None
     ) -> None:
-        """Cache query result."""
-        # Only cache successful SELECT queries
-        if not result.get('success') or not query.strip().upper().startswith('SELECT'):
+        """Cache query result.
+        
+        base_tables lists the referenced names known to be base tables; with
+        any other name referenced, the entry is invalidated by every write.
+        dialect is the connection's DatabaseType value, for lexing the query.
+        """
+        # Only cache successful reads whose tables are known, so writes can invalidate them
+        statement = classify(query, dialect)
+        if not result.get('success') or not statement.cacheable:
             return
         
         # Don't cache large result sets (>1000 rows)
         if len(result.get('rows', [])) > 1000:
             return
         
+        tables = set(statement.tables)
+        if not tables.issubset(normalize_table(table) for table in base_tables or ()):
+            tables.add(self.ANY_TABLE)
         key = self._generate_key(connection_id, query, params)
-        expiry = time.time() + (ttl or self.default_ttl)
-        
-        self._evict_lru()
-        
-        self.cache[key] = {
+        entry = {
             'result': result,
-            'expiry': expiry,
+            'connection_id': connection_id,
+            'tables': tables,
             'query': query[:100]  # Store truncated query for debugging
         }
-        self.access_times[key] = time.time()
+        if not self.store.set(key, entry, ttl=ttl, size=estimate_size(result)):
+            return
+        
+        self.connection_keys.setdefault(connection_id, set()).add(key)
+        for table in tables:
+            self.table_keys.setdefault((connection_id, table), set()).add(key)
     
     def get_query_result(
         self, 
@@ -125,79 +350,161 @@ class QueryCache:
         params: Optional[Dict] = None
     ) -> Optional[Dict[str, Any]]:
         """Get cached query result."""
-        key = self._generate_key(connection_id, query, params)
+        entry = self.store.get(self._generate_key(connection_id, query, params))
+        return entry['result'] if entry else None
+    
+    def invalidate_tables(self, connection_id: str, tables: Iterable[str]) -> int:
+        """Invalidate cached queries on a connection that read any of the given tables."""
+        keys_to_remove: Set[str] = set(self.table_keys.get((connection_id, self.ANY_TABLE), ()))
+        for table in tables:
+            keys_to_remove.update(self.table_keys.get((connection_id, normalize_table(table)), ()))
         
-        if key not in self.cache:
-            return None
+        for key in keys_to_remove:
+            self.store.delete(key)
         
-        entry = self.cache[key]
-        if time.time() > entry['expiry']:
-            del self.cache[key]
-            self.access_times.pop(key, None)
-            return None
+        return len(keys_to_remove)
+    
+    def invalidate_query(self, connection_id: str, query: str, dialect: Optional[str] = None) -> int:
+        """Invalidate cached queries a write statement may have made stale.
         
-        # Update access time
-        self.access_times[key] = time.time()
-        return entry['result']
+        Statements whose tables cannot be determined invalidate the whole connection.
+        """
+        tables = classify(query, dialect).tables
+        if not tables:
+            return self.invalidate_connection(connection_id)
+        return self.invalidate_tables(connection_id, tables)
     
     def invalidate_connection(self, connection_id: str) -> int:
         """Invalidate all cached queries for a connection."""
-        keys_to_remove = []
-        for key in self.cache.keys():
-            if key.startswith(f"{connection_id}:"):
-                keys_to_remove.append(key)
+        keys_to_remove = list(self.connection_keys.get(connection_id, ()))
         
         for key in keys_to_remove:
-            self.cache.pop(key, None)
-            self.access_times.pop(key, None)
+            self.store.delete(key)
         
         return len(keys_to_remove)
     
     def clear(self) -> None:
         """Clear all cached queries."""
-        self.cache.clear()
-        self.access_times.clear()
+        self.store.clear()
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics."""
-        return {
-            'total_entries': len(self.cache),
-            'max_size': self.max_size,
-            'hit_ratio': getattr(self, '_hits', 0) / max(getattr(self, '_requests', 1), 1),
-            'memory_usage_mb': sum(len(str(entry)) for entry in self.cache.values()) / 1024 / 1024
-        }
+        return {**self.store.get_stats(), 'indexed_tables': len(self.table_keys)}
 
 
 class PreparedStatementCache:
-    """Cache for prepared statements by database type."""
+    """LRU cache of driver prepared statements per connection.
+    
+    Prepared statements belong to one physical database session, so entries
+    are grouped by connection ID and then by session key (for example the
+    driver connection or server thread ID of a pooled connection). Each
+    session keeps at most max_per_connection statements.
+    """
     
-    def __init__(self):
+    # Statements worth preparing; DDL and session commands run unprepared
+    PREPARABLE_KEYWORDS = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'VALUES', 'TABLE')
+    # Statements that can change the shape of cached statements' results
+    SCHEMA_CHANGE_KEYWORDS = ('CREATE', 'ALTER', 'DROP', 'RENAME', 'TRUNCATE')
+    
+    def __init__(self, max_per_connection: int = 100, max_sessions: int = 50):
         """Initialize prepared statement cache."""
-        self.statements: Dict[str, Dict[str, str]] = {}
+        self.statements: Dict[str, "OrderedDict[Any, OrderedDict[str, Any]]"] = {}
+        self.max_per_connection = max_per_connection
+        self.max_sessions = max_sessions
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def normalize(self, query: str) -> str:
+        """Normalize query text used as the cache key."""
+        # Only trim the edges; inner whitespace may be part of a literal
+        return query.strip().rstrip(';').rstrip()
     
-    def get_prepared_query(self, connection_id: str, query: str, db_type: str) -> str:
-        """Get or create prepared statement for query."""
-        if connection_id not in self.statements:
-            self.statements[connection_id] = {}
+    def _first_keyword(self, query: str) -> str:
+        """Get the leading SQL keyword of a query."""
+        normalized = self.normalize(query)
+        return normalized.split(None, 1)[0].upper().lstrip('(') if normalized else ''
+    
+    def is_preparable(self, query: str) -> bool:
+        """Check whether a query is a single DML statement worth preparing."""
+        if ';' in self.normalize(query):
+            return False
+        return self._first_keyword(query) in self.PREPARABLE_KEYWORDS
+    
+    def is_schema_change(self, query: str) -> bool:
+        """Check whether a query is DDL that invalidates prepared statements."""
+        return self._first_keyword(query) in self.SCHEMA_CHANGE_KEYWORDS
+    
+    def get(self, connection_id: str, session_key: Any, query: str) -> Optional[Any]:
+        """Get a cached statement and mark it as recently used."""
+        sessions = self.statements.get(connection_id)
+        session = sessions.get(session_key) if sessions else None
+        key = self.normalize(query)
         
-        query_hash = hashlib.md5(query.encode()).hexdigest()[:8]
+        if session is None or key not in session:
+            self.misses += 1
+            return None
         
-        if query_hash not in self.statements[connection_id]:
-            # Convert to prepared statement based on database type
-            prepared_query = self._convert_to_prepared(query, db_type)
-            self.statements[connection_id][query_hash] = prepared_query
+        sessions.move_to_end(session_key)
+        session.move_to_end(key)
+        self.hits += 1
+        return session[key]
+    
+    def put(self, connection_id: str, session_key: Any, query: str, statement: Any) -> List[Any]:
+        """Cache a statement and return the statements evicted from the same session."""
+        sessions = self.statements.setdefault(connection_id, OrderedDict())
+        session = sessions.setdefault(session_key, OrderedDict())
+        key = self.normalize(query)
+        sessions.move_to_end(session_key)
+        session[key] = statement
+        session.move_to_end(key)
         
-        return self.statements[connection_id][query_hash]
+        # Sessions closed by the pool are never reused, so drop the oldest ones
+        while len(sessions) > self.max_sessions:
+            _, dropped = sessions.popitem(last=False)
+            self.evictions += len(dropped)
+        
+        evicted = []
+        while len(session) > self.max_per_connection:
+            _, old_statement = session.popitem(last=False)
+            evicted.append(old_statement)
+        self.evictions += len(evicted)
+        return evicted
+    
+    def discard(self, connection_id: str, session_key: Any, query: str) -> None:
+        """Remove a single statement, e.g. after the server rejected it."""
+        session = self.statements.get(connection_id, {}).get(session_key)
+        if session:
+            session.pop(self.normalize(query), None)
+    
+    def clear_session(self, connection_id: str, session_key: Any) -> int:
+        """Clear the statements of one session, e.g. after the server dropped them."""
+        session = self.statements.get(connection_id, {}).pop(session_key, None) or {}
+        return len(session)
     
-    def _convert_to_prepared(self, query: str, db_type: str) -> str:
-        """Convert query to prepared statement format."""
-        # For now, return original query - prepared statements need connector-specific implementation
-        # This is a placeholder for future prepared statement optimization
-        return query
+    def clear_connection(self, connection_id: str) -> int:
+        """Clear prepared statements for connection and return how many were removed."""
+        sessions = self.statements.pop(connection_id, None) or {}
+        return sum(len(session) for session in sessions.values())
+    
+    def clear(self) -> None:
+        """Clear all prepared statements."""
+        self.statements.clear()
     
-    def clear_connection(self, connection_id: str) -> None:
-        """Clear prepared statements for connection."""
-        self.statements.pop(connection_id, None)
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        requests = self.hits + self.misses
+        return {
+            'connections': len(self.statements),
+            'total_statements': sum(
+                len(session) for sessions in self.statements.values() for session in sessions.values()
+            ),
+            'max_per_connection': self.max_per_connection,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': self.hits / requests if requests else 0.0
+        }
 
 
 # Global cache instances
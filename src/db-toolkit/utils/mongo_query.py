@@ -0,0 +1,366 @@
+"""MongoDB shell-style query parsing, BSON to JSON conversion and field inference."""
+
+import base64
+import re
+from datetime import date, datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import json_util
+from bson.decimal128 import Decimal128
+from bson.int64 import Int64
+from bson.objectid import ObjectId
+
+USAGE = "MongoDB queries use db.<collection>.find(filter, projection) or db.<collection>.aggregate(pipeline)"
+
+_IDENTIFIER = re.compile(r"[A-Za-z_$][\w$]*")
+_KEY = re.compile(r"[A-Za-z_$][\w$]*(?:\.[\w$]+)*")
+
+# Cursor methods that may follow find()/aggregate(), mapped to parsed query fields
+CURSOR_METHODS = {
+    "sort": "sort",
+    "skip": "skip",
+    "limit": "limit",
+    "batchSize": "batch_size",
+    "maxTimeMS": "max_time_ms",
+    "projection": "projection",
+}
+
+# Shell constructors rewritten to extended JSON for json_util
+_CONSTRUCTORS = {
+    "ObjectId": "$oid",
+    "ISODate": "$date",
+    "Date": "$date",
+    "NumberLong": "$numberLong",
+    "NumberDecimal": "$numberDecimal",
+}
+
+
+def _skip_string(text: str, i: int) -> int:
+    """Return the index just past the quoted string starting at i."""
+    quote = text[i]
+    i += 1
+    while i < len(text):
+        if text[i] == "\\":
+            i += 2
+            continue
+        if text[i] == quote:
+            return i + 1
+        i += 1
+    raise ValueError("Unterminated string in query")
+
+
+def _matching_paren(text: str, start: int) -> int:
+    """Return the index of the bracket closing the one at start."""
+    depth = 0
+    i = start
+    while i < len(text):
+        char = text[i]
+        if char in ("'", '"'):
+            i = _skip_string(text, i)
+            continue
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+            if depth == 0:
+                return i
+        i += 1
+    raise ValueError("Unbalanced brackets in query")
+
+
+def _date_json(value: str) -> str:
+    """Render an ISO date string as extended JSON; dates without a zone are UTC."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid date '{value}'")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return f'{{"$date": {{"$numberLong": "{int(parsed.timestamp() * 1000)}"}}}}'
+
+
+def _to_json(text: str) -> str:
+    """Rewrite shell syntax (bare keys, single quotes, ObjectId(...)) as extended JSON."""
+    out: List[str] = []
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char in ("'", '"'):
+            end = _skip_string(text, i)
+            body = text[i + 1:end - 1]
+            if char == "'":
+                body = body.replace("\\'", "'").replace('"', '\\"')
+            out.append(f'"{body}"')
+            i = end
+            continue
+
+        match = _KEY.match(text, i) if (char.isalpha() or char in "_$") else None
+        if not match:
+            out.append(char)
+            i += 1
+            continue
+
+        word = match.group()
+        i = match.end()
+        rest = text[i:].lstrip()
+        if rest.startswith(":"):
+            out.append(f'"{word}"')
+        elif word == "new":
+            # new Date(...) is the same as Date(...)
+            continue
+        elif word in _CONSTRUCTORS or word == "NumberInt":
+            if not rest.startswith("("):
+                raise ValueError(f"{word} must be called with a value")
+            open_paren = text.index("(", i)
+            close_paren = _matching_paren(text, open_paren)
+            value = _to_json(text[open_paren + 1:close_paren]).strip()
+            if word == "NumberInt":
+                out.append(value.strip('"'))
+            elif _CONSTRUCTORS[word] == "$date":
+                out.append(_date_json(value.strip('"')))
+            else:
+                if not value.startswith('"'):
+                    value = f'"{value}"'
+                out.append(f'{{"{_CONSTRUCTORS[word]}": {value}}}')
+            i = close_paren + 1
+        else:
+            out.append(word)
+    return "".join(out)
+
+
+def _parse_args(args: str) -> List[Any]:
+    """Parse a call's comma-separated arguments into Python values."""
+    if not args.strip():
+        return []
+    return json_util.loads("[" + _to_json(args) + "]")
+
+
+def _split_chain(text: str) -> List[Tuple[str, Optional[str]]]:
+    """Split a.b(args).c(args) into (name, args) pairs; args is None for attributes."""
+    parts: List[Tuple[str, Optional[str]]] = []
+    i = 0
+    while i < len(text):
+        match = _IDENTIFIER.match(text, i)
+        if not match:
+            raise ValueError(f"Unexpected '{text[i:i + 20]}' in query. {USAGE}")
+        name = match.group()
+        i = match.end()
+        while i < len(text) and text[i].isspace():
+            i += 1
+
+        args = None
+        if i < len(text) and text[i] == "(":
+            end = _matching_paren(text, i)
+            args = text[i + 1:end]
+            i = end + 1
+            while i < len(text) and text[i].isspace():
+                i += 1
+        parts.append((name, args))
+
+        if i < len(text):
+            if text[i] != ".":
+                raise ValueError(f"Unexpected '{text[i:i + 20]}' in query. {USAGE}")
+            i += 1
+            while i < len(text) and text[i].isspace():
+                i += 1
+    return parts
+
+
+def parse_mongo_query(query: str) -> Dict[str, Any]:
+    """Parse db.<collection>.find(...)/aggregate(...) with chained cursor methods.
+
+    Returns {"collection", "operation", "filter", "projection", "pipeline",
+    "sort", "skip", "limit", "batch_size", "max_time_ms"}; unset options are None.
+    """
+    text = query.strip().rstrip(";").strip()
+    if not text.startswith("db."):
+        raise ValueError(USAGE)
+    parts = _split_chain(text[3:])
+
+    i = 0
+    if parts and parts[0][0] == "getCollection" and parts[0][1] is not None:
+        collection = _parse_args(parts[0][1])[0]
+        i = 1
+    else:
+        names = []
+        while i < len(parts) and parts[i][1] is None:
+            names.append(parts[i][0])
+            i += 1
+        collection = ".".join(names)
+    if not collection or i >= len(parts):
+        raise ValueError(USAGE)
+
+    parsed: Dict[str, Any] = {
+        "collection": collection,
+        "operation": "find",
+        "filter": {},
+        "projection": None,
+        "pipeline": [],
+        "sort": None,
+        "skip": None,
+        "limit": None,
+        "batch_size": None,
+        "max_time_ms": None,
+    }
+
+    operation, op_args = parts[i]
+    args = _parse_args(op_args or "")
+    if operation in ("find", "findOne"):
+        parsed["filter"] = (args[0] if args else None) or {}
+        parsed["projection"] = args[1] if len(args) > 1 else None
+        if operation == "findOne":
+            parsed["limit"] = 1
+    elif operation == "aggregate":
+        if not args or not isinstance(args[0], list):
+            raise ValueError("aggregate() expects a pipeline array")
+        parsed["operation"] = "aggregate"
+        parsed["pipeline"] = args[0]
+        options = args[1] if len(args) > 1 and isinstance(args[1], dict) else {}
+        parsed["max_time_ms"] = options.get("maxTimeMS")
+    else:
+        raise ValueError(f"Unsupported operation '{operation}'. {USAGE}")
+
+    for name, method_args in parts[i + 1:]:
+        if method_args is None or name not in CURSOR_METHODS:
+            raise ValueError(f"Unsupported cursor method '{name}'")
+        values = _parse_args(method_args)
+        if len(values) != 1:
+            raise ValueError(f"{name}() expects one argument")
+        value = values[0]
+        field = CURSOR_METHODS[name]
+        if field in ("sort", "projection"):
+            if not isinstance(value, dict):
+                raise ValueError(f"{name}() expects a document")
+        elif not isinstance(value, int) or isinstance(value, bool) or value < 0:
+            raise ValueError(f"{name}() expects a non-negative integer")
+        parsed[field] = value
+
+    return parsed
+
+
+def output_stage_index(pipeline: List[Any]) -> Optional[int]:
+    """Index of a trailing $out/$merge stage, which must stay last, or None."""
+    if pipeline and isinstance(pipeline[-1], dict) and ("$out" in pipeline[-1] or "$merge" in pipeline[-1]):
+        return len(pipeline) - 1
+    return None
+
+
+def apply_cursor_defaults(
+    query: str,
+    limit: Optional[int] = None,
+    skip: Optional[int] = None,
+    max_time_ms: Optional[int] = None
+) -> str:
+    """Append .skip()/.limit()/.maxTimeMS() to a query that does not set them itself.
+
+    Queries that fail to parse are returned unchanged so the connector reports the error.
+    Pipelines ending in $out or $merge write their whole result, so they get no
+    default skip or limit.
+    """
+    try:
+        parsed = parse_mongo_query(query)
+    except ValueError:
+        return query
+
+    query = query.strip().rstrip(";").strip()
+    if parsed["operation"] == "aggregate" and output_stage_index(parsed["pipeline"]) is not None:
+        skip = limit = None
+    if skip and parsed["skip"] is None:
+        query += f".skip({skip})"
+    if limit and parsed["limit"] is None:
+        query += f".limit({limit})"
+    if max_time_ms and parsed["max_time_ms"] is None:
+        query += f".maxTimeMS({max_time_ms})"
+    return query
+
+
+def to_json_value(value: Any) -> Any:
+    """Convert a BSON value to JSON-compatible data, keeping numbers, booleans and nesting."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, dict):
+        return {key: to_json_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_value(item) for item in value]
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return base64.b64encode(value).decode("ascii")
+    # ObjectId, Decimal128 (kept exact), UUID, Timestamp and the rest render as strings
+    return str(value)
+
+
+def bson_type_name(value: Any) -> str:
+    """Name a value's BSON type the way MongoDB's $type operator does."""
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, Int64):
+        return "long"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "double"
+    if isinstance(value, str):
+        return "string"
+    if isinstance(value, dict):
+        return "object"
+    if isinstance(value, list):
+        return "array"
+    if isinstance(value, datetime):
+        return "date"
+    if isinstance(value, ObjectId):
+        return "objectId"
+    if isinstance(value, Decimal128):
+        return "decimal"
+    if isinstance(value, bytes):
+        return "binData"
+    return type(value).__name__
+
+
+def _collect_fields(document: Dict[str, Any], prefix: str, types: Dict[str, Dict[str, int]], seen: set) -> None:
+    """Count the type of every field path in a document, descending into documents and arrays."""
+    for key, value in document.items():
+        path = f"{prefix}{key}"
+        counts = types.setdefault(path, {})
+        type_name = bson_type_name(value)
+        counts[type_name] = counts.get(type_name, 0) + 1
+        seen.add(path)
+        if isinstance(value, dict):
+            _collect_fields(value, f"{path}.", types, seen)
+        elif isinstance(value, list):
+            # Dot notation reaches into documents inside arrays
+            for item in value:
+                if isinstance(item, dict):
+                    _collect_fields(item, f"{path}.", types, seen)
+
+
+def infer_fields(documents: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge the field paths of sampled documents into column descriptions.
+
+    Each column has the dominant non-null type as data_type, every observed
+    type with its count under "types", and the share of documents that
+    contain the path under "frequency".
+    """
+    types: Dict[str, Dict[str, int]] = {}
+    presence: Dict[str, int] = {}
+    for document in documents:
+        seen: set = set()
+        _collect_fields(document, "", types, seen)
+        for path in seen:
+            presence[path] = presence.get(path, 0) + 1
+
+    columns = []
+    for path, counts in types.items():
+        non_null = {name: count for name, count in counts.items() if name != "null"} or counts
+        present = presence[path]
+        columns.append({
+            "column_name": path,
+            "data_type": max(non_null, key=non_null.get),
+            "is_nullable": "YES" if present < len(documents) or "null" in counts else "NO",
+            "column_default": None,
+            "types": counts,
+            "frequency": round(present / len(documents), 3)
+        })
+    return columns
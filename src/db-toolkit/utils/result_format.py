@@ -0,0 +1,76 @@
+"""Result set encodings for query and browse responses."""
+
+import json
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Sequence
+
+COLUMNAR = "columnar"
+
+# Python types mapped to the column type names sent with columnar results
+_COLUMN_TYPES = (
+    (bool, "boolean"),
+    (int, "integer"),
+    (float, "number"),
+    (Decimal, "decimal"),
+    (str, "string"),
+    (datetime, "datetime"),
+    (date, "date"),
+    (time, "time"),
+    (timedelta, "interval"),
+    ((dict, list), "json"),
+    ((bytes, bytearray, memoryview), "binary"),
+)
+
+
+def column_type(values: Sequence[Any]) -> str:
+    """Name a column's type from its first non-null value."""
+    for value in values:
+        if value is None:
+            continue
+        for python_type, name in _COLUMN_TYPES:
+            if isinstance(value, python_type):
+                return name
+        return "string"
+    return "null"
+
+
+def to_columnar(columns: List[str], rows: List[Sequence[Any]]) -> Dict[str, Any]:
+    """Transpose rows into one value array per column, with a type per column."""
+    data = [list(values) for values in zip(*rows)] if rows else [[] for _ in columns]
+    return {
+        "columns": columns,
+        "column_types": [column_type(values) for values in data],
+        "data": data
+    }
+
+
+def _encode(value: Any) -> Any:
+    """Encode driver values that json cannot serialize natively."""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        return value.total_seconds()
+    if isinstance(value, Decimal):
+        # Strings keep the exact value; floats would round
+        return str(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).decode("utf-8", errors="replace")
+    return str(value)
+
+
+def dumps(value: Any) -> str:
+    """Serialize to compact JSON, encoding dates, decimals and bytes from drivers."""
+    return json.dumps(value, default=_encode, separators=(",", ":"), allow_nan=False)
+
+
+def encode_columnar(result: Dict[str, Any], rows_key: str = "rows") -> str:
+    """Serialize a result as compact column-major JSON without model validation.
+
+    result[rows_key] is replaced by per-column arrays under "data" and the
+    column types under "column_types"; every other key is passed through.
+    """
+    body = {key: value for key, value in result.items() if key not in (rows_key, "columns")}
+    body["format"] = COLUMNAR
+    body.update(to_columnar(result.get("columns") or [], result.get(rows_key) or []))
+    return dumps(body)
@@ -0,0 +1,67 @@
+"""Coalescing of concurrent identical loads into one in-flight call."""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict
+
+
+class _Flight:
+    """A running load and the number of callers waiting on it."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Future):
+        """Initialize flight."""
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Runs at most one load per key at a time and shares its result.
+
+    Callers that miss the cache for the same key while a load is running
+    await that load instead of starting their own. The load is cancelled
+    only once every caller waiting on it has been cancelled.
+    """
+
+    def __init__(self, name: str):
+        """Initialize single flight group."""
+        self.name = name
+        self._flights: Dict[str, _Flight] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    async def run(self, key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+        """Await the in-flight load for key, starting load() if there is none."""
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(load()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self.calls += 1
+        else:
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            # Shielded so one caller going away does not cancel the load for the others
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+
+    def _forget(self, key: str, flight: _Flight) -> None:
+        """Drop a finished flight so the next miss starts a new load."""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get load and coalescing statistics."""
+        requests = self.calls + self.coalesced
+        return {
+            'name': self.name,
+            'in_flight': len(self._flights),
+            'calls': self.calls,
+            'coalesced': self.coalesced,
+            'coalesced_ratio': self.coalesced / requests if requests else 0.0
+        }
@@ -0,0 +1,344 @@
+"""SQL tokenizer and statement classifier for validation, caching and routing."""
+
+import re
+from functools import lru_cache
+from typing import FrozenSet, List, NamedTuple, Optional, Set, Tuple
+
+MYSQL = "mysql"
+
+# Literals, comments, quoted or bare names, and single punctuation characters
+_TOKEN = re.compile(
+    r"'(?:[^']|'')*'"
+    r"|\$(?P<tag>(?:[A-Za-z_]\w*)?)\$.*?\$(?P=tag)\$"
+    r"|--[^\n]*|/\*.*?\*/"
+    r"|\"(?:[^\"]|\"\")*\"|`[^`]*`|\[[^\]]+\]"
+    r"|[A-Za-z_][\w$]*|\S",
+    re.DOTALL,
+)
+# MySQL also escapes quotes with a backslash inside quoted strings
+_MYSQL_TOKEN = re.compile(
+    r"'(?:[^'\\]|''|\\.)*'"
+    r"|--[^\n]*|#[^\n]*|/\*.*?\*/"
+    r"|\"(?:[^\"\\]|\"\"|\\.)*\"|`[^`]*`"
+    r"|[A-Za-z_][\w$]*|\S",
+    re.DOTALL,
+)
+
+# Statements that return rows without writing
+_READ_KEYWORDS = {"SELECT", "VALUES", "TABLE"}
+# Other statements that only read
+_INSPECT_KEYWORDS = {"SHOW", "DESCRIBE", "DESC", "EXPLAIN"}
+# Keywords followed by a table name
+_TABLE_KEYWORDS = {"FROM", "JOIN", "UPDATE", "INTO", "TABLE", "TRUNCATE"}
+# Words between those keywords and the table name
+_SKIP_WORDS = {"ONLY", "IF", "NOT", "EXISTS", "LATERAL", "TABLE"}
+# Statements whose table references can be read off the text
+_ANALYSABLE = {"SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE", "MERGE", "TRUNCATE", "VALUES", "TABLE"}
+# Keywords that can follow a table name and must not be read as its alias
+_CLAUSE_WORDS = {
+    "WHERE", "GROUP", "ORDER", "LIMIT", "OFFSET", "HAVING", "UNION", "JOIN", "INNER", "LEFT",
+    "RIGHT", "FULL", "CROSS", "NATURAL", "ON", "USING", "SET", "VALUES", "SELECT", "WINDOW",
+    "RETURNING", "FOR", "EXCEPT", "INTERSECT", "DEFAULT", "FETCH", "STRAIGHT_JOIN",
+}
+# Words after FOR that make a SELECT take row locks
+_LOCK_WORDS = {"UPDATE", "SHARE", "NO", "KEY"}
+# Functions whose result changes between calls, so reads using them are never cached
+_VOLATILE_FUNCTIONS = {
+    "NOW", "CURRENT_TIMESTAMP", "CURRENT_TIME", "CURRENT_DATE", "LOCALTIME", "LOCALTIMESTAMP",
+    "SYSDATE", "UTC_TIMESTAMP", "CLOCK_TIMESTAMP", "STATEMENT_TIMESTAMP", "TIMEOFDAY",
+    "RANDOM", "RAND", "UUID", "GEN_RANDOM_UUID", "UUID_GENERATE_V4", "RANDOMBLOB",
+    "PG_SLEEP", "SLEEP", "CURRVAL", "LASTVAL", "LAST_INSERT_ID", "LAST_INSERT_ROWID",
+    "TXID_CURRENT", "NEXTVAL", "SETVAL",
+}
+# Functions that write, e.g. by advancing a sequence
+_WRITE_FUNCTIONS = {"NEXTVAL", "SETVAL"}
+
+
+class Statement(NamedTuple):
+    """What one SQL statement does, as far as it can be read off its tokens."""
+
+    keyword: str
+    object_type: str
+    read_only: bool
+    has_where: bool
+    has_limit: bool
+    unfiltered_write: str
+    tables: Optional[FrozenSet[str]]
+    volatile: bool
+
+
+class Classification(NamedTuple):
+    """The statements of a query, with the properties callers decide on."""
+
+    statements: Tuple[Statement, ...]
+
+    @property
+    def keyword(self) -> str:
+        """Main keyword of the first statement, with WITH resolved to the statement it wraps."""
+        return self.statements[0].keyword if self.statements else ""
+
+    @property
+    def multi_statement(self) -> bool:
+        """Check whether the query holds more than one statement."""
+        return len(self.statements) > 1
+
+    @property
+    def read_only(self) -> bool:
+        """Check whether every statement only reads."""
+        return bool(self.statements) and all(statement.read_only for statement in self.statements)
+
+    @property
+    def has_limit(self) -> bool:
+        """Check whether the last statement has a top-level LIMIT, OFFSET or FETCH."""
+        return bool(self.statements) and self.statements[-1].has_limit
+
+    @property
+    def tables(self) -> Optional[FrozenSet[str]]:
+        """Bare names of all referenced tables, or None if any statement cannot be analysed."""
+        if not self.statements or any(statement.tables is None for statement in self.statements):
+            return None
+        return frozenset().union(*(statement.tables for statement in self.statements))
+
+    @property
+    def returns_rows(self) -> bool:
+        """Check whether the query is a single read returning a result set."""
+        return not self.multi_statement and self.read_only and self.keyword in _READ_KEYWORDS
+
+    @property
+    def volatile(self) -> bool:
+        """Check whether any statement calls a function whose result changes between calls."""
+        return any(statement.volatile for statement in self.statements)
+
+    @property
+    def cacheable(self) -> bool:
+        """Check whether results can be cached and invalidated by the tables they read.
+
+        Reads of no table at all, such as SELECT now(), have nothing whose
+        writes would invalidate them.
+        """
+        return self.returns_rows and bool(self.tables) and not self.volatile
+
+    @property
+    def paginatable(self) -> bool:
+        """Check whether LIMIT/OFFSET can be appended to page the result."""
+        return self.returns_rows and not self.has_limit
+
+
+def tokenize(query: str, dialect: Optional[str] = None) -> List[str]:
+    """Split SQL into tokens, dropping comments; string literals stay single tokens."""
+    pattern = _MYSQL_TOKEN if dialect == MYSQL else _TOKEN
+    return [
+        match.group(0) for match in pattern.finditer(query)
+        if not match.group(0).startswith(("--", "#", "/*"))
+    ]
+
+
+def _is_literal(token: str) -> bool:
+    """Check whether a token is a string literal."""
+    return token[0] == "'" or (token[0] == "$" and len(token) > 1)
+
+
+def _is_name(token: str) -> bool:
+    """Check whether a token is a bare or quoted identifier."""
+    return token[0] in '"`[' or token[0].isalpha() or token[0] == "_"
+
+
+def _unquote(token: str) -> str:
+    """Strip identifier quotes and lower-case the name."""
+    return token.strip('"`[]').lower()
+
+
+def normalize_table(name: str) -> str:
+    """Reduce a possibly schema-qualified, quoted table name to its lower-cased bare name."""
+    tokens = [token for token in tokenize(name) if token != "."]
+    return _unquote(tokens[-1]) if tokens else ""
+
+
+def _skip_parens(tokens: List[str], i: int) -> int:
+    """Return the index just past the parenthesis group opening at i."""
+    depth = 0
+    while i < len(tokens):
+        if tokens[i] == "(":
+            depth += 1
+        elif tokens[i] == ")":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return i
+
+
+def _split_statements(tokens: List[str]) -> List[List[str]]:
+    """Split tokens into statements at top-level semicolons, dropping empty ones."""
+    statements: List[List[str]] = [[]]
+    depth = 0
+    for token in tokens:
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif token == ";" and depth <= 0:
+            statements.append([])
+            continue
+        statements[-1].append(token)
+    return [statement for statement in statements if statement]
+
+
+def _skip_ctes(tokens: List[str], i: int) -> Tuple[int, List[str], List[List[str]]]:
+    """Skip the CTE list after WITH at i; returns the main statement's index, the CTE names and bodies."""
+    names: List[str] = []
+    bodies: List[List[str]] = []
+    if i < len(tokens) and tokens[i].upper() == "RECURSIVE":
+        i += 1
+    while i < len(tokens):
+        # name [(columns)] AS [NOT] [MATERIALIZED] (body)
+        names.append(_unquote(tokens[i]))
+        i += 1
+        if i < len(tokens) and tokens[i] == "(":
+            i = _skip_parens(tokens, i)
+        if i < len(tokens) and tokens[i].upper() == "AS":
+            i += 1
+        while i < len(tokens) and tokens[i].upper() in ("NOT", "MATERIALIZED"):
+            i += 1
+        if i < len(tokens) and tokens[i] == "(":
+            end = _skip_parens(tokens, i)
+            bodies.append(tokens[i + 1:end - 1])
+            i = end
+        if i < len(tokens) and tokens[i] == ",":
+            i += 1
+        else:
+            break
+    return i, names, bodies
+
+
+def _scan_tables(tokens: List[str]) -> Optional[FrozenSet[str]]:
+    """Get the bare names of relations a statement reads or writes, or None if it cannot be analysed.
+
+    Names are lower-cased without their schema, so the same table in another
+    schema matches too; that only ever invalidates more than needed. Names
+    may be views as well as tables. Table functions in FROM or JOIN make the
+    statement unanalysable, since the tables they read are unknown.
+    """
+    tokens = [token for token in tokens if not _is_literal(token)]
+    first = next((token.upper() for token in tokens if token != "("), "")
+    if first not in _ANALYSABLE:
+        return None
+
+    tables: Set[str] = set()
+    i = 0
+    while i < len(tokens):
+        keyword = tokens[i].upper()
+        i += 1
+        if keyword not in _TABLE_KEYWORDS:
+            continue
+        while i < len(tokens) and tokens[i].upper() in _SKIP_WORDS:
+            i += 1
+
+        while i < len(tokens) and _is_name(tokens[i]) and tokens[i].upper() not in _CLAUSE_WORDS:
+            # schema.table keeps only the last part
+            name = tokens[i]
+            i += 1
+            while i + 1 < len(tokens) and tokens[i] == "." and _is_name(tokens[i + 1]):
+                name = tokens[i + 1]
+                i += 2
+            if keyword in ("FROM", "JOIN") and i < len(tokens) and tokens[i] == "(":
+                # A function call such as FROM generate_series(...)
+                return None
+            tables.add(_unquote(name))
+            if keyword != "FROM":
+                break
+
+            # FROM a [AS] x, b y lists several tables
+            if i < len(tokens) and tokens[i].upper() == "AS":
+                i += 1
+            if i < len(tokens) and _is_name(tokens[i]) and tokens[i].upper() not in _CLAUSE_WORDS:
+                i += 1
+            if i < len(tokens) and tokens[i] == ",":
+                i += 1
+            else:
+                break
+    return frozenset(tables)
+
+
+def _classify_statement(tokens: List[str]) -> Statement:
+    """Classify one statement's tokens."""
+    i = 0
+    while i < len(tokens) and tokens[i] == "(":
+        i += 1
+    keyword = tokens[i].upper() if i < len(tokens) else ""
+
+    ctes: List[Statement] = []
+    cte_names: List[str] = []
+    if keyword == "WITH":
+        i, cte_names, bodies = _skip_ctes(tokens, i + 1)
+        ctes = [_classify_statement(body) for body in bodies]
+        while i < len(tokens) and tokens[i] == "(":
+            i += 1
+        keyword = tokens[i].upper() if i < len(tokens) else ""
+    object_type = tokens[i + 1].upper() if keyword in ("CREATE", "ALTER", "DROP") and i + 1 < len(tokens) else ""
+
+    # Clauses of the statement itself, not of its subqueries or CTEs
+    has_where = has_limit = has_into = has_lock = has_analyze = False
+    depth = 0
+    for j, token in enumerate(tokens):
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0 and j > i:
+            word = token.upper()
+            if word == "WHERE":
+                has_where = True
+            elif word in ("LIMIT", "OFFSET", "FETCH"):
+                has_limit = True
+            elif word == "INTO":
+                has_into = True
+            elif word == "FOR" and j + 1 < len(tokens) and tokens[j + 1].upper() in _LOCK_WORDS:
+                has_lock = True
+        if token.upper() in ("ANALYZE", "ANALYSE"):
+            # EXPLAIN (ANALYZE) runs the statement too
+            has_analyze = True
+
+    words = {token.upper() for token in tokens if _is_name(token)}
+    volatile = bool(words & _VOLATILE_FUNCTIONS) or any(cte.volatile for cte in ctes)
+    if keyword in _READ_KEYWORDS:
+        read_only = (
+            not has_into and not has_lock and not words & _WRITE_FUNCTIONS
+            and all(cte.read_only for cte in ctes)
+        )
+    elif keyword == "EXPLAIN":
+        read_only = not has_analyze
+    else:
+        read_only = keyword in _INSPECT_KEYWORDS
+
+    unfiltered_write = keyword if keyword in ("UPDATE", "DELETE") and not has_where else ""
+    if not unfiltered_write:
+        unfiltered_write = next((cte.unfiltered_write for cte in ctes if cte.unfiltered_write), "")
+
+    # CTE names are not relations of the database
+    tables = _scan_tables(tokens)
+    if tables is not None and cte_names:
+        tables = tables.difference(cte_names)
+
+    return Statement(
+        keyword=keyword,
+        object_type=object_type,
+        read_only=read_only,
+        has_where=has_where,
+        has_limit=has_limit,
+        unfiltered_write=unfiltered_write,
+        tables=tables,
+        volatile=volatile
+    )
+
+
+@lru_cache(maxsize=1024)
+def classify(query: str, dialect: Optional[str] = None) -> Classification:
+    """Classify each statement of a query once; results are cached by query text and dialect.
+
+    String literals, quoted identifiers and comments are lexed as whole
+    tokens, so keywords inside them are never mistaken for clauses. dialect
+    is a DatabaseType value; "mysql" enables backslash escapes in strings.
+    """
+    statements = _split_statements(tokenize(query, dialect))
+    return Classification(tuple(_classify_statement(tokens) for tokens in statements))
@@ -0,0 +1,161 @@
+"""Bind parameter translation between the app and database drivers."""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+Params = Union[Dict[str, Any], Sequence[Any]]
+
+# Driver placeholder styles
+NUMERIC = "numeric"  # asyncpg: $1, $2
+FORMAT = "format"    # aiomysql: %s
+QMARK = "qmark"      # sqlite3: ?
+
+
+def _placeholder(style: str, position: int) -> str:
+    """Render a placeholder for the given 1-based position."""
+    if style == NUMERIC:
+        return f"${position}"
+    if style == FORMAT:
+        return "%s"
+    return "?"
+
+
+def _skip_quoted(query: str, i: int, quote: str, backslash_escapes: bool) -> int:
+    """Return the index just past a quoted string or identifier starting at i."""
+    i += 1
+    while i < len(query):
+        char = query[i]
+        if backslash_escapes and char == "\\":
+            i += 2
+            continue
+        if char == quote:
+            # Doubled quote is an escaped quote
+            if i + 1 < len(query) and query[i + 1] == quote:
+                i += 2
+                continue
+            return i + 1
+        i += 1
+    return i
+
+
+def _skip_dollar_quoted(query: str, i: int) -> Optional[int]:
+    """Return the index past a PostgreSQL $tag$ string, or None if not one."""
+    end = query.find("$", i + 1)
+    if end == -1:
+        return None
+    tag = query[i:end + 1]
+    if not all(c.isalnum() or c == "_" for c in tag[1:-1]) or tag[1:2].isdigit():
+        return None
+    close = query.find(tag, end + 1)
+    return len(query) if close == -1 else close + len(tag)
+
+
+@lru_cache(maxsize=512)
+def compile_query(
+    query: str, style: str, named: bool, backslash_escapes: Optional[bool] = None
+) -> Tuple[str, Tuple[Any, ...]]:
+    """Translate :name (named) or ? (positional) placeholders to a driver style.
+
+    Returns the translated query and the parameter order: names for named
+    parameters, 0-based indexes for positional ones. Placeholders inside
+    string literals, quoted identifiers and comments are left untouched.
+    backslash_escapes defaults to on for the MySQL FORMAT style.
+    """
+    out: List[str] = []
+    order: List[Any] = []
+    positions: Dict[str, int] = {}
+    if backslash_escapes is None:
+        backslash_escapes = style == FORMAT
+    i = 0
+    start = 0
+
+    def emit(text: str, upto: int) -> None:
+        chunk = query[start:upto]
+        out.append(chunk.replace("%", "%%") if style == FORMAT else chunk)
+        out.append(text)
+
+    while i < len(query):
+        char = query[i]
+        nxt = query[i + 1] if i + 1 < len(query) else ""
+
+        if char in ("'", '"', "`"):
+            i = _skip_quoted(query, i, char, backslash_escapes and char != "`")
+        elif char == "-" and nxt == "-":
+            newline = query.find("\n", i)
+            i = len(query) if newline == -1 else newline
+        elif char == "/" and nxt == "*":
+            close = query.find("*/", i + 2)
+            i = len(query) if close == -1 else close + 2
+        elif char == "$" and style == NUMERIC and (nxt.isalpha() or nxt in ("$", "_")):
+            end = _skip_dollar_quoted(query, i)
+            i = end if end is not None else i + 1
+        elif char == ":" and nxt == ":":
+            # PostgreSQL cast
+            i += 2
+        elif named and char == ":" and (nxt.isalpha() or nxt == "_"):
+            end = i + 1
+            while end < len(query) and (query[end].isalnum() or query[end] == "_"):
+                end += 1
+            name = query[i + 1:end]
+            if style == NUMERIC and name in positions:
+                # Repeated names share one $n and are bound once
+                emit(_placeholder(style, positions[name]), i)
+            else:
+                order.append(name)
+                positions.setdefault(name, len(order))
+                emit(_placeholder(style, len(order)), i)
+            i = start = end
+        elif not named and char == "?":
+            order.append(len(order))
+            emit(_placeholder(style, len(order)), i)
+            i = start = i + 1
+        else:
+            i += 1
+
+    if not order:
+        return query, ()
+
+    tail = query[start:]
+    out.append(tail.replace("%", "%%") if style == FORMAT else tail)
+    return "".join(out), tuple(order)
+
+
+def _ordered_args(params: Params, order: Tuple[Any, ...]) -> List[Any]:
+    """Arrange one parameter set in placeholder order."""
+    if isinstance(params, dict):
+        return [params[name] for name in order]
+    return [params[index] for index in order]
+
+
+def bind_params(
+    query: str, params: Optional[Params], style: str, backslash_escapes: Optional[bool] = None
+) -> Tuple[str, Optional[List[Any]]]:
+    """Translate a query and its parameters for a driver.
+
+    Dict parameters bind to :name placeholders and sequences bind to ?
+    placeholders. A sequence used with a query that has no ? placeholders
+    is assumed to already be in the driver's native style. backslash_escapes
+    is set for databases whose strings escape quotes with a backslash.
+    """
+    if params is None:
+        return query, None
+
+    named = isinstance(params, dict)
+    compiled, order = compile_query(query, style, named, backslash_escapes)
+    if not order:
+        return query, (None if named else list(params))
+    return compiled, _ordered_args(params, order)
+
+
+def bind_many(
+    query: str, seq_of_params: Sequence[Params], style: str, backslash_escapes: Optional[bool] = None
+) -> Tuple[str, List[List[Any]]]:
+    """Translate a query once and arrange every parameter set for executemany."""
+    if not seq_of_params:
+        return query, []
+
+    named = isinstance(seq_of_params[0], dict)
+    compiled, order = compile_query(query, style, named, backslash_escapes)
+    if not order:
+        return query, [list(params) if not named else [] for params in seq_of_params]
+    return compiled, [_ordered_args(params, order) for params in seq_of_params]
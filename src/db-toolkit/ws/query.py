@@ -0,0 +1,191 @@
+"""WebSocket endpoint for streaming query results with client flow control."""
+
+import asyncio
+import time
+from fastapi import WebSocket, WebSocketDisconnect
+from core.models import DatabaseType
+from operations.connection_manager import connection_manager
+from operations.query_executor import QueryExecutor
+from operations.query_registry import query_registry
+from utils.logger import logger
+from utils.result_format import COLUMNAR, dumps, to_columnar
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FIRST_BATCH_SIZE = 50
+DEFAULT_CREDITS = 2
+MAX_CREDITS = DEFAULT_CREDITS * 8
+MAX_BATCH_SIZE = 10000
+
+executor = QueryExecutor()
+
+
+def _batch_size(value, default: int) -> int:
+    """Clamp a client-supplied batch size."""
+    if not isinstance(value, int) or value < 1:
+        return default
+    return min(value, MAX_BATCH_SIZE)
+
+
+def _credit_count(value, default: int) -> int:
+    """Clamp a client-supplied credit count."""
+    if not isinstance(value, int) or value < 1:
+        return default
+    return min(value, MAX_CREDITS)
+
+
+class _CreditWindow:
+    """Batches the client allows the server to send, bounded by MAX_CREDITS."""
+
+    def __init__(self, credits: int):
+        """Initialize window."""
+        self.available = min(credits, MAX_CREDITS)
+        self._changed = asyncio.Condition()
+
+    async def take(self) -> None:
+        """Wait for a credit and use it."""
+        async with self._changed:
+            await self._changed.wait_for(lambda: self.available > 0)
+            self.available -= 1
+
+    async def grant(self, credits: int) -> None:
+        """Add credits, never beyond the maximum window."""
+        async with self._changed:
+            self.available = min(self.available + credits, MAX_CREDITS)
+            self._changed.notify_all()
+
+
+async def _stream_results(
+    websocket: WebSocket,
+    connector,
+    query: str,
+    credits: _CreditWindow,
+    batch_size: int,
+    first_batch_size: int,
+    columnar: bool
+) -> None:
+    """Send result batches as the cursor yields them, one credit per batch."""
+    start_time = time.time()
+    total_rows = 0
+    index = 0
+    stream = connector.stream_query(query, batch_size=batch_size, first_batch_size=first_batch_size)
+    try:
+        async for batch in stream:
+            # Hold the cursor until the client has room for another batch
+            await credits.take()
+            if columnar:
+                message = {"type": "batch", "index": index, "format": COLUMNAR}
+                message.update(to_columnar(batch["columns"], batch["data"]))
+            else:
+                message = {"type": "batch", "index": index, "columns": batch["columns"], "rows": batch["data"]}
+            await websocket.send_text(dumps(message))
+            total_rows += len(batch["data"])
+            index += 1
+    finally:
+        # Closes the driver cursor and releases the connection, also on cancel
+        await stream.aclose()
+
+    await websocket.send_json({
+        "type": "complete",
+        "total_rows": total_rows,
+        "batches": index,
+        "execution_time": round(time.time() - start_time, 3)
+    })
+
+
+async def websocket_query(websocket: WebSocket):
+    """Stream a query's rows in batches as the client grants credits.
+
+    The client sends {"connection_id", "query"} with optional "batch_size",
+    "first_batch_size", "credits" (batches the server may send before
+    waiting, at most MAX_CREDITS), "format" ("rows" or "columnar") and
+    "query_id" (to find or cancel it through the query registry).
+    Afterwards it sends {"type": "credit", "credits": n} to receive more
+    batches or {"type": "cancel"} to stop; closing the socket also cancels
+    the query.
+    """
+    await websocket.accept()
+    stream_task = None
+    receive_task = None
+
+    try:
+        request = await asyncio.wait_for(websocket.receive_json(), timeout=10.0)
+        connection_id = request.get("connection_id")
+        query = (request.get("query") or "").strip()
+        if not connection_id or not query:
+            await websocket.send_json({"type": "error", "error": "connection_id and query required"})
+            return
+
+        connection = await connection_manager.get_connection(connection_id)
+        if not connection:
+            await websocket.send_json({"type": "error", "error": "Connection not found"})
+            return
+
+        validation = executor.validate_query(query, connection.db_type.value)
+        if not validation["safe"]:
+            await websocket.send_json({"type": "error", "error": validation["error"]})
+            return
+        # MongoDB queries only parse as find()/aggregate()
+        if connection.db_type != DatabaseType.MONGODB and not executor.is_read_only(query, connection.db_type.value):
+            await websocket.send_json({"type": "error", "error": "Only SELECT queries can be streamed"})
+            return
+
+        connector = await connection_manager.get_connector(connection_id)
+        if not connector:
+            await websocket.send_json({"type": "error", "error": "Connection not active"})
+            return
+
+        credits = _CreditWindow(_credit_count(request.get("credits"), DEFAULT_CREDITS))
+        batch_size = _batch_size(request.get("batch_size"), DEFAULT_BATCH_SIZE)
+        first_batch_size = _batch_size(request.get("first_batch_size"), min(DEFAULT_FIRST_BATCH_SIZE, batch_size))
+        # Registered, so it is listed with running queries and can be cancelled on the server
+        stream_task = asyncio.create_task(query_registry.run(
+            connection_id,
+            connector,
+            query,
+            _stream_results(
+                websocket,
+                connector,
+                query,
+                credits,
+                batch_size,
+                first_batch_size,
+                request.get("format") == COLUMNAR
+            ),
+            query_id=request.get("query_id")
+        ))
+
+        while True:
+            if receive_task is None:
+                receive_task = asyncio.create_task(websocket.receive_json())
+            done, _ = await asyncio.wait({stream_task, receive_task}, return_when=asyncio.FIRST_COMPLETED)
+            if stream_task in done:
+                stream_task.result()
+                break
+
+            message = receive_task.result()
+            receive_task = None
+            if message.get("type") == "credit":
+                await credits.grant(_credit_count(message.get("credits"), 1))
+            elif message.get("type") == "cancel":
+                stream_task.cancel()
+                await asyncio.gather(stream_task, return_exceptions=True)
+                await websocket.send_json({"type": "cancelled"})
+                break
+
+        await websocket.close()
+
+    except (WebSocketDisconnect, asyncio.TimeoutError):
+        pass
+    except Exception as e:
+        logger.error(f"Query stream failed: {str(e)}")
+        try:
+            await websocket.send_json({"type": "error", "error": str(e)})
+        except Exception:
+            pass
+    finally:
+        for task in (stream_task, receive_task):
+            if task and not task.done():
+                task.cancel()
+        for task in (stream_task, receive_task):
+            if task:
+                await asyncio.gather(task, return_exceptions=True)